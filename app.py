@@ -8,11 +8,20 @@ settings = init_environment()  # Removido o test_mode aqui para permitir leitura
 # Resto das importações
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 from services.utils import get_static_directory
-from routers import auth, players, health
+from services.static_files import CachedStaticFiles
+from routers import auth, players, health, metrics
 from database.db_manager import DatabaseManager
+from services.crypto_service import warm_up_keys
+from services.container import container
+from services.cache_service import get_rank_cache
+from services.auth_service import auth_service
+from services.metrics import MetricsMiddleware, registry
+from database.async_repository import shutdown_db_executor
+from services.encryption_pipeline import shutdown_encryption_pipeline
+from services.json_response import get_json_response_class
+from contextlib import asynccontextmanager
 import uvicorn
 import os
 from slowapi import Limiter, _rate_limit_exceeded_handler
@@ -30,8 +39,28 @@ logger.info(f"Iniciando aplicação no ambiente: {settings.ENVIRONMENT}")
 # Configuração do rate limiter
 limiter = Limiter(key_func=get_remote_address)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Prepara recursos compartilhados do processo antes de aceitar requisições"""
+    warm_up_keys()
+    container.startup()
+    get_rank_cache().start_sweeper(settings.RANK_CACHE_SWEEP_INTERVAL)
+    auth_service.start_reaper(settings.TOKEN_SWEEP_INTERVAL)
+    registry.start_flusher(settings.METRICS_DIR, settings.METRICS_FLUSH_INTERVAL)
+    yield
+    registry.stop_flusher()
+    auth_service.stop_reaper()
+    get_rank_cache().stop_sweeper()
+    container.shutdown()
+    shutdown_db_executor()
+    shutdown_encryption_pipeline()
+    DatabaseManager().close_all()
+
+
 def create_app() -> FastAPI:
     app = FastAPI(
+        lifespan=lifespan,
+        default_response_class=get_json_response_class(),
         title="Valorant API",
         description="API para gerenciamento de jogadores do Valorant",
         version="1.0.0",
@@ -49,19 +78,25 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["GET", "POST", "OPTIONS"],
         allow_headers=["*"],
+        expose_headers=["X-Next-Cursor"],
     )
 
+    # Mais externo: mede a requisição inteira, inclusive rate limit e CORS
+    app.add_middleware(MetricsMiddleware)
+
     # Incluindo todos os routers
     app.include_router(auth.router)
     app.include_router(players.router)
     app.include_router(health.router)
+    app.include_router(metrics.router)
 
     try:
         static_dir = get_static_directory()
         logger.info(f"Usando diretório estático: {static_dir}")
-        app.mount("/css", StaticFiles(directory=os.path.join(static_dir, "css")), name="css")
-        app.mount("/js", StaticFiles(directory=os.path.join(static_dir, "js")), name="js")
-        app.mount("/", StaticFiles(directory=static_dir, html=True), name="static")
+        max_age = settings.STATIC_CACHE_MAX_AGE
+        app.mount("/css", CachedStaticFiles(directory=os.path.join(static_dir, "css"), max_age=max_age), name="css")
+        app.mount("/js", CachedStaticFiles(directory=os.path.join(static_dir, "js"), max_age=max_age), name="js")
+        app.mount("/", CachedStaticFiles(directory=static_dir, html=True, max_age=max_age), name="static")
     except Exception as e:
         logger.error(f"Erro ao montar diretórios estáticos: {e}")
 
@@ -0,0 +1,78 @@
+"""
+Benchmark da importação em streaming de jogadores
+
+Gera um fluxo NDJSON sintético, passa pelo mesmo caminho do endpoint
+POST /players/import (iter_import_rows + PlayerService.import_players) e
+acompanha o uso de memória (RSS) ao longo da importação.
+
+Uso:
+    python benchmarks/bench_bulk_import.py --rows 1000000 --chunk-size 1000
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Banco isolado para o benchmark, antes de carregar as configurações
+os.environ.setdefault("DB_FILE_PATH", os.path.join(tempfile.mkdtemp(), "bench.db"))
+
+import psutil
+from services.import_service import iter_import_rows
+from services.player_service import PlayerService
+
+
+def ndjson_lines(rows: int):
+    for i in range(rows):
+        yield json.dumps(
+            {
+                "name": f"Player{i}",
+                "tag": f"T{i % 10000}",
+                "email": f"player{i}@example.com",
+                "login": f"login{i}",
+                "password": f"password-{i}",
+            }
+        ) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da importação em streaming")
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--report-every", type=int, default=100000)
+    args = parser.parse_args()
+
+    process = psutil.Process()
+    service = PlayerService()
+    rows = iter_import_rows(ndjson_lines(args.rows), "application/x-ndjson")
+
+    start = time.perf_counter()
+    baseline_rss = process.memory_info().rss
+    peak_rss = baseline_rss
+    summary = None
+
+    print(f"{'linhas':>10} | {'linhas/s':>10} | {'RSS (MB)':>9}")
+    for result in service.import_players(rows, chunk_size=args.chunk_size):
+        if "summary" in result:
+            summary = result["summary"]
+            break
+        if result["line"] % args.report_every == 0:
+            rss = process.memory_info().rss
+            peak_rss = max(peak_rss, rss)
+            elapsed = time.perf_counter() - start
+            print(f"{result['line']:>10} | {result['line'] / elapsed:>10.0f} | {rss / 2**20:>9.1f}")
+
+    elapsed = time.perf_counter() - start
+    print(f"\nResumo: {summary} em {elapsed:.1f}s ({args.rows / elapsed:.0f} linhas/s)")
+    print(
+        f"RSS inicial {baseline_rss / 2**20:.1f} MB, pico {peak_rss / 2**20:.1f} MB "
+        f"(+{(peak_rss - baseline_rss) / 2**20:.1f} MB)"
+    )
+
+
+if __name__ == "__main__":
+    main()
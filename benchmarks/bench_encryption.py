@@ -0,0 +1,55 @@
+"""
+Benchmark da criptografia de senhas em lote
+
+Mede a vazão do EncryptionPipeline (o mesmo usado por PlayerService.add_players)
+para cada tipo de executor e número de workers.
+
+Uso:
+    python benchmarks/bench_encryption.py --rows 200000 --workers 1 2 4 8
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.encryption_pipeline import EncryptionPipeline
+
+
+def measure(pipeline: EncryptionPipeline, values) -> float:
+    # Aquecimento: cria o pool e deriva a chave em cada worker
+    pipeline.encrypt_all(values[: pipeline.chunk_size * pipeline.workers * 2])
+    start = time.perf_counter()
+    pipeline.encrypt_all(values)
+    return len(values) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da criptografia em lote")
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--chunk-size", type=int, default=256)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1])
+    parser.add_argument("--kinds", nargs="+", default=["thread", "process"])
+    args = parser.parse_args()
+
+    values = [f"password-{i}" for i in range(args.rows)]
+
+    serial = EncryptionPipeline(kind="serial")
+    baseline = measure(serial, values)
+    print(f"{'executor':>8} | {'workers':>7} | {'senhas/s':>10} | {'ganho':>6}")
+    print(f"{'serial':>8} | {1:>7} | {baseline:>10.0f} | {1.0:>5.2f}x")
+
+    for kind in args.kinds:
+        for workers in sorted(set(args.workers)):
+            pipeline = EncryptionPipeline(kind=kind, workers=workers, chunk_size=args.chunk_size)
+            try:
+                rate = measure(pipeline, values)
+            finally:
+                pipeline.shutdown()
+            print(f"{kind:>8} | {workers:>7} | {rate:>10.0f} | {rate / baseline:>5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
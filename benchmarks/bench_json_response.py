@@ -0,0 +1,72 @@
+"""
+Benchmark da serialização das respostas de listagem
+
+Compara o caminho padrão do FastAPI (validação pelo response_model +
+JSONResponse) com o caminho rápido de FAST_JSON_RESPONSES (dicts confiáveis
+serializados direto pelo orjson), medindo requisições completas em processo.
+
+Uso:
+    python benchmarks/bench_json_response.py --sizes 100 1000 5000 --requests 50
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from unittest.mock import patch
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from config.settings import get_settings
+from models.responses import BasicPlayerResponse
+from services.json_response import trusted_response
+
+
+def build_app(roster) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/validated", response_model=List[BasicPlayerResponse])
+    async def validated():
+        return roster
+
+    @app.get("/trusted", response_model=List[BasicPlayerResponse])
+    async def trusted():
+        return trusted_response(roster)
+
+    return app
+
+
+def measure(client: TestClient, path: str, requests: int) -> float:
+    client.get(path)
+    start = time.perf_counter()
+    for _ in range(requests):
+        client.get(path)
+    return (time.perf_counter() - start) / requests * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da serialização das respostas")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--requests", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'jogadores':>10} | {'validado (ms)':>14} | {'orjson (ms)':>12} | {'ganho':>6}")
+    for size in args.sizes:
+        roster = [{"id": i, "name": f"Player{i}", "tag": f"BR{i % 10}"} for i in range(size)]
+        client = TestClient(build_app(roster))
+
+        with patch.object(get_settings(), "FAST_JSON_RESPONSES", True):
+            # O caminho validado acrescenta os opcionais vazios do modelo (status: null)
+            validated = [{k: p[k] for k in ("id", "name", "tag")} for p in client.get("/validated").json()]
+            assert client.get("/trusted").json() == validated
+            fast = measure(client, "/trusted", args.requests)
+        baseline = measure(client, "/validated", args.requests)
+
+        print(f"{size:>10} | {baseline:>14.2f} | {fast:>12.2f} | {baseline / fast:>5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
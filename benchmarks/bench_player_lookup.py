@@ -0,0 +1,97 @@
+"""
+Benchmark da busca de jogador por (name, tag)
+
+Compara PlayerRepository.find_by_name_tag (índice composto) com a antiga
+varredura completa (iter_players + busca linear) conforme a tabela cresce.
+
+Uso:
+    python benchmarks/bench_player_lookup.py --sizes 1000 10000 100000 1000000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Banco isolado para o benchmark, antes de carregar as configurações
+os.environ.setdefault("DB_FILE_PATH", os.path.join(tempfile.mkdtemp(), "bench.db"))
+
+from database.db_manager import get_db
+from database.player_repository import PlayerRepository
+
+
+def populate(db, start: int, end: int):
+    """Insere jogadores sintéticos com ids no intervalo [start, end)"""
+    rows = (
+        (f"Player{i}", f"T{i % 10000}", f"player{i}@example.com", f"login{i}", "x")
+        for i in range(start, end)
+    )
+    with db.get_connection() as conn:
+        conn.executemany(
+            "INSERT INTO players (name, tag, email, login, password) VALUES (?, ?, ?, ?, ?)",
+            rows,
+        )
+        conn.commit()
+
+
+def scan_lookup(repository: PlayerRepository, name: str, tag: str):
+    batches = repository.iter_players()
+    try:
+        for batch in batches:
+            for row in batch:
+                if row[1] == name and row[2] == tag:
+                    return row
+        return None
+    finally:
+        # Devolve a conexão do pool mesmo quando a busca para no meio
+        batches.close()
+
+
+def measure(func, targets) -> float:
+    start = time.perf_counter()
+    for name, tag in targets:
+        func(name, tag)
+    return (time.perf_counter() - start) / len(targets) * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de busca por name/tag")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000, 1000000])
+    parser.add_argument("--lookups", type=int, default=1000)
+    parser.add_argument(
+        "--scan-limit",
+        type=int,
+        default=100000,
+        help="Maior tabela em que a varredura completa também é medida",
+    )
+    args = parser.parse_args()
+
+    db = get_db()
+    repository = PlayerRepository()
+    inserted = 0
+
+    print(f"{'linhas':>10} | {'indexado (us)':>14} | {'varredura (us)':>15}")
+    for size in sorted(args.sizes):
+        populate(db, inserted, size)
+        inserted = size
+
+        targets = [
+            (f"Player{i}", f"T{i % 10000}")
+            for i in (random.randrange(size) for _ in range(args.lookups))
+        ]
+        indexed = measure(repository.find_by_name_tag, targets)
+
+        scan = "-"
+        if size <= args.scan_limit:
+            scan_targets = targets[: max(1, args.lookups // 100)]
+            scan = f"{measure(lambda n, t: scan_lookup(repository, n, t), scan_targets):15.1f}"
+
+        print(f"{size:>10} | {indexed:14.1f} | {scan:>15}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Benchmark da verificação de tokens
+
+Compara AuthService.verify_token com o memo de tokens verificados contra a
+verificação completa (assinatura HMAC) a cada chamada, simulando o frontend
+que repete o mesmo token em várias requisições.
+
+Uso:
+    python benchmarks/bench_token_verify.py --calls 200000 --tokens 10
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.auth_service import AuthService
+
+
+def measure(func, tokens, calls: int) -> float:
+    start = time.perf_counter()
+    for i in range(calls):
+        func(tokens[i % len(tokens)])
+    return calls / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da verificação de tokens")
+    parser.add_argument("--calls", type=int, default=200000)
+    parser.add_argument("--tokens", type=int, default=10, help="Tokens distintos em uso")
+    args = parser.parse_args()
+
+    # Mede apenas a verificação, sem o custo dos logs por chamada
+    logging.disable(logging.CRITICAL)
+
+    auth = AuthService()
+    tokens = [auth.generate_token() for _ in range(args.tokens)]
+
+    def verify_without_memo(token):
+        auth._verified.clear()
+        return auth.verify_token(token)
+
+    baseline = measure(verify_without_memo, tokens, args.calls)
+    memo = measure(auth.verify_token, tokens, args.calls)
+
+    print(f"{'modo':>10} | {'verificações/s':>15}")
+    print(f"{'sem memo':>10} | {baseline:>15.0f}")
+    print(f"{'com memo':>10} | {memo:>15.0f}  ({memo / baseline:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -18,6 +18,43 @@ class Settings(BaseSettings):
     TEST_2FA_SECRET: str = ""
     ADMIN_USER: str = ""
     ADMIN_PASS: str = ""
+    RANK_CACHE_TTL: int = 300
+    RANK_CACHE_MAX_ENTRIES: int = 1024
+    RANK_CACHE_SWEEP_INTERVAL: int = 60
+    RANK_FETCH_WAIT_TIMEOUT: float = 10.0  # espera por uma busca idêntica já em andamento
+    CACHE_BACKEND: str = "memory"  # memory | redis | sqlite
+    REDIS_URL: str = "redis://localhost:6379/0"
+    CACHE_SQLITE_PATH: str = ".\\database\\cache.db"
+    DB_POOL_SIZE: int = 5
+    DB_POOL_TIMEOUT: float = 10.0
+    DB_POOL_HEALTH_CHECK_INTERVAL: float = 30.0
+    DB_BUSY_TIMEOUT_MS: int = 5000
+    DB_PRAGMA_PROFILE: str = "balanced"  # durable | balanced | fast
+    DB_PRAGMAS: dict = {}
+    DB_BUSY_RETRIES: int = 5
+    DB_BUSY_RETRY_BASE_DELAY: float = 0.05
+    DB_BUSY_RETRY_MAX_DELAY: float = 1.0
+    DB_EXECUTOR_WORKERS: int = 4
+    IMPORT_CHUNK_SIZE: int = 1000
+    IMPORT_SPOOL_MAX_MEMORY: int = 1024 * 1024
+    EXPORT_BATCH_SIZE: int = 500  # linhas lidas por fetchmany na exportação
+    ENCRYPTION_EXECUTOR: str = "thread"  # thread | process | serial
+    ENCRYPTION_WORKERS: int = 0  # 0 = os.cpu_count()
+    ENCRYPTION_CHUNK_SIZE: int = 256
+    TOKEN_SECRET: str = ""  # compartilhado entre workers; vazio = chave aleatória por processo (só com WORKERS = 1)
+    TOKEN_EXPIRY: int = 60
+    TOKEN_STORE_MAX_ENTRIES: int = 10000
+    TOKEN_SWEEP_INTERVAL: int = 30
+    TOKEN_MEMO_MAX_ENTRIES: int = 4096
+    TWO_FACTOR_CACHE_TTL: int = 60
+    TOTP_VALID_WINDOW: int = 1  # passos de 30s aceitos antes/depois do atual
+    METRICS_DIR: str = ""  # diretório compartilhado entre workers; vazio = só o processo atual
+    METRICS_FLUSH_INTERVAL: float = 5.0
+    METRICS_TOKEN: str = ""  # bearer token fixo do scraper do /metrics; vazio = /metrics desativado
+    PLAYERS_PAGE_SIZE: int = 100
+    PLAYERS_PAGE_MAX: int = 1000  # limites maiores são reduzidos a este valor
+    FAST_JSON_RESPONSES: bool = False  # orjson sem revalidar dados montados pelos serviços
+    STATIC_CACHE_MAX_AGE: int = 31536000  # arquivos estáticos pedidos com ?v=<hash>
     
 class TestSettings(Settings):
     ENVIRONMENT: str = "test"
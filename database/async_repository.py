@@ -0,0 +1,39 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from threading import Lock
+from typing import Any, Callable, Optional
+import asyncio
+import logging
+from config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = Lock()
+
+
+def get_db_executor() -> ThreadPoolExecutor:
+    """Executor dedicado ao trabalho bloqueante (SQLite, criptografia) fora do event loop"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                workers = get_settings().DB_EXECUTOR_WORKERS
+                _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="db")
+                logger.info(f"Executor de banco iniciado com {workers} threads")
+    return _executor
+
+
+def shutdown_db_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+            _executor = None
+
+
+async def run_in_db_executor(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """Executa uma chamada bloqueante no executor de banco e aguarda o resultado"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_db_executor(), partial(func, *args, **kwargs))
+
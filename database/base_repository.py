@@ -1,15 +1,62 @@
-from typing import Any, List, Tuple, Optional
+from typing import Any, Callable, List, Tuple, Optional
 import logging
+import random
+import sqlite3
+import time
+from config.settings import get_settings
 from database.db_manager import get_db
+from services.metrics import DB_BUSY_RETRIES, DB_QUERY_DURATION
 
 logger = logging.getLogger(__name__)
 
+SQLITE_BUSY = 5
+SQLITE_LOCKED = 6
+
+
+def is_busy_error(error: Exception) -> bool:
+    """Indica se o erro é SQLITE_BUSY/SQLITE_LOCKED (banco ocupado por outro escritor)"""
+    if not isinstance(error, sqlite3.OperationalError):
+        return False
+    code = getattr(error, "sqlite_errorcode", None)
+    if code is not None:
+        return code & 0xFF in (SQLITE_BUSY, SQLITE_LOCKED)
+    return "locked" in str(error) or "busy" in str(error)
+
 
 class BaseRepository:
     def __init__(self):
         self.db_manager = get_db()
 
+    def with_retry(self, operation: Callable[..., Any], *args, **kwargs) -> Any:
+        """Executa a operação repetindo com backoff exponencial enquanto o banco estiver ocupado"""
+        settings = get_settings()
+        attempt = 0
+        operation_name = getattr(operation, "__name__", "query").lstrip("_")
+        while True:
+            try:
+                with DB_QUERY_DURATION.time(operation=operation_name):
+                    return operation(*args, **kwargs)
+            except sqlite3.OperationalError as e:
+                if not is_busy_error(e) or attempt >= settings.DB_BUSY_RETRIES:
+                    raise
+                delay = min(
+                    settings.DB_BUSY_RETRY_MAX_DELAY,
+                    settings.DB_BUSY_RETRY_BASE_DELAY * (2 ** attempt),
+                )
+                # Jitter evita que escritores concorrentes tentem novamente em sincronia
+                delay *= random.uniform(0.5, 1.5)
+                attempt += 1
+                DB_BUSY_RETRIES.inc(operation=operation_name)
+                logger.warning(
+                    f"Banco ocupado, nova tentativa {attempt}/{settings.DB_BUSY_RETRIES} "
+                    f"em {delay:.3f}s: {e}"
+                )
+                time.sleep(delay)
+
     def execute_query(self, query: str, params: Tuple = None) -> Any:
+        return self.with_retry(self._execute_query, query, params)
+
+    def _execute_query(self, query: str, params: Tuple = None) -> Any:
         with self.db_manager.get_cursor() as cursor:
             try:
                 cursor.execute(query, params or ())
@@ -21,6 +68,9 @@ class BaseRepository:
                 raise
 
     def fetch_one(self, query: str, params: Tuple = None) -> Optional[Any]:
+        return self.with_retry(self._fetch_one, query, params)
+
+    def _fetch_one(self, query: str, params: Tuple = None) -> Optional[Any]:
         with self.db_manager.get_cursor() as cursor:
             try:
                 cursor.execute(query, params or ())
@@ -30,6 +80,9 @@ class BaseRepository:
                 raise
 
     def fetch_all(self, query: str, params: Tuple = None) -> List[Any]:
+        return self.with_retry(self._fetch_all, query, params)
+
+    def _fetch_all(self, query: str, params: Tuple = None) -> List[Any]:
         with self.db_manager.get_cursor() as cursor:
             try:
                 cursor.execute(query, params or ())
@@ -39,6 +92,9 @@ class BaseRepository:
                 raise
 
     def execute_transaction(self, queries: List[Tuple[str, Tuple]]) -> List[Any]:
+        return self.with_retry(self._execute_transaction, queries)
+
+    def _execute_transaction(self, queries: List[Tuple[str, Tuple]]) -> List[Any]:
         with self.db_manager.get_cursor() as cursor:
             results = []
             try:
@@ -1,21 +1,280 @@
 import sqlite3
 import logging
 import os
+import time
 from contextlib import contextmanager
-from threading import local
+from threading import Condition, Lock, local
+from typing import Any, Dict, List, Optional, Tuple
 from config.settings import get_settings
 
 logger = logging.getLogger(__name__)
 
+# Perfis de durabilidade/desempenho aplicados ao banco
+PRAGMA_PROFILES: Dict[str, Dict[str, Any]] = {
+    # Rollback journal e fsync em todo commit: máxima durabilidade
+    "durable": {
+        "journal_mode": "DELETE",
+        "synchronous": "FULL",
+        "cache_size": -2000,
+        "temp_store": "DEFAULT",
+        "mmap_size": 0,
+    },
+    # WAL com synchronous=NORMAL: leitores não bloqueiam escritores e
+    # apenas a última transação pode ser perdida em queda de energia
+    "balanced": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -16000,
+        "temp_store": "MEMORY",
+        "mmap_size": 134217728,
+    },
+    # Sem fsync: apenas para cargas descartáveis (benchmarks, importações)
+    "fast": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "cache_size": -64000,
+        "temp_store": "MEMORY",
+        "mmap_size": 268435456,
+    },
+}
+
+
+# Migrações de esquema aplicadas em ordem; PRAGMA user_version guarda quantas já rodaram
+MIGRATIONS: List[List[str]] = [
+    # 1: índices por expressão para as buscas case-insensitive de email/login.
+    # Os índices antigos nas colunas cruas não serviam a LOWER(...) e já são
+    # cobertos pelos índices automáticos das restrições UNIQUE.
+    [
+        "UPDATE OR IGNORE players SET email = LOWER(email) WHERE email <> LOWER(email)",
+        "CREATE INDEX IF NOT EXISTS idx_players_email_lower ON players(LOWER(email))",
+        "CREATE INDEX IF NOT EXISTS idx_players_login_lower ON players(LOWER(login))",
+        "DROP INDEX IF EXISTS idx_email",
+        "DROP INDEX IF EXISTS idx_login",
+    ],
+    # 2: filtro por prefixo de tag na listagem paginada
+    [
+        "CREATE INDEX IF NOT EXISTS idx_players_tag ON players(tag)",
+    ],
+    # 3: versão do cadastro para ETags da listagem. A época aleatória distingue
+    # bancos recriados, cuja versão recomeça do zero
+    [
+        "CREATE TABLE IF NOT EXISTS roster_meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)",
+        "INSERT OR IGNORE INTO roster_meta (key, value) VALUES ('roster_epoch', ABS(RANDOM()))",
+        "INSERT OR IGNORE INTO roster_meta (key, value) VALUES ('roster_version', 0)",
+    ],
+]
+
+
+def get_pragmas(settings) -> Dict[str, Any]:
+    """Resolve os PRAGMAs do perfil configurado, com sobrescritas de DB_PRAGMAS"""
+    profile = settings.DB_PRAGMA_PROFILE.lower()
+    if profile not in PRAGMA_PROFILES:
+        raise ValueError(f"Perfil de PRAGMAs desconhecido: {settings.DB_PRAGMA_PROFILE}")
+
+    pragmas = {
+        **PRAGMA_PROFILES[profile],
+        "busy_timeout": settings.DB_BUSY_TIMEOUT_MS,
+    }
+    pragmas.update(settings.DB_PRAGMAS)
+    return pragmas
+
+
+class ConnectionPool:
+    """Pool limitado de conexões SQLite com reaproveitamento por thread"""
+
+    def __init__(
+        self,
+        db_path: str,
+        max_size: int = 5,
+        timeout: float = 10.0,
+        health_check_interval: float = 30.0,
+        pragmas: Optional[Dict[str, Any]] = None,
+    ):
+        self.db_path = db_path
+        self.max_size = max_size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self.pragmas = pragmas or {}
+        self._cond = Condition(Lock())
+        self._idle: List[Tuple[sqlite3.Connection, float]] = []
+        self._in_use = set()
+        self._retired = set()
+        self._size = 0
+        self._local = local()
+        self._stats = {
+            "acquired": 0,
+            "created": 0,
+            "discarded": 0,
+            "waits": 0,
+            "timeouts": 0,
+            "wait_time_total": 0.0,
+            "wait_time_max": 0.0,
+        }
+
+    def _create_connection(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        # PRAGMAs são aplicados uma única vez, na criação da conexão
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        with self._cond:
+            self._stats["created"] += 1
+        return conn
+
+    def _is_healthy(self, conn: sqlite3.Connection) -> bool:
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error as e:
+            logger.warning(f"Conexão do pool falhou na verificação de saúde: {e}")
+            return False
+
+    def _take_idle(self) -> Tuple[sqlite3.Connection, float]:
+        """Retira uma conexão ociosa, preferindo a última usada pela thread atual"""
+        preferred = getattr(self._local, "last_conn", None)
+        if preferred is not None:
+            for index, (conn, last_used) in enumerate(self._idle):
+                if conn is preferred:
+                    return self._idle.pop(index)
+        return self._idle.pop()
+
+    def acquire(self) -> sqlite3.Connection:
+        """Obtém uma conexão do pool, aguardando até `timeout` se estiver esgotado"""
+        start = time.monotonic()
+        waited = False
+        conn = None
+        last_used = 0.0
+
+        with self._cond:
+            while True:
+                if self._idle:
+                    conn, last_used = self._take_idle()
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    break
+
+                waited = True
+                remaining = self.timeout - (time.monotonic() - start)
+                if remaining <= 0:
+                    self._stats["timeouts"] += 1
+                    raise TimeoutError("Tempo esgotado aguardando conexão do pool")
+                self._cond.wait(remaining)
+
+            self._stats["acquired"] += 1
+            if waited:
+                wait_time = time.monotonic() - start
+                self._stats["waits"] += 1
+                self._stats["wait_time_total"] += wait_time
+                self._stats["wait_time_max"] = max(self._stats["wait_time_max"], wait_time)
+
+        if conn is not None and time.monotonic() - last_used > self.health_check_interval:
+            if not self._is_healthy(conn):
+                self._close(conn)
+                conn = None
+
+        if conn is None:
+            try:
+                conn = self._create_connection()
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                    self._cond.notify()
+                raise
+
+        with self._cond:
+            self._in_use.add(conn)
+        self._local.last_conn = conn
+        return conn
+
+    def release(self, conn: sqlite3.Connection, discard: bool = False):
+        """Devolve a conexão ao pool, descartando-a se estiver inválida ou aposentada"""
+        if not discard and conn.in_transaction:
+            try:
+                conn.rollback()
+            except sqlite3.Error:
+                discard = True
+
+        with self._cond:
+            self._in_use.discard(conn)
+            if discard or conn in self._retired:
+                self._retired.discard(conn)
+                self._size -= 1
+                self._stats["discarded"] += 1
+                self._close(conn)
+            else:
+                self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self):
+        """Empresta uma conexão; chamadas aninhadas na mesma thread reutilizam a mesma"""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            self._local.depth += 1
+            try:
+                yield conn
+            finally:
+                self._local.depth -= 1
+            return
+
+        conn = self.acquire()
+        self._local.conn = conn
+        self._local.depth = 1
+        discard = False
+        try:
+            yield conn
+        except sqlite3.DatabaseError as e:
+            # Erros de corrupção/IO invalidam a conexão; erros de SQL não
+            discard = not isinstance(e, (sqlite3.IntegrityError, sqlite3.OperationalError))
+            raise
+        finally:
+            self._local.conn = None
+            self._local.depth = 0
+            self.release(conn, discard=discard)
+
+    def depth(self) -> int:
+        """Nível de aninhamento da conexão emprestada pela thread atual"""
+        return getattr(self._local, "depth", 0)
+
+    def _close(self, conn: sqlite3.Connection):
+        try:
+            conn.close()
+        except Exception as e:
+            logger.error(f"Erro ao fechar conexão: {e}")
+
+    def close_all(self):
+        """Fecha as conexões ociosas; as emprestadas são fechadas ao serem devolvidas"""
+        with self._cond:
+            for conn, _ in self._idle:
+                self._close(conn)
+            self._size -= len(self._idle)
+            self._idle.clear()
+            self._retired.update(self._in_use)
+            if self._in_use:
+                logger.debug(f"{len(self._in_use)} conexões em uso serão fechadas ao serem devolvidas")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                **self._stats,
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": len(self._in_use),
+                "max_size": self.max_size,
+            }
+
+
 class DatabaseManager:
     _instance = None
-    _local = local()
 
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(DatabaseManager, cls).__new__(cls)
             settings = get_settings()
             cls._instance.DB_FILE_PATH = settings.DB_FILE_PATH
+            cls._instance._pool = None
+            cls._instance._pool_lock = Lock()
             logger.info(f"Inicializando DatabaseManager no ambiente: {settings.ENVIRONMENT}; DB: {cls._instance.DB_FILE_PATH}")
         return cls._instance
 
@@ -27,15 +286,60 @@ class DatabaseManager:
             settings = get_settings()
             
             if settings.TESTING:
-                if os.path.exists(settings.DB_FILE_PATH):
-                    os.remove(settings.DB_FILE_PATH)
+                self.drop_database()
                 
             self.init_db()
 
+    @property
+    def pool(self) -> ConnectionPool:
+        """Pool do banco atual; é recriado se DB_FILE_PATH mudar"""
+        pool = self._pool
+        if pool is not None and pool.db_path == self.DB_FILE_PATH:
+            return pool
+
+        with self._pool_lock:
+            if self._pool is None or self._pool.db_path != self.DB_FILE_PATH:
+                if self._pool is not None:
+                    self._pool.close_all()
+                settings = get_settings()
+                pragmas = get_pragmas(settings)
+                # journal_mode é persistente no arquivo e definido em init_db
+                pragmas.pop("journal_mode", None)
+                self._pool = ConnectionPool(
+                    self.DB_FILE_PATH,
+                    max_size=settings.DB_POOL_SIZE,
+                    timeout=settings.DB_POOL_TIMEOUT,
+                    health_check_interval=settings.DB_POOL_HEALTH_CHECK_INTERVAL,
+                    pragmas=pragmas,
+                )
+            return self._pool
+
+    def close_all(self):
+        """Fecha as conexões do pool (encerramento da aplicação e testes)"""
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.close_all()
+                self._pool = None
+
+    def pool_stats(self) -> Dict[str, Any]:
+        return self.pool.stats()
+
+    def drop_database(self):
+        """Fecha o pool e remove o arquivo do banco e seus arquivos WAL (usado em testes)"""
+        self.close_all()
+        for suffix in ("", "-wal", "-shm"):
+            path = self.DB_FILE_PATH + suffix
+            if os.path.exists(path):
+                os.remove(path)
+
     def init_db(self):
         """Inicializa o banco de dados e cria as tabelas"""
         try:
+            journal_mode = get_pragmas(get_settings())["journal_mode"]
             with self.get_connection() as conn:
+                mode = conn.execute(f"PRAGMA journal_mode = {journal_mode}").fetchone()[0]
+                logger.info(f"Banco de dados em journal_mode={mode}")
+
                 # Tabela players
                 conn.execute(
                     """
@@ -75,43 +379,66 @@ class DatabaseManager:
                 )
 
                 # Índices
-                conn.execute("CREATE INDEX IF NOT EXISTS idx_email ON players(email)")
-                conn.execute("CREATE INDEX IF NOT EXISTS idx_login ON players(login)")
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_players_name_tag ON players(name, tag)"
+                )
 
                 conn.commit()
+                self.apply_migrations(conn)
                 logger.info("Banco de dados inicializado com sucesso")
         except Exception as e:
             logger.error(f"Erro ao inicializar banco de dados: {e}")
             raise
 
+    def apply_migrations(self, conn: sqlite3.Connection):
+        """Aplica as migrações pendentes, cada uma em sua própria transação"""
+        while True:
+            # A versão é lida dentro da transação de escrita para que workers
+            # iniciando ao mesmo tempo não apliquem a mesma migração duas vezes
+            conn.execute("BEGIN IMMEDIATE")
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version >= len(MIGRATIONS):
+                conn.commit()
+                return
+
+            number = version + 1
+            try:
+                for statement in MIGRATIONS[version]:
+                    conn.execute(statement)
+                conn.execute(f"PRAGMA user_version = {number}")
+                conn.commit()
+                logger.info(f"Migração {number} aplicada")
+            except Exception as e:
+                conn.rollback()
+                logger.error(f"Erro ao aplicar migração {number}: {e}")
+                raise
+
     @contextmanager
     def get_connection(self):
-        """Gerencia a conexão com o banco de dados"""
-        conn = None
+        """Empresta uma conexão do pool"""
+        pool = self.pool
         try:
-            conn = sqlite3.connect(self.DB_FILE_PATH)
-            conn.row_factory = sqlite3.Row
-            yield conn
+            with pool.connection() as conn:
+                yield conn
         except Exception as e:
             logger.error(f"Erro na conexão com o banco: {e}")
             raise
-        finally:
-            if conn:
-                try:
-                    conn.close()
-                except Exception as e:
-                    logger.error(f"Erro ao fechar conexão: {e}")
 
     @contextmanager
     def get_cursor(self):
         """Gerencia cursores com commit/rollback automático"""
         with self.get_connection() as conn:
+            # Só finaliza a transação quem a iniciou; cursores aninhados dentro de
+            # uma transação já aberta deixam o commit/rollback para o nível externo
+            outermost = not conn.in_transaction
             cursor = conn.cursor()
             try:
                 yield cursor
-                conn.commit()
+                if outermost:
+                    conn.commit()
             except Exception as e:
-                conn.rollback()
+                if outermost:
+                    conn.rollback()
                 logger.error(f"Erro na operação do banco: {e}")
                 raise
             finally:
@@ -1,29 +1,172 @@
 from services.crypto_service import CryptoService
 from .base_repository import BaseRepository
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Tuple, Any
 import logging
+import sqlite3
 
 logger = logging.getLogger(__name__)
 
 
+class DuplicatePlayerError(ValueError):
+    """Email ou login já cadastrado; `field` indica qual restrição foi violada"""
+
+    MESSAGES = {"email": "Email já cadastrado", "login": "Login já cadastrado"}
+
+    def __init__(self, field: str):
+        self.field = field
+        super().__init__(self.MESSAGES[field])
+
+
+def conflict_field(error: Exception) -> str:
+    """Identifica a coluna da restrição UNIQUE violada a partir da mensagem do SQLite"""
+    return "login" if "login" in str(error) else "email"
+
+
+# Inserção que rejeita logins repetidos sem diferenciar maiúsculas; emails
+# repetidos são barrados pela restrição UNIQUE (armazenados em minúsculas)
+GUARDED_INSERT = """
+    INSERT INTO players (name, tag, email, login, password)
+    SELECT ?, ?, ?, ?, ?
+    WHERE NOT EXISTS (SELECT 1 FROM players WHERE LOWER(login) = ?)
+"""
+
+# Executado na mesma transação de cada escrita em players
+BUMP_ROSTER_VERSION = "UPDATE roster_meta SET value = value + 1 WHERE key = 'roster_version'"
+
+
+def prefix_upper_bound(prefix: str) -> Optional[str]:
+    """Menor string maior que todas as que começam com `prefix` (ordem BINARY)"""
+    last = ord(prefix[-1])
+    if last >= 0x10FFFF:
+        return None
+    return prefix[:-1] + chr(last + 1)
+
+
 class PlayerRepository(BaseRepository):
     def __init__(self):
         super().__init__()
         self.crypto_service = CryptoService()
 
-    def get_all_players(self) -> List[Dict[str, Any]]:
-        query = "SELECT id, name, tag, email, login FROM players"
-        results = self.fetch_all(query)
-        return [
-            {
-                "id": row["id"],
-                "name": row["name"],
-                "tag": row["tag"],
-                "email": row["email"],
-                "login": row["login"]
-            }
-            for row in results
-        ] if results else []
+    def iter_players(self, batch_size: int = 500) -> Iterator[List[Tuple[int, str, str]]]:
+        """Percorre todos os jogadores (id, name, tag) em blocos de `batch_size` tuplas
+
+        Usa uma conexão própria do pool, mantida até o gerador terminar ou ser
+        fechado, e não o empréstimo por thread de `get_connection`: o consumidor
+        (uma resposta em streaming) pode retomar o gerador em threads diferentes.
+        A leitura enxerga um snapshot consistente enquanto o cursor estiver aberto.
+        """
+        pool = self.db_manager.pool
+        conn = pool.acquire()
+        cursor = None
+        try:
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            cursor.execute("SELECT id, name, tag FROM players ORDER BY id")
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield rows
+        finally:
+            if cursor is not None:
+                cursor.close()
+            pool.release(conn)
+
+    def list_players(
+        self,
+        limit: int,
+        after: Optional[List[Any]] = None,
+        name_prefix: Optional[str] = None,
+        tag_prefix: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Página de jogadores (id, name, tag) com paginação keyset
+
+        A ordem segue o índice usado pelo filtro: (name, tag, id) com prefixo de
+        nome, (tag, id) com prefixo de tag ou apenas id. `after` é a chave de
+        ordenação da última linha da página anterior (ver `sort_key`).
+        """
+        order = self.sort_columns(name_prefix, tag_prefix)
+        filters, params = [], []
+        for column, prefix in (("name", name_prefix), ("tag", tag_prefix)):
+            if prefix:
+                filters.append(f"{column} >= ?")
+                params.append(prefix)
+                upper = prefix_upper_bound(prefix)
+                if upper is not None:
+                    filters.append(f"{column} < ?")
+                    params.append(upper)
+
+        def page(conditions, condition_params, order_by, size):
+            where = " AND ".join(filters + conditions)
+            query = f"""
+                SELECT id, name, tag
+                FROM players
+                {"WHERE " + where if where else ""}
+                ORDER BY {order_by}
+                LIMIT ?
+            """
+            rows = self.fetch_all(query, tuple(params + condition_params + [size]))
+            return [{"id": row["id"], "name": row["name"], "tag": row["tag"]} for row in rows]
+
+        if after is None:
+            return page([], [], ", ".join(order + ["id"]), limit)
+
+        if len(after) != len(order) + 1:
+            raise ValueError("Cursor inválido para os filtros informados")
+
+        # Duas consultas que seguem o índice: o SQLite não usa o rowid de uma
+        # comparação por row value para posicionar a busca, o que tornaria as
+        # páginas profundas dentro de uma mesma chave proporcionais ao offset
+        *keys, last_id = after
+        players = page(
+            [f"{column} = ?" for column in order] + ["id > ?"],
+            keys + [last_id],
+            "id",
+            limit,
+        )
+        if order and len(players) < limit:
+            columns = ", ".join(order)
+            placeholders = ", ".join("?" for _ in order)
+            players += page(
+                [f"({columns}) > ({placeholders})"],
+                keys,
+                ", ".join(order + ["id"]),
+                limit - len(players),
+            )
+        return players
+
+    @staticmethod
+    def sort_columns(name_prefix: Optional[str] = None, tag_prefix: Optional[str] = None) -> List[str]:
+        if name_prefix:
+            return ["name", "tag"]
+        if tag_prefix:
+            return ["tag"]
+        return []
+
+    @classmethod
+    def sort_key(
+        cls, player: Dict[str, Any], name_prefix: Optional[str] = None, tag_prefix: Optional[str] = None
+    ) -> List[Any]:
+        """Chave de ordenação de uma linha, usada como cursor da próxima página"""
+        return [player[column] for column in cls.sort_columns(name_prefix, tag_prefix)] + [player["id"]]
+
+    def find_by_name_tag(self, name: str, tag: str) -> Optional[Dict[str, Any]]:
+        query = """
+            SELECT id, name, tag, email, login
+            FROM players
+            WHERE name = ? AND tag = ?
+            LIMIT 1
+        """
+        row = self.fetch_one(query, (name, tag))
+        if not row:
+            return None
+        return {
+            "id": row["id"],
+            "name": row["name"],
+            "tag": row["tag"],
+            "email": row["email"],
+            "login": row["login"]
+        }
 
     def insert_player(
         self,
@@ -35,62 +178,48 @@ class PlayerRepository(BaseRepository):
             raise ValueError("Senha criptografada inválida")
 
         try:
-            query = """
-                INSERT INTO players (name, tag, email, login, password)
-                VALUES (?, ?, ?, ?, ?)
-            """
-            cursor = self.execute_query(
-                query,
+            # Inserção e verificação de conflito em um único comando
+            inserted, player_id = self.with_retry(
+                self._guarded_insert,
                 (
                     player_data["name"],
                     player_data["tag"],
                     player_data["email"].lower(),
                     player_data["login"],
                     encrypted_password,
+                    player_data["login"].lower(),
                 ),
             )
-            player_id = cursor.lastrowid
+            if inserted == 0:
+                raise DuplicatePlayerError("login")
+
             if not player_id:
                 raise ValueError("Erro ao obter ID do jogador inserido")
 
             logger.info(f"Jogador inserido com ID: {player_id}")
             return player_id
 
+        except DuplicatePlayerError:
+            raise
         except Exception as e:
             logger.error(f"Erro ao inserir jogador: {str(e)}")
             if "UNIQUE constraint" in str(e):
-                raise ValueError("Email ou login já existem no sistema")
+                raise DuplicatePlayerError(conflict_field(e))
             raise ValueError(f"Erro ao inserir jogador: {str(e)}")
 
+    def _guarded_insert(self, params: Tuple) -> Tuple[int, int]:
+        with self.db_manager.get_cursor() as cursor:
+            cursor.execute(GUARDED_INSERT, params)
+            inserted, player_id = cursor.rowcount, cursor.lastrowid
+            if inserted:
+                cursor.execute(BUMP_ROSTER_VERSION)
+            return inserted, player_id
+
     def insert_players(self, players_data) -> List[int]:
         try:
-            with self.db_manager.get_cursor() as cursor:
-                player_ids = []
-
-                for player in players_data:
-                    if not all(
-                        key in player
-                        for key in ["name", "tag", "email", "login", "password"]
-                    ):
-                        raise ValueError("Dados do jogador incompletos")
-
-                    cursor.execute(
-                        """
-                        INSERT INTO players (name, tag, email, login, password)
-                        VALUES (?, ?, ?, ?, ?)
-                    """,
-                        (
-                            player["name"],
-                            player["tag"],
-                            player["email"].lower(),
-                            player["login"],
-                            player["password"],
-                        ),
-                    )
-                    player_ids.append(cursor.lastrowid)
-
-                logger.info(f"Jogadores inseridos com sucesso. IDs: {player_ids}")
-                return player_ids
+            player_ids = self.with_retry(self._insert_players, players_data)
+            logger.info(f"Jogadores inseridos com sucesso. IDs: {player_ids}")
+            return player_ids
 
         except Exception as e:
             logger.error(f"Erro ao inserir jogadores: {str(e)}")
@@ -98,6 +227,97 @@ class PlayerRepository(BaseRepository):
                 raise ValueError("Um ou mais emails/logins já existem no sistema")
             raise ValueError(f"Erro ao inserir jogadores: {str(e)}")
 
+    def _insert_players(self, players_data) -> List[int]:
+        with self.db_manager.get_cursor() as cursor:
+            player_ids = []
+
+            for player in players_data:
+                if not all(
+                    key in player
+                    for key in ["name", "tag", "email", "login", "password"]
+                ):
+                    raise ValueError("Dados do jogador incompletos")
+
+                cursor.execute(
+                    """
+                    INSERT INTO players (name, tag, email, login, password)
+                    VALUES (?, ?, ?, ?, ?)
+                """,
+                    (
+                        player["name"],
+                        player["tag"],
+                        player["email"].lower(),
+                        player["login"],
+                        player["password"],
+                    ),
+                )
+                player_ids.append(cursor.lastrowid)
+
+            if player_ids:
+                cursor.execute(BUMP_ROSTER_VERSION)
+            return player_ids
+
+    def insert_players_chunk(self, players_data: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+        """Insere um bloco de jogadores em uma transação, reportando o resultado por linha
+
+        O caminho rápido usa executemany; se alguma linha conflitar, o bloco é
+        desfeito até o savepoint e as linhas são inseridas uma a uma para
+        identificar quais falharam.
+        """
+        return self.with_retry(self._insert_players_chunk, players_data)
+
+    def _insert_players_chunk(self, players_data: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+        params = [
+            (
+                player["name"],
+                player["tag"],
+                player["email"].lower(),
+                player["login"],
+                player["password"],
+                player["login"].lower(),
+            )
+            for player in players_data
+        ]
+        if not params:
+            return []
+
+        with self.db_manager.get_cursor() as cursor:
+            # Sem transação externa, o RELEASE do savepoint faria o commit das linhas
+            # antes do incremento da versão; o BEGIN mantém tudo em um único commit
+            if not cursor.connection.in_transaction:
+                cursor.execute("BEGIN IMMEDIATE")
+            cursor.execute("SAVEPOINT insert_chunk")
+            try:
+                cursor.executemany(GUARDED_INSERT, params)
+                inserted = cursor.rowcount
+            except sqlite3.IntegrityError:
+                inserted = -1
+
+            if inserted == len(params):
+                cursor.execute("RELEASE insert_chunk")
+                # Dentro da transação de escrita os ids do AUTOINCREMENT são contíguos
+                last_id = cursor.execute("SELECT last_insert_rowid()").fetchone()[0]
+                first_id = last_id - len(params) + 1
+                results = [{"id": first_id + offset} for offset in range(len(params))]
+            else:
+                cursor.execute("ROLLBACK TO insert_chunk")
+                cursor.execute("RELEASE insert_chunk")
+                results = [self._insert_one(cursor, row) for row in params]
+
+            if any("id" in result for result in results):
+                cursor.execute(BUMP_ROSTER_VERSION)
+            return results
+
+    def _insert_one(self, cursor, row) -> Dict[str, Any]:
+        try:
+            cursor.execute(GUARDED_INSERT, row)
+        except sqlite3.IntegrityError as e:
+            field = conflict_field(e)
+            return {"error": DuplicatePlayerError.MESSAGES[field], "field": field}
+        if cursor.rowcount == 0:
+            return {"error": DuplicatePlayerError.MESSAGES["login"], "field": "login"}
+        return {"id": cursor.lastrowid}
+
     def get_password_by_credentials(self, login: str, email: str) -> Optional[str]:
         query = """
             SELECT password
@@ -108,29 +328,44 @@ class PlayerRepository(BaseRepository):
         return result[0] if result else None
 
     def delete_player(self, player_id: int) -> bool:
-        query = "DELETE FROM players WHERE id = ?"
-        cursor = self.execute_query(query, (player_id,))
-        return cursor.rowcount > 0
+        return self.with_retry(self._delete_player, player_id)
+
+    def _delete_player(self, player_id: int) -> bool:
+        with self.db_manager.get_cursor() as cursor:
+            cursor.execute("DELETE FROM players WHERE id = ?", (player_id,))
+            deleted = cursor.rowcount > 0
+            if deleted:
+                cursor.execute(BUMP_ROSTER_VERSION)
+            return deleted
+
+    def get_roster_version(self) -> str:
+        """Identificador do estado atual do cadastro ("época-versão"), sem ler a tabela players"""
+        rows = self.fetch_all(
+            "SELECT key, value FROM roster_meta WHERE key IN ('roster_epoch', 'roster_version')"
+        )
+        values = {row["key"]: row["value"] for row in rows}
+        return f"{values.get('roster_epoch', 0)}-{values.get('roster_version', 0)}"
 
     def check_player_exists(
         self,
         email: str = None,
         login: str = None,
     ) -> Dict[str, bool]:
-        result = {"email_exists": False, "login_exists": False}
-
         try:
-            if email:
-                logger.debug(f"Verificando existência do email: {email}")
-                query = "SELECT 1 FROM players WHERE LOWER(email) = ?"
-                result["email_exists"] = bool(self.fetch_one(query, (email.lower(),)))
-                logger.debug(f"Email {email} existe: {result['email_exists']}")
-
-            if login:
-                logger.debug(f"Verificando existência do login: {login}")
-                query = "SELECT 1 FROM players WHERE LOWER(login) = ?"
-                result["login_exists"] = bool(self.fetch_one(query, (login.lower(),)))
-                logger.debug(f"Login {login} existe: {result['login_exists']}")
+            logger.debug(f"Verificando existência - Email: {email}, Login: {login}")
+            query = """
+                SELECT
+                    EXISTS(SELECT 1 FROM players WHERE LOWER(email) = ?) AS email_exists,
+                    EXISTS(SELECT 1 FROM players WHERE LOWER(login) = ?) AS login_exists
+            """
+            row = self.fetch_one(
+                query,
+                (email.lower() if email else None, login.lower() if login else None),
+            )
+            result = {
+                "email_exists": bool(row["email_exists"]),
+                "login_exists": bool(row["login_exists"]),
+            }
 
             logger.info(
                 f"Verificação concluída - Email existe: {result['email_exists']}, "
@@ -1,3 +1,4 @@
+import gzip
 import os
 import logging
 from rjsmin import jsmin
@@ -23,6 +24,7 @@ def minify_file(input_path, output_path):
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
         with open(output_path, "w", encoding="utf-8") as f:
             f.write(minified)
+        precompress(output_path, minified.encode("utf-8"))
 
         logger.info(f"Arquivo minificado: {output_path}")
 
@@ -30,6 +32,13 @@ def minify_file(input_path, output_path):
         logger.error(f"Erro ao minificar {input_path}: {str(e)}")
 
 
+def precompress(output_path, content):
+    """Grava `<arquivo>.gz` ao lado do original, servido pelo CachedStaticFiles a clientes com gzip"""
+    # mtime fixo: o mesmo conteúdo gera sempre o mesmo .gz
+    with open(output_path + ".gz", "wb") as f:
+        f.write(gzip.compress(content, compresslevel=9, mtime=0))
+
+
 def main():
     input_dir = "static"
     output_dir = "static_min"
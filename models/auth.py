@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Literal, Optional
 
 
 class AdminLogin(BaseModel):
@@ -10,6 +10,7 @@ class AdminLogin(BaseModel):
 
 class Setup2FARequest(BaseModel):
     user_id: int
+    qr_format: Literal["png", "svg"] = "png"
 
 
 class Verify2FACode(BaseModel):
@@ -27,6 +27,26 @@ class BasicPlayerResponse(BaseModel):
     status: Optional[str] = None
 
 
+class BatchInsertedPlayer(BaseModel):
+    index: int
+    id: int
+    name: str
+    tag: str
+
+
+class BatchConflict(BaseModel):
+    index: int
+    name: str
+    tag: str
+    field: str
+    error: str
+
+
+class PartialBatchResponse(BaseModel):
+    inserted: List[BatchInsertedPlayer]
+    conflicts: List[BatchConflict]
+
+
 class CredentialResponse(BaseModel):
     status: str
     password: str
@@ -60,11 +80,21 @@ class Dependencies(BaseModel):
     database: str
 
 
+class TokenStoreStats(BaseModel):
+    live: int
+    max_entries: int
+    rejections: int
+    expirations: int
+    sweeps: int
+    last_sweep_duration: float
+
+
 class DetailedHealthCheckResponse(BaseModel):
     status: str
     timestamp: float
     system: SystemInfo
     dependencies: Dependencies
+    tokens: Optional[TokenStoreStats] = None
 
 
 class Setup2FAResponse(BaseModel):
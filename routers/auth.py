@@ -1,12 +1,14 @@
 from fastapi import APIRouter, HTTPException, Depends, Header, Request
 from models.auth import AdminLogin, Setup2FARequest, Verify2FACode, Reset2FARequest
 from services.auth_service import auth_service
+from services.token_store import TokenStoreFullError
 from services.google_auth_service import GoogleAuthService
 from services.admin_service import AdminService
+from services.container import get_admin_service, get_google_auth_service
+from database.async_repository import run_in_db_executor
+from services.qr_service import qr_data_uri
+from services.json_response import trusted_response
 import logging
-import qrcode
-import base64
-from io import BytesIO
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 from models.responses import (
@@ -19,7 +21,6 @@ from models.responses import (
 limiter = Limiter(key_func=get_remote_address)
 
 router = APIRouter()
-google_auth = GoogleAuthService()
 
 # Configurar logging
 logging.basicConfig(
@@ -51,14 +52,20 @@ async def verify_token(authorization: str = Header(None)):
     },
 )
 @limiter.limit("5/minute")
-async def login(request: Request, credentials: AdminLogin):
+async def login(
+    request: Request,
+    credentials: AdminLogin,
+    admin_service: AdminService = Depends(get_admin_service),
+    google_auth: GoogleAuthService = Depends(get_google_auth_service),
+):
     try:
         logger.info(f"Tentativa de login para usuário: {credentials.username}")
-        admin_service = AdminService()
-        if admin_service.verify_admin(credentials.username, credentials.password):
+        if await run_in_db_executor(
+            admin_service.verify_admin, credentials.username, credentials.password
+        ):
             # Verificar 2FA se configurado
-            user_secret = google_auth.get_user_secret(
-                1
+            user_secret = await run_in_db_executor(
+                google_auth.get_user_secret, 1
             )  # Assumindo user_id = 1 para admin
             if user_secret:
                 if not credentials.code:
@@ -66,7 +73,7 @@ async def login(request: Request, credentials: AdminLogin):
                         f"Tentativa de login sem código 2FA: {credentials.username}"
                     )
                     raise HTTPException(status_code=403, detail="Código 2FA necessário")
-                if not google_auth.verify_code(user_secret, credentials.code):
+                if not google_auth.verify_code(user_secret, credentials.code, user_id=1):
                     logger.warning(
                         f"Código 2FA inválido para usuário: {credentials.username}"
                     )
@@ -75,7 +82,7 @@ async def login(request: Request, credentials: AdminLogin):
             token = auth_service.generate_token()
             expiry_time = auth_service.get_expiry_time()
             logger.info(f"Login bem-sucedido para usuário: {credentials.username}")
-            return {"token": token, "expiry_time": expiry_time}
+            return trusted_response({"token": token, "expiry_time": expiry_time})
         logger.warning(
             f"Tentativa de login com credenciais inválidas: {credentials.username}"
         )
@@ -87,32 +94,42 @@ async def login(request: Request, credentials: AdminLogin):
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.post("/logout")
+async def logout(token: str = Depends(verify_token)):
+    """Revoga o token atual antes da sua expiração"""
+    try:
+        auth_service.revoke_token(token)
+    except TokenStoreFullError:
+        # Sem registrar a revogação o token continuaria válido: o logout falha
+        raise HTTPException(status_code=503, detail="Não foi possível revogar o token; tente novamente")
+    logger.info("Logout realizado")
+    return {"success": True}
+
+
 @router.post(
     "/setup-2fa",
     response_model=Setup2FAResponse,
     responses={400: {"model": ErrorResponse}},
 )
 @limiter.limit("5/minute")
-async def setup_2fa(request: Request, setup_request: Setup2FARequest):
+async def setup_2fa(
+    request: Request,
+    setup_request: Setup2FARequest,
+    google_auth: GoogleAuthService = Depends(get_google_auth_service),
+):
     try:
         logger.info(f"Configurando 2FA para usuário ID: {setup_request.user_id}")
-        result = google_auth.check_2fa_status(setup_request.user_id)
+        result = await run_in_db_executor(
+            google_auth.check_2fa_status, setup_request.user_id
+        )
 
         if "secret" in result:
             qr_url = google_auth.get_qr_url("admin", result["secret"])
 
-            # Gerar QR code como imagem base64
-            qr = qrcode.QRCode(version=1, box_size=10, border=5)
-            qr.add_data(qr_url)
-            qr.make(fit=True)
-            img = qr.make_image(fill_color="black", back_color="white")
-
-            # Converter para base64
-            buffered = BytesIO()
-            img.save(buffered, format="PNG")
-            qr_base64 = base64.b64encode(buffered.getvalue()).decode()
-
-            result["qr_code_url"] = f"data:image/png;base64,{qr_base64}"
+            # Renderização do QR code (PNG ou SVG) fora do event loop
+            result["qr_code_url"] = await run_in_db_executor(
+                qr_data_uri, qr_url, setup_request.qr_format
+            )
 
         return result
 
@@ -127,11 +144,15 @@ async def setup_2fa(request: Request, setup_request: Setup2FARequest):
     responses={400: {"model": ErrorResponse}},
 )
 @limiter.limit("5/minute")
-async def verify_2fa_setup(request: Request, verify_request: Verify2FACode):
+async def verify_2fa_setup(
+    request: Request,
+    verify_request: Verify2FACode,
+    google_auth: GoogleAuthService = Depends(get_google_auth_service),
+):
     try:
         logger.info("Verificando código 2FA durante setup")
         if google_auth.verify_code(verify_request.secret, verify_request.code):
-            google_auth.activate_2fa(1, verify_request.secret)
+            await run_in_db_executor(google_auth.activate_2fa, 1, verify_request.secret)
             logger.info("2FA ativado com sucesso")
             return {"success": True}
         logger.warning("Código 2FA inválido durante setup")
@@ -143,10 +164,14 @@ async def verify_2fa_setup(request: Request, verify_request: Verify2FACode):
 
 @router.post("/reset-2fa", dependencies=[Depends(verify_token)])
 @limiter.limit("5/minute")
-async def reset_2fa(request: Request, reset_request: Reset2FARequest):
+async def reset_2fa(
+    request: Request,
+    reset_request: Reset2FARequest,
+    google_auth: GoogleAuthService = Depends(get_google_auth_service),
+):
     try:
         logger.info(f"Resetando 2FA para usuário ID: {reset_request.user_id}")
-        result = google_auth.reset_2fa(reset_request.user_id)
+        result = await run_in_db_executor(google_auth.reset_2fa, reset_request.user_id)
         return {"success": result}
     except Exception as e:
         logger.error(f"Erro ao resetar 2FA: {str(e)}")
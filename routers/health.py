@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Request, Depends
+from fastapi import APIRouter, Request
 import psutil
 import time
 from slowapi import Limiter
 from slowapi.util import get_remote_address
-from database.db_manager import DatabaseManager, get_db
+from database.async_repository import run_in_db_executor
+from database.base_repository import BaseRepository
+from services.auth_service import auth_service
 import sys
 import platform
 from models.responses import HealthCheckResponse, DetailedHealthCheckResponse
@@ -21,14 +23,11 @@ async def health_check(request: Request):
 
 @router.get("/health/detailed", response_model=DetailedHealthCheckResponse)
 @limiter.limit("10/minute")
-async def detailed_health_check(
-    request: Request, db: DatabaseManager = Depends(get_db)
-):
+async def detailed_health_check(request: Request):
     """Healthcheck detalhado com informações do sistema"""
     try:
-        with db.get_connection() as conn:
-            conn.execute("SELECT 1")
-            db_status = "connected"
+        await run_in_db_executor(BaseRepository().fetch_one, "SELECT 1")
+        db_status = "connected"
     except Exception as e:
         db_status = f"error: {str(e)}"
 
@@ -44,4 +43,5 @@ async def detailed_health_check(
             "uptime": time.time() - psutil.boot_time(),
         },
         "dependencies": {"database": db_status},
+        "tokens": auth_service.stats(),
     }
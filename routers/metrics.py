@@ -0,0 +1,39 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, Request
+from fastapi.responses import PlainTextResponse
+from slowapi import Limiter
+from slowapi.util import get_remote_address
+from config.settings import get_settings
+from database.async_repository import run_in_db_executor
+from services.metrics import registry
+import hmac
+import logging
+
+logger = logging.getLogger(__name__)
+
+limiter = Limiter(key_func=get_remote_address)
+router = APIRouter(tags=["metrics"])
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+async def verify_metrics_token(authorization: str = Header(None)):
+    """Exige o token fixo do scraper (METRICS_TOKEN), não o token de sessão do admin"""
+    expected = get_settings().METRICS_TOKEN
+    if not expected:
+        raise HTTPException(status_code=404, detail="Métricas desativadas")
+    if not authorization:
+        raise HTTPException(status_code=401, detail="Token não fornecido")
+
+    token = authorization.split(" ")[1] if "Bearer" in authorization else authorization
+    if not hmac.compare_digest(token.encode(), expected.encode()):
+        logger.warning("Tentativa de acesso às métricas com token inválido")
+        raise HTTPException(status_code=401, detail="Token inválido")
+
+
+@router.get("/metrics", response_class=PlainTextResponse, dependencies=[Depends(verify_metrics_token)])
+@limiter.limit("30/minute")
+async def metrics(request: Request):
+    """Métricas no formato texto do Prometheus, agregadas entre os workers"""
+    # A agregação lê os snapshots dos outros workers do disco
+    body = await run_in_db_executor(registry.collect, get_settings().METRICS_DIR or None)
+    return PlainTextResponse(body, media_type=CONTENT_TYPE)
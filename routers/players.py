@@ -1,23 +1,40 @@
-from fastapi import APIRouter, HTTPException, Depends, Header, Request, Response
+from fastapi import APIRouter, HTTPException, Depends, Header, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from services.player_service import PlayerService
+from services.container import get_player_service
+from database.async_repository import run_in_db_executor
+from services.import_service import iter_import_rows
+from config.settings import get_settings
 from services.auth_service import auth_service
+from services.json_response import trusted_response
+from services.utils import etag_matches
+from services.metrics import registry
+from services.single_flight import SingleFlight, single_flight_collector
 from models.player import Player, CredentialRequest
 from models.responses import (
     PlayerRankResponse,
     BasicPlayerResponse,
+    PartialBatchResponse,
     DeletePlayerResponse,
     CredentialResponse,
     PlayerExistsResponse,
     ErrorResponse,
 )
-from typing import List
+from typing import List, Literal, Optional, Union
+import io
+import json
 import logging
+import tempfile
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 
 limiter = Limiter(key_func=get_remote_address)
 
+# Buscas de rank em andamento no worker, compartilhadas entre requisições iguais
+rank_flight = SingleFlight()
+registry.register_collector("flight:rank", single_flight_collector("rank", rank_flight))
+
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/players", tags=["players"])
 
@@ -36,11 +53,14 @@ async def verify_token(authorization: str = Header(None)):
     "/", response_model=BasicPlayerResponse, dependencies=[Depends(verify_token)]
 )
 @limiter.limit("10/minute")
-async def add_player(request: Request, player: Player):
+async def add_player(
+    request: Request,
+    player: Player,
+    player_service: PlayerService = Depends(get_player_service),
+):
     try:
         logger.info(f"Tentando adicionar jogador: {player.name}#{player.tag}")
-        player_service = PlayerService()
-        result = player_service.add_player(player.model_dump())
+        result = await run_in_db_executor(player_service.add_player, player.model_dump())
         logger.info(f"Jogador adicionado com sucesso: {player.name}#{player.tag}")
         return result
     except Exception as e:
@@ -50,15 +70,25 @@ async def add_player(request: Request, player: Player):
 
 @router.post(
     "/batch",
-    response_model=List[BasicPlayerResponse],
+    response_model=Union[List[BasicPlayerResponse], PartialBatchResponse],
     dependencies=[Depends(verify_token)],
 )
 @limiter.limit("5/minute")
-async def add_players(request: Request, players: List[Player]):
+async def add_players(
+    request: Request,
+    players: List[Player],
+    partial: bool = False,
+    player_service: PlayerService = Depends(get_player_service),
+):
+    """Insere jogadores em lote
+
+    Por padrão o lote é tudo ou nada. Com `?partial=true` as linhas em conflito
+    são ignoradas e a resposta lista as inseridas e as conflitantes.
+    """
     try:
         logger.info(f"Tentando adicionar {len(players)} jogadores em lote")
-        player_service = PlayerService()
-        result = player_service.add_players([p.model_dump() for p in players])
+        add = player_service.add_players_partial if partial else player_service.add_players
+        result = await run_in_db_executor(add, [p.model_dump() for p in players])
         logger.info("Jogadores adicionados com sucesso em lote")
         return result
     except Exception as e:
@@ -66,20 +96,110 @@ async def add_players(request: Request, players: List[Player]):
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.post(
+    "/import",
+    dependencies=[Depends(verify_token)],
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+)
+@limiter.limit("5/minute")
+async def import_players(
+    request: Request,
+    player_service: PlayerService = Depends(get_player_service),
+):
+    """Importa jogadores de um corpo NDJSON ou CSV, respondendo uma linha NDJSON por registro
+
+    O corpo é copiado para um arquivo temporário (em memória até
+    IMPORT_SPOOL_MAX_MEMORY, depois em disco) e processado em blocos de
+    IMPORT_CHUNK_SIZE linhas enquanto os resultados são transmitidos.
+    """
+    settings = get_settings()
+    content_type = request.headers.get("content-type", "application/x-ndjson")
+    logger.info(f"Iniciando importação de jogadores ({content_type})")
+
+    spool = tempfile.SpooledTemporaryFile(max_size=settings.IMPORT_SPOOL_MAX_MEMORY)
+    try:
+        async for chunk in request.stream():
+            spool.write(chunk)
+        spool.seek(0)
+    except Exception as e:
+        spool.close()
+        logger.error(f"Erro ao receber arquivo de importação: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
+
+    def results():
+        try:
+            lines = io.TextIOWrapper(spool, encoding="utf-8", newline="")
+            rows = iter_import_rows(lines, content_type)
+            for result in player_service.import_players(rows, settings.IMPORT_CHUNK_SIZE):
+                yield json.dumps(result) + "\n"
+        finally:
+            spool.close()
+
+    return StreamingResponse(results(), media_type="application/x-ndjson")
+
+
+@router.get(
+    "/export",
+    dependencies=[Depends(verify_token)],
+    responses={200: {"content": {"application/x-ndjson": {}, "application/json": {}}}},
+)
+@limiter.limit("5/minute")
+async def export_players(
+    request: Request,
+    format: Literal["ndjson", "json"] = "ndjson",
+    player_service: PlayerService = Depends(get_player_service),
+):
+    """Exporta todos os jogadores (id, name, tag) em streaming, como NDJSON ou array JSON
+
+    As linhas são lidas do banco em blocos de EXPORT_BATCH_SIZE e escritas
+    conforme chegam, mantendo a memória constante independente do tamanho do cadastro.
+    """
+    settings = get_settings()
+    logger.info(f"Exportando jogadores ({format})")
+    media_type = "application/x-ndjson" if format == "ndjson" else "application/json"
+    return StreamingResponse(
+        player_service.export_players(format, settings.EXPORT_BATCH_SIZE),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="players.{format}"'},
+    )
+
+
 @router.get(
     "/", response_model=List[BasicPlayerResponse], dependencies=[Depends(verify_token)]
 )
 @limiter.limit("30/minute")
-async def get_all_players(request: Request, token: str = Depends(verify_token)):
-    """Lista todos os jogadores sem informações sensíveis"""
+async def get_all_players(
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = None,
+    name: Optional[str] = Query(None, min_length=1, description="Prefixo do nome"),
+    tag: Optional[str] = Query(None, min_length=1, description="Prefixo da tag"),
+    token: str = Depends(verify_token),
+    player_service: PlayerService = Depends(get_player_service),
+):
+    """Lista jogadores sem informações sensíveis, paginado por cursor
+
+    O cursor da próxima página vem no cabeçalho X-Next-Cursor (ausente na última).
+    Com If-None-Match igual ao ETag atual, responde 304 sem consultar os jogadores.
+    """
+    settings = get_settings()
+    limit = min(limit or settings.PLAYERS_PAGE_SIZE, settings.PLAYERS_PAGE_MAX)
     try:
+        etag = await run_in_db_executor(player_service.roster_etag, limit, cursor, name, tag)
+        cache_headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=cache_headers)
+
         logger.info("Buscando lista básica de jogadores")
-        player_service = PlayerService()
-        players = player_service.get_all_players()
-        if not players:
-            return []
+        players, next_cursor = await run_in_db_executor(
+            player_service.list_players, limit, cursor, name, tag
+        )
+        response.headers.update(cache_headers)
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
         logger.info(f"Encontrados {len(players)} jogadores")
-        return players
+        return trusted_response(players, response)
     except Exception as e:
         logger.error(f"Erro ao listar jogadores: {str(e)}")
         raise HTTPException(status_code=400, detail=str(e))
@@ -99,14 +219,24 @@ async def get_player_rank(
     response: Response,
     name: str,
     tag: str,
-    token: str = Depends(verify_token)
+    token: str = Depends(verify_token),
+    player_service: PlayerService = Depends(get_player_service),
 ):
     logger.info(f"Buscando rank do jogador: {name}#{tag}")
     try:
-        player_service = PlayerService()
-        result = player_service.get_player_rank(name, tag)
+        # Requisições simultâneas pelo mesmo jogador aguardam uma única chamada
+        # no executor, sem ocupar uma thread do banco cada uma
+        valid_name, valid_tag = player_service.validate_player_params(name, tag)
+        result = await rank_flight.do(
+            f"{valid_name}#{valid_tag}",
+            lambda: run_in_db_executor(player_service.get_player_rank, name, tag),
+            timeout=get_settings().RANK_FETCH_WAIT_TIMEOUT,
+        )
         logger.info(f"Rank do jogador {name}#{tag} recuperado com sucesso")
         return result
+    except TimeoutError as e:
+        logger.error(f"Erro ao buscar rank do jogador {name}#{tag}: {str(e)}")
+        raise HTTPException(status_code=504, detail="Tempo esgotado ao buscar rank")
     except RateLimitExceeded:
         raise HTTPException(
             status_code=429,
@@ -124,14 +254,18 @@ async def get_player_rank(
 
 @router.delete("/{id}", response_model=DeletePlayerResponse)
 @limiter.limit("10/minute")
-async def delete_player(request: Request, id: int, token: str = Depends(verify_token)):
+async def delete_player(
+    request: Request,
+    id: int,
+    token: str = Depends(verify_token),
+    player_service: PlayerService = Depends(get_player_service),
+):
     try:
         if id <= 0:
             raise HTTPException(status_code=400, detail="ID do jogador inválido")
 
         logger.info(f"Deletando jogador com ID: {id}")
-        player_service = PlayerService()
-        result = player_service.delete_player(id)
+        result = await run_in_db_executor(player_service.delete_player, id)
 
         if not result:
             raise HTTPException(status_code=404, detail="Jogador não encontrado")
@@ -152,11 +286,16 @@ async def delete_player(request: Request, id: int, token: str = Depends(verify_t
     responses={400: {"model": ErrorResponse}, 404: {"model": ErrorResponse}},
 )
 @limiter.limit("10/minute")
-async def verify_credentials(request: Request, cred: CredentialRequest):
+async def verify_credentials(
+    request: Request,
+    cred: CredentialRequest,
+    player_service: PlayerService = Depends(get_player_service),
+):
     try:
         logger.info(f"Verificando credenciais para login: {cred.login}")
-        player_service = PlayerService()
-        result = player_service.verify_credentials(cred.login, cred.email)
+        result = await run_in_db_executor(
+            player_service.verify_credentials, cred.login, cred.email
+        )
         if result and result.get("password"):
             logger.info(f"Credenciais verificadas com sucesso para login: {cred.login}")
             return {"status": "success", "password": result["password"]}
@@ -173,7 +312,11 @@ async def verify_credentials(request: Request, cred: CredentialRequest):
     responses={400: {"model": ErrorResponse}},
 )
 @limiter.limit("20/minute")
-async def check_player_exists(request: Request, data: dict):
+async def check_player_exists(
+    request: Request,
+    data: dict,
+    player_service: PlayerService = Depends(get_player_service),
+):
     try:
         email = data.get("email")
         login = data.get("login")
@@ -181,8 +324,9 @@ async def check_player_exists(request: Request, data: dict):
             f"Verificando existência de jogador - Email: {email}, Login: {login}"
         )
 
-        player_service = PlayerService()
-        result = player_service.check_player_exists(email, login)
+        result = await run_in_db_executor(
+            player_service.check_player_exists, email, login
+        )
 
         logger.info(
             f"Resultado da verificação - Email existe: {result.get('email_exists')}, "
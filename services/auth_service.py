@@ -1,4 +1,12 @@
-from services.crypto_service import CryptoService
+from config.settings import get_settings
+from services.cache_service import CacheService
+from services.token_store import TokenStore
+from services.metrics import cache_collector, registry
+from typing import Any, Dict, Optional, Tuple
+import base64
+import hashlib
+import hmac
+import os
 import time
 import logging
 
@@ -6,12 +14,50 @@ import logging
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+TOKEN_VERSION = "v1"
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _memo_key(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
 
 class AuthService:
-    def __init__(self):
-        self.crypto_service = CryptoService()
-        self.tokens = set()
-        self.token_expiry = 60  # em segundos
+    """Emite e valida tokens assinados com HMAC-SHA256, sem estado compartilhado
+
+    Formato: ``v1.<expiração>.<id>.<assinatura>``. Qualquer worker com o mesmo
+    TOKEN_SECRET valida o token sem consultar outros processos; apenas a lista
+    de revogação (logout) é local ao processo.
+    """
+
+    def __init__(self, secret: Optional[str] = None):
+        settings = get_settings()
+        secret = secret or settings.TOKEN_SECRET
+        if secret:
+            self._secret = secret.encode()
+        elif settings.WORKERS > 1:
+            # Cada worker teria a sua chave e rejeitaria os tokens emitidos pelos outros
+            logger.error("TOKEN_SECRET não configurado com WORKERS > 1")
+            raise ValueError("TOKEN_SECRET é obrigatório quando WORKERS > 1")
+        else:
+            # Nunca derivar a chave de constantes do código: qualquer um com o
+            # fonte poderia emitir tokens válidos
+            logger.warning(
+                "TOKEN_SECRET não configurado; usando segredo aleatório deste processo. "
+                "Tokens não serão aceitos por outros workers nem após reinício"
+            )
+            self._secret = os.urandom(32)
+
+        self.token_expiry = settings.TOKEN_EXPIRY  # em segundos
+        # Tokens revogados até a sua expiração; cheio, recusa novas revogações
+        self.revoked = TokenStore(max_entries=settings.TOKEN_STORE_MAX_ENTRIES)
+        # sha256(token) -> (id, expiração) de tokens com assinatura já conferida
+        self._verified = CacheService(
+            cache_duration=self.token_expiry, max_entries=settings.TOKEN_MEMO_MAX_ENTRIES
+        )
         logger.info(
             "AuthService iniciado com tempo de expiração de %d segundos",
             self.token_expiry,
@@ -20,34 +66,111 @@ class AuthService:
     def get_expiry_time(self) -> int:
         return self.token_expiry
 
+    def _sign(self, payload: str) -> str:
+        return _b64encode(hmac.new(self._secret, payload.encode(), hashlib.sha256).digest())
+
     def generate_token(self) -> str:
-        timestamp = str(time.time())
-        token = self.crypto_service.encrypt(timestamp)
-        self.tokens.add(token)
+        expires_at = int(time.time()) + self.token_expiry
+        token_id = _b64encode(os.urandom(12))
+        payload = f"{TOKEN_VERSION}.{expires_at}.{token_id}"
         logger.info("Novo token gerado")
-        return token
+        return f"{payload}.{self._sign(payload)}"
+
+    def decode_token(self, token: str) -> Optional[Tuple[str, float]]:
+        """Valida a assinatura e retorna (id, expiração), ou None se o token for inválido"""
+        if not token or not isinstance(token, str):
+            return None
+
+        payload, _, signature = token.rpartition(".")
+        parts = payload.split(".")
+        if len(parts) != 3 or parts[0] != TOKEN_VERSION:
+            return None
+
+        # Comparação em tempo constante, em bytes: compare_digest rejeita str não ASCII
+        if not hmac.compare_digest(signature.encode(), self._sign(payload).encode()):
+            return None
+
+        try:
+            expires_at = float(parts[1])
+        except ValueError:
+            return None
+        return parts[2], expires_at
 
     def verify_token(self, token: str) -> bool:
         if not token:
             logger.warning("Token vazio recebido")
             return False
 
-        if token not in self.tokens:
-            logger.warning("Token não encontrado no conjunto de tokens válidos")
+        memo_key = _memo_key(token)
+        decoded = self._verified.get(memo_key)
+        if decoded is None:
+            decoded = self.decode_token(token)
+            if decoded is None:
+                logger.warning("Token com formato ou assinatura inválidos")
+                return False
+            remaining = decoded[1] - time.time()
+            if remaining > 0:
+                self._verified.set(memo_key, decoded, ttl=remaining)
+
+        # Expiração e revogação são conferidas mesmo quando o token vem do memo
+        token_id, expires_at = decoded
+        if time.time() >= expires_at:
+            logger.warning("Token expirado")
             return False
 
-        try:
-            timestamp = float(self.crypto_service.decrypt(token))
-            if time.time() - timestamp > self.token_expiry:
-                self.tokens.remove(token)
-                logger.warning("Token expirado removido")
-                return False
-            logger.info("Token verificado com sucesso")
-            return True
-        except Exception as e:
-            logger.error(f"Erro ao decodificar o token: {str(e)}")
+        if self.revoked.contains(token_id):
+            logger.warning("Token revogado")
+            return False
+
+        logger.info("Token verificado com sucesso")
+        return True
+
+    def revoke_token(self, token: str) -> bool:
+        """Revoga um token válido até a sua expiração
+
+        Levanta TokenStoreFullError se o registro de revogações estiver cheio.
+        """
+        decoded = self.decode_token(token)
+        if decoded is None:
             return False
 
+        token_id, expires_at = decoded
+        self.revoked.add(token_id, expires_at, now=time.time())
+        self._verified.delete(_memo_key(token))
+        logger.info("Token revogado")
+        return True
+
+    def start_reaper(self, interval: float):
+        """Inicia a limpeza periódica dos tokens revogados já expirados"""
+        self.revoked.start_sweeper(interval)
+
+    def stop_reaper(self):
+        self.revoked.stop_sweeper()
+
+    def stats(self) -> Dict[str, Any]:
+        return self.revoked.stats()
+
+
+def _token_store_collector(store: TokenStore):
+    def collect():
+        stats = store.stats()
+        return [
+            ("auth_revoked_tokens", "gauge", "Tokens revogados ainda não expirados", {}, stats["live"]),
+            (
+                "auth_token_sweep_duration_seconds",
+                "gauge",
+                "Duração da última limpeza de tokens revogados",
+                {},
+                stats["last_sweep_duration"],
+            ),
+        ]
+
+    return collect
+
 
 # Criando uma instância singleton do AuthService
 auth_service = AuthService()
+registry.register_collector("auth:revoked", _token_store_collector(auth_service.revoked))
+registry.register_collector(
+    "cache:token_memo", cache_collector("token_memo", auth_service._verified)
+)
@@ -0,0 +1,277 @@
+from abc import ABC, abstractmethod
+from threading import Event, Lock, Thread, local
+from typing import Optional, Any, Dict
+import json
+import logging
+import os
+import sqlite3
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend(ABC):
+    """Interface comum dos backends de cache (memória, Redis, SQLite)"""
+
+    def __init__(self):
+        self._sweeper: Optional[Thread] = None
+        self._stop_sweeper = Event()
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        """Retorna o valor do cache se existir e não estiver expirado"""
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """Armazena um valor no cache"""
+
+    @abstractmethod
+    def delete(self, key: str) -> bool:
+        """Remove uma entrada do cache"""
+
+    @abstractmethod
+    def clear(self):
+        """Limpa todo o cache"""
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        """Retorna contadores de uso do cache"""
+
+    def sweep(self) -> int:
+        """Remove entradas expiradas; backends com expiração nativa não precisam"""
+        return 0
+
+    def start_sweeper(self, interval: float):
+        """Inicia a thread que remove entradas expiradas periodicamente"""
+        if interval <= 0 or (self._sweeper and self._sweeper.is_alive()):
+            return
+
+        self._stop_sweeper.clear()
+
+        def run():
+            while not self._stop_sweeper.wait(interval):
+                try:
+                    self.sweep()
+                except Exception as e:
+                    logger.error(f"Erro na limpeza do cache: {e}")
+
+        self._sweeper = Thread(target=run, name="cache-sweeper", daemon=True)
+        self._sweeper.start()
+        logger.info(f"Limpeza periódica do cache iniciada a cada {interval} segundos")
+
+    def stop_sweeper(self):
+        """Interrompe a thread de limpeza periódica"""
+        self._stop_sweeper.set()
+        if self._sweeper:
+            self._sweeper.join(timeout=5)
+            self._sweeper = None
+
+
+class RedisCacheBackend(CacheBackend):
+    """Cache compartilhado entre workers em um servidor Redis"""
+
+    def __init__(
+        self,
+        url: str = "redis://localhost:6379/0",
+        namespace: str = "cache",
+        cache_duration: int = 300,
+        client: Any = None,
+    ):
+        super().__init__()
+        if client is None:
+            try:
+                import redis
+            except ImportError:
+                raise ImportError(
+                    "O backend de cache 'redis' requer o pacote redis (pip install redis)"
+                )
+            client = redis.Redis.from_url(url)
+
+        self._client = client
+        self.namespace = namespace
+        self.cache_duration = cache_duration
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    def _count(self, hit: bool):
+        with self._lock:
+            if hit:
+                self._hits += 1
+            else:
+                self._misses += 1
+
+    def get(self, key: str) -> Optional[Any]:
+        try:
+            raw = self._client.get(self._key(key))
+        except Exception as e:
+            logger.error(f"Erro ao ler cache no Redis: {e}")
+            self._count(hit=False)
+            return None
+
+        self._count(hit=raw is not None)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        ttl = self.cache_duration if ttl is None else ttl
+        try:
+            self._client.set(
+                self._key(key), json.dumps(value), px=max(1, int(ttl * 1000))
+            )
+        except Exception as e:
+            logger.error(f"Erro ao gravar cache no Redis: {e}")
+
+    def delete(self, key: str) -> bool:
+        try:
+            return bool(self._client.delete(self._key(key)))
+        except Exception as e:
+            logger.error(f"Erro ao remover cache no Redis: {e}")
+            return False
+
+    def clear(self):
+        keys = list(self._client.scan_iter(match=f"{self.namespace}:*"))
+        if keys:
+            self._client.delete(*keys)
+        logger.info("Cache limpo")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "backend": "redis",
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": self._hits / lookups if lookups else 0.0,
+            }
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """Cache compartilhado entre workers em um arquivo SQLite local"""
+
+    def __init__(
+        self,
+        path: str,
+        namespace: str = "cache",
+        cache_duration: int = 300,
+        max_entries: int = 1024,
+    ):
+        super().__init__()
+        self.path = path
+        self.namespace = namespace
+        self.cache_duration = cache_duration
+        self.max_entries = max_entries
+        self._local = local()
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = self._connection()
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                PRIMARY KEY (namespace, key)
+            )
+        """
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_cache_expires ON cache_entries(namespace, expires_at)"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _count(self, hit: bool):
+        with self._lock:
+            if hit:
+                self._hits += 1
+            else:
+                self._misses += 1
+
+    def get(self, key: str) -> Optional[Any]:
+        try:
+            row = self._connection().execute(
+                "SELECT value FROM cache_entries WHERE namespace = ? AND key = ? AND expires_at > ?",
+                (self.namespace, key, time.time()),
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.error(f"Erro ao ler cache no SQLite: {e}")
+            row = None
+
+        self._count(hit=row is not None)
+        return json.loads(row[0]) if row else None
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        ttl = self.cache_duration if ttl is None else ttl
+        try:
+            self._connection().execute(
+                "INSERT OR REPLACE INTO cache_entries (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                (self.namespace, key, json.dumps(value), time.time() + ttl),
+            )
+        except sqlite3.Error as e:
+            logger.error(f"Erro ao gravar cache no SQLite: {e}")
+
+    def delete(self, key: str) -> bool:
+        cursor = self._connection().execute(
+            "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+            (self.namespace, key),
+        )
+        return cursor.rowcount > 0
+
+    def clear(self):
+        self._connection().execute(
+            "DELETE FROM cache_entries WHERE namespace = ?", (self.namespace,)
+        )
+        logger.info("Cache limpo")
+
+    def sweep(self) -> int:
+        """Remove expirados e, acima do limite, as entradas mais próximas de expirar"""
+        conn = self._connection()
+        removed = conn.execute(
+            "DELETE FROM cache_entries WHERE namespace = ? AND expires_at <= ?",
+            (self.namespace, time.time()),
+        ).rowcount
+        removed += conn.execute(
+            """
+            DELETE FROM cache_entries
+            WHERE namespace = ? AND key IN (
+                SELECT key FROM cache_entries
+                WHERE namespace = ?
+                ORDER BY expires_at DESC
+                LIMIT -1 OFFSET ?
+            )
+        """,
+            (self.namespace, self.namespace, self.max_entries),
+        ).rowcount
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        size = self._connection().execute(
+            "SELECT COUNT(*) FROM cache_entries WHERE namespace = ?", (self.namespace,)
+        ).fetchone()[0]
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "backend": "sqlite",
+                "size": size,
+                "max_entries": self.max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": self._hits / lookups if lookups else 0.0,
+            }
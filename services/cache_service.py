@@ -1,36 +1,144 @@
 import time
 import logging
-from typing import Optional, Any
+from collections import OrderedDict
+from threading import Lock
+from typing import Optional, Any, Dict
+from config.settings import get_settings
+from services.cache_backends import CacheBackend, RedisCacheBackend, SQLiteCacheBackend
+from services.metrics import cache_collector, registry
 
 logger = logging.getLogger(__name__)
 
 
-class CacheService:
-    def __init__(self, cache_duration: int = 300):  # 5 minutos por padrão
-        self._cache = {}
+class CacheService(CacheBackend):
+    """Cache em memória com política LRU, TTL por entrada e limite de tamanho"""
+
+    def __init__(self, cache_duration: int = 300, max_entries: int = 1024):  # 5 minutos por padrão
+        super().__init__()
+        self._cache: "OrderedDict[str, tuple[float, Any]]" = OrderedDict()
+        self._lock = Lock()
         self.cache_duration = cache_duration
+        self.max_entries = max_entries
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
 
     def get(self, key: str) -> Optional[Any]:
         """Retorna o valor do cache se existir e não estiver expirado"""
-        cached_data = self._cache.get(key)
-
-        if cached_data:
-            timestamp, value = cached_data
-            if time.time() - timestamp < self.cache_duration:
-                logger.info(f"Cache hit para {key}")
-                return value
-            else:
+        with self._lock:
+            cached_data = self._cache.get(key)
+
+            if cached_data is None:
+                self._misses += 1
+                return None
+
+            expires_at, value = cached_data
+            if time.monotonic() >= expires_at:
                 # Cache expirado
                 del self._cache[key]
-                logger.info(f"Cache expirado para {key}")
-        return None
+                self._expirations += 1
+                self._misses += 1
+                logger.debug(f"Cache expirado para {key}")
+                return None
+
+            self._cache.move_to_end(key)
+            self._hits += 1
+        logger.debug(f"Cache hit para {key}")
+        return value
 
-    def set(self, key: str, value: Any):
-        """Armazena um valor no cache"""
-        self._cache[key] = (time.time(), value)
-        logger.info(f"Cache atualizado para {key}")
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """Armazena um valor no cache, descartando a entrada menos usada se necessário"""
+        expires_at = time.monotonic() + (self.cache_duration if ttl is None else ttl)
+        with self._lock:
+            self._cache[key] = (expires_at, value)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+                self._evictions += 1
+        logger.debug(f"Cache atualizado para {key}")
+
+    def delete(self, key: str) -> bool:
+        """Remove uma entrada do cache"""
+        with self._lock:
+            return self._cache.pop(key, None) is not None
 
     def clear(self):
         """Limpa todo o cache"""
-        self._cache.clear()
+        with self._lock:
+            self._cache.clear()
         logger.info("Cache limpo")
+
+    def sweep(self) -> int:
+        """Remove todas as entradas expiradas e retorna quantas foram removidas"""
+        now = time.monotonic()
+        with self._lock:
+            expired = [key for key, (expires_at, _) in self._cache.items() if now >= expires_at]
+            for key in expired:
+                del self._cache[key]
+            self._expirations += len(expired)
+        if expired:
+            logger.debug(f"{len(expired)} entradas expiradas removidas do cache")
+        return len(expired)
+
+    def stats(self) -> Dict[str, Any]:
+        """Retorna contadores de uso do cache"""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "backend": "memory",
+                "size": len(self._cache),
+                "max_entries": self.max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "hit_ratio": self._hits / lookups if lookups else 0.0,
+            }
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+
+def create_cache_backend(
+    namespace: str, cache_duration: int = 300, max_entries: int = 1024
+) -> CacheBackend:
+    """Cria o backend de cache configurado em Settings.CACHE_BACKEND"""
+    settings = get_settings()
+    backend = settings.CACHE_BACKEND.lower()
+
+    if backend == "memory":
+        return CacheService(cache_duration=cache_duration, max_entries=max_entries)
+    if backend == "redis":
+        return RedisCacheBackend(
+            url=settings.REDIS_URL, namespace=namespace, cache_duration=cache_duration
+        )
+    if backend == "sqlite":
+        return SQLiteCacheBackend(
+            path=settings.CACHE_SQLITE_PATH,
+            namespace=namespace,
+            cache_duration=cache_duration,
+            max_entries=max_entries,
+        )
+    raise ValueError(f"Backend de cache desconhecido: {settings.CACHE_BACKEND}")
+
+
+_rank_cache: Optional[CacheBackend] = None
+_rank_cache_lock = Lock()
+
+
+def get_rank_cache() -> CacheBackend:
+    """Retorna o cache de ranks compartilhado pelo processo"""
+    global _rank_cache
+    if _rank_cache is None:
+        with _rank_cache_lock:
+            if _rank_cache is None:
+                settings = get_settings()
+                _rank_cache = create_cache_backend(
+                    "rank",
+                    cache_duration=settings.RANK_CACHE_TTL,
+                    max_entries=settings.RANK_CACHE_MAX_ENTRIES,
+                )
+                registry.register_collector("cache:rank", cache_collector("rank", _rank_cache))
+                logger.info(f"Cache de ranks usando backend: {settings.CACHE_BACKEND}")
+    return _rank_cache
@@ -0,0 +1,70 @@
+from services.player_service import PlayerService
+from services.admin_service import AdminService
+from services.google_auth_service import GoogleAuthService
+from threading import Lock
+from typing import Any, Callable, Dict
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceContainer:
+    """Mantém uma instância de cada serviço por worker, compartilhada entre requisições"""
+
+    def __init__(self):
+        self._services: Dict[str, Any] = {}
+        self._lock = Lock()
+        self._factories: Dict[str, Callable[[], Any]] = {
+            "player_service": PlayerService,
+            "admin_service": AdminService,
+            "google_auth_service": GoogleAuthService,
+        }
+
+    def get(self, name: str) -> Any:
+        service = self._services.get(name)
+        if service is not None:
+            return service
+
+        with self._lock:
+            service = self._services.get(name)
+            if service is None:
+                logger.info(f"Construindo serviço compartilhado: {name}")
+                service = self._factories[name]()
+                self._services[name] = service
+            return service
+
+    def startup(self):
+        """Constrói todos os serviços antes de aceitar requisições"""
+        for name in self._factories:
+            self.get(name)
+        logger.info("Container de serviços inicializado")
+
+    def shutdown(self):
+        self.reset()
+        logger.info("Container de serviços finalizado")
+
+    def override(self, name: str, service: Any):
+        """Substitui um serviço (usado em testes)"""
+        with self._lock:
+            self._services[name] = service
+
+    def reset(self):
+        """Descarta as instâncias para que sejam reconstruídas no próximo acesso"""
+        with self._lock:
+            self._services.clear()
+
+
+# Instância única do container por processo
+container = ServiceContainer()
+
+
+def get_player_service() -> PlayerService:
+    return container.get("player_service")
+
+
+def get_admin_service() -> AdminService:
+    return container.get("admin_service")
+
+
+def get_google_auth_service() -> GoogleAuthService:
+    return container.get("google_auth_service")
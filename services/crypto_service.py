@@ -1,15 +1,67 @@
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+from threading import Lock
+from services.metrics import CRYPTO_DURATION
+from typing import Dict, Tuple
 import base64
 import os
 import logging
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_KEY = "valorant-ranks-v1"
+STORAGE_KEY = "valorant-players-ranks-v1"
+KDF_SALT = b"valorant-static-salt"  # Mesmo salt do frontend
+KDF_ITERATIONS = 100000
+
+# Registro de chaves derivadas compartilhado pelo processo:
+# (material da chave, salt, iterações) -> chave derivada
+_derived_keys: Dict[Tuple[bytes, bytes, int], bytes] = {}
+_derived_keys_lock = Lock()
+
+
+def get_derived_key(
+    key_material: bytes, salt: bytes = KDF_SALT, iterations: int = KDF_ITERATIONS
+) -> bytes:
+    """Retorna a chave derivada do registro, executando o PBKDF2 apenas uma vez por processo"""
+    registry_key = (key_material, salt, iterations)
+    derived = _derived_keys.get(registry_key)
+    if derived is not None:
+        return derived
+
+    with _derived_keys_lock:
+        # Outra thread pode ter derivado a chave enquanto aguardávamos o lock
+        derived = _derived_keys.get(registry_key)
+        if derived is None:
+            logger.debug("Derivando chave criptográfica")
+            kdf = PBKDF2HMAC(
+                algorithm=hashes.SHA256(),
+                length=32,
+                salt=salt,
+                iterations=iterations,
+            )
+            with CRYPTO_DURATION.time(operation="derive"):
+                derived = kdf.derive(key_material)
+            _derived_keys[registry_key] = derived
+        return derived
+
+
+def warm_up_keys(keys=(DEFAULT_KEY, STORAGE_KEY)):
+    """Pré-deriva as chaves conhecidas para tirar o PBKDF2 do caminho das requisições"""
+    for key in keys:
+        get_derived_key(key.encode())
+    logger.info(f"{len(keys)} chaves criptográficas pré-derivadas")
+
+
+def clear_derived_keys():
+    """Limpa o registro de chaves derivadas (usado em testes)"""
+    with _derived_keys_lock:
+        _derived_keys.clear()
+
 
 class CryptoService:
-    def __init__(self, key="valorant-ranks-v1"):
+    def __init__(self, key=DEFAULT_KEY):
         logger.debug("Inicializando CryptoService")
         try:
             self.key = self._derive_key(key.encode())
@@ -20,20 +72,13 @@ class CryptoService:
             raise
 
     def _derive_key(self, key_material):
-        logger.debug("Derivando chave criptográfica")
-        salt = b"valorant-static-salt"  # Mesmo salt do frontend
         try:
-            kdf = PBKDF2HMAC(
-                algorithm=hashes.SHA256(),
-                length=32,
-                salt=salt,
-                iterations=100000,
-            )
-            return kdf.derive(key_material)
+            return get_derived_key(key_material)
         except Exception as e:
             logger.error(f"Erro ao derivar chave: {str(e)}")
             raise
 
+    @CRYPTO_DURATION.timed(operation="encrypt")
     def encrypt(self, data: str) -> str:
         if not isinstance(data, str) or not data:
             logger.error("Dados inválidos para criptografia")
@@ -51,6 +96,7 @@ class CryptoService:
             logger.error(f"Erro na criptografia: {str(e)}")
             raise ValueError(f"Erro na criptografia: {str(e)}")
 
+    @CRYPTO_DURATION.timed(operation="decrypt")
     def decrypt(self, encrypted_data: str) -> str:
         if not isinstance(encrypted_data, str) or not encrypted_data:
             logger.error("Dados inválidos para descriptografia")
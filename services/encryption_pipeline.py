@@ -0,0 +1,117 @@
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from threading import Lock
+from typing import Dict, List, Optional
+import logging
+import os
+from config.settings import get_settings
+from services.crypto_service import CryptoService, STORAGE_KEY
+from services.utils import chunked
+
+logger = logging.getLogger(__name__)
+
+EXECUTOR_KINDS = ("thread", "process", "serial")
+
+# Instâncias de CryptoService por chave, reaproveitadas dentro de cada processo/worker
+_crypto_by_key: Dict[str, CryptoService] = {}
+
+
+def _get_crypto(key: str) -> CryptoService:
+    crypto = _crypto_by_key.get(key)
+    if crypto is None:
+        crypto = _crypto_by_key[key] = CryptoService(key=key)
+    return crypto
+
+
+def encrypt_chunk(key: str, values: List[str]) -> List[str]:
+    """Criptografa um bloco de valores; função de módulo para poder ir a um ProcessPoolExecutor"""
+    crypto = _get_crypto(key)
+    return [crypto.encrypt(value) for value in values]
+
+
+class EncryptionPipeline:
+    """Criptografa lotes de senhas em paralelo, em blocos, preservando a ordem de entrada
+
+    Lotes de até `chunk_size` itens são criptografados na própria thread, pois
+    o custo de despachar para o pool superaria o ganho.
+    """
+
+    def __init__(
+        self,
+        kind: str = "thread",
+        workers: int = 0,
+        chunk_size: int = 256,
+        key: str = STORAGE_KEY,
+    ):
+        if kind not in EXECUTOR_KINDS:
+            raise ValueError(f"Executor de criptografia inválido: {kind}")
+        if chunk_size < 1:
+            raise ValueError("O tamanho do bloco de criptografia deve ser positivo")
+
+        self.kind = kind
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.key = key
+        self._executor: Optional[Executor] = None
+        self._lock = Lock()
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    if self.kind == "process":
+                        self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                    else:
+                        self._executor = ThreadPoolExecutor(
+                            max_workers=self.workers, thread_name_prefix="crypto"
+                        )
+                    logger.info(
+                        f"Pool de criptografia ({self.kind}) iniciado com {self.workers} workers"
+                    )
+        return self._executor
+
+    def encrypt_all(self, values: List[str]) -> List[str]:
+        """Retorna os valores criptografados na mesma ordem; qualquer erro aborta o lote todo"""
+        values = list(values)
+        if self.kind == "serial" or len(values) <= self.chunk_size:
+            return encrypt_chunk(self.key, values)
+
+        executor = self._get_executor()
+        chunks = list(chunked(values, self.chunk_size))
+        encrypted: List[str] = []
+        # Executor.map devolve os resultados na ordem de submissão
+        for result in executor.map(encrypt_chunk, [self.key] * len(chunks), chunks):
+            encrypted.extend(result)
+        return encrypted
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+
+_pipeline: Optional[EncryptionPipeline] = None
+_pipeline_lock = Lock()
+
+
+def get_encryption_pipeline() -> EncryptionPipeline:
+    """Pipeline de criptografia compartilhado pelo processo, configurado por ENCRYPTION_*"""
+    global _pipeline
+    if _pipeline is None:
+        with _pipeline_lock:
+            if _pipeline is None:
+                settings = get_settings()
+                _pipeline = EncryptionPipeline(
+                    kind=settings.ENCRYPTION_EXECUTOR,
+                    workers=settings.ENCRYPTION_WORKERS,
+                    chunk_size=settings.ENCRYPTION_CHUNK_SIZE,
+                )
+    return _pipeline
+
+
+def shutdown_encryption_pipeline():
+    global _pipeline
+    with _pipeline_lock:
+        if _pipeline is not None:
+            _pipeline.shutdown()
+            _pipeline = None
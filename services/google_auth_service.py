@@ -1,14 +1,46 @@
 import pyotp
-from typing import Optional, Dict
+from functools import lru_cache
+from threading import Lock
+from typing import Optional, Dict, Tuple
 from database.google_auth_repository import GoogleAuthRepository
+from services.cache_service import CacheService
+from services.metrics import cache_collector, registry
+from config.settings import get_settings
+import hashlib
+import hmac
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=128)
+def get_totp(secret: str) -> pyotp.TOTP:
+    """Objeto TOTP reaproveitado por segredo"""
+    return pyotp.TOTP(secret)
+
+
 class GoogleAuthService:
     def __init__(self):
         self.repository = GoogleAuthRepository()
+        settings = get_settings()
+        # Estado do 2FA por usuário ({"secret": segredo ativo ou None}), mantido
+        # pelas escritas deste serviço; o TTL limita a defasagem entre workers
+        self.state_cache = CacheService(
+            cache_duration=settings.TWO_FACTOR_CACHE_TTL, max_entries=256
+        )
+
+        # Último passo de tempo aceito por usuário (RFC 6238 §5.2): códigos do mesmo
+        # passo ou de passos anteriores são recusados. Entradas saem ao deixar a janela
+        self.totp_window = settings.TOTP_VALID_WINDOW
+        self.last_used_steps: Dict[str, Tuple[int, float]] = {}
+        self._steps_lock = Lock()
+        registry.register_collector(
+            "cache:two_factor", cache_collector("two_factor", self.state_cache)
+        )
+
+    def _cache_state(self, user_id: int, secret: Optional[str]):
+        self.state_cache.set(str(user_id), {"secret": secret})
 
     def generate_secret(self) -> str:
         return pyotp.random_base32()
@@ -21,17 +53,49 @@ class GoogleAuthService:
             " ", "%20"
         )  # Garantir que a URL esteja codificada corretamente
 
-    def verify_code(self, secret: str, code: str) -> bool:
+    def verify_code(self, secret: str, code: str, user_id: Optional[int] = None) -> bool:
+        """Verifica o código dentro da janela TOTP_VALID_WINDOW, aceitando cada passo uma única vez
+
+        Um código só é aceito se for de um passo posterior ao último aceito para o
+        usuário. Sem `user_id`, o dono é o hash do segredo (fluxo de setup).
+        """
         try:
-            totp = pyotp.TOTP(secret)
-            return totp.verify(code)
+            totp = get_totp(secret)
+            now = time.time()
+            current = int(now // totp.interval)
+            for counter in range(current - self.totp_window, current + self.totp_window + 1):
+                if hmac.compare_digest(str(code), totp.generate_otp(counter)):
+                    return self._mark_code_used(secret, user_id, counter, totp.interval, now)
+            return False
         except Exception as e:
             logger.error(f"Erro ao verificar código: {e}")
             return False
 
+    def _mark_code_used(
+        self, secret: str, user_id: Optional[int], counter: int, interval: int, now: float
+    ) -> bool:
+        owner = str(user_id) if user_id is not None else hashlib.sha256(secret.encode()).hexdigest()
+        # Depois deste instante, nenhum passo <= counter cabe mais na janela de tolerância
+        expires_at = (counter + self.totp_window + 1) * interval
+        with self._steps_lock:
+            self._prune_used_steps(now)
+            last = self.last_used_steps.get(owner)
+            if last is not None and counter <= last[0]:
+                logger.warning("Código 2FA já utilizado ou anterior ao último aceito")
+                return False
+            self.last_used_steps[owner] = (counter, expires_at)
+            return True
+
+    def _prune_used_steps(self, now: float):
+        expired = [owner for owner, (_, expires_at) in self.last_used_steps.items() if expires_at <= now]
+        for owner in expired:
+            del self.last_used_steps[owner]
+
     def activate_2fa(self, user_id: int, secret: str) -> bool:
         try:
             self.repository.activate_2fa(user_id, secret)
+            # O UPDATE não cria a linha se o segredo não foi salvo antes; relê do banco
+            self.state_cache.delete(str(user_id))
             logger.info(f"2FA ativado para usuário {user_id}")
             return True
         except Exception as e:
@@ -40,7 +104,7 @@ class GoogleAuthService:
 
     def is_2fa_active(self, user_id: int) -> bool:
         try:
-            secret = self.repository.get_secret(user_id)
+            secret = self._get_active_secret(user_id)
             return secret is not None and len(secret) > 0
         except Exception as e:
             logger.error(f"Erro ao verificar status do 2FA: {e}")
@@ -54,7 +118,7 @@ class GoogleAuthService:
 
             if not is_configured:
                 secret = self.generate_secret()
-                self.repository.save_secret(user_id, secret)
+                self.save_secret(user_id, secret)
                 response.update(
                     {"secret": secret, "qr_code_url": None}  # URL será gerada no router
                 )
@@ -64,13 +128,27 @@ class GoogleAuthService:
             logger.error(f"Erro ao verificar status do 2FA: {e}")
             raise Exception(str(e))
 
+    def save_secret(self, user_id: int, secret: str):
+        """Grava um segredo pendente; até a ativação o usuário fica sem 2FA ativo"""
+        self.repository.save_secret(user_id, secret)
+        self._cache_state(user_id, None)
+
     def setup_2fa(self, user_id: int) -> Dict[str, any]:
         """Substituir método antigo por chamada ao check_2fa_status"""
         return self.check_2fa_status(user_id)
 
+    def _get_active_secret(self, user_id: int) -> Optional[str]:
+        cached = self.state_cache.get(str(user_id))
+        if cached is not None:
+            return cached["secret"]
+
+        secret = self.repository.get_secret(user_id)
+        self._cache_state(user_id, secret)
+        return secret
+
     def get_user_secret(self, user_id: int) -> Optional[str]:
         try:
-            return self.repository.get_secret(user_id)
+            return self._get_active_secret(user_id)
         except Exception as e:
             logger.error(f"Erro ao buscar segredo do usuário: {e}")
             return None
@@ -78,6 +156,7 @@ class GoogleAuthService:
     def reset_2fa(self, user_id: int) -> bool:
         try:
             self.repository.delete_2fa(user_id)
+            self._cache_state(user_id, None)
             logger.info(f"2FA resetado para usuário {user_id}")
             return True
         except Exception as e:
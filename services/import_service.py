@@ -0,0 +1,58 @@
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+from pydantic import ValidationError
+from models.player import Player
+import csv
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+# (número da linha, dados validados do jogador, mensagem de erro)
+ImportRow = Tuple[int, Optional[Dict[str, Any]], Optional[str]]
+
+PLAYER_FIELDS = list(Player.model_fields)
+
+
+def validate_player_row(line: int, data: Any) -> ImportRow:
+    try:
+        player = Player.model_validate(data).model_dump()
+    except ValidationError as e:
+        fields = ", ".join(str(err["loc"][0]) for err in e.errors() if err["loc"])
+        return line, None, f"Dados do jogador inválidos: {fields or 'formato'}"
+
+    # Senha vazia não pode ser criptografada e derrubaria o bloco inteiro
+    if not player["password"]:
+        return line, None, "Dados do jogador inválidos: password"
+    return line, player, None
+
+
+def iter_ndjson_rows(lines: Iterable[str]) -> Iterator[ImportRow]:
+    """Lê um objeto JSON por linha, ignorando linhas em branco"""
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError:
+            yield line_number, None, "JSON inválido"
+            continue
+        yield validate_player_row(line_number, data)
+
+
+def iter_csv_rows(lines: Iterable[str]) -> Iterator[ImportRow]:
+    """Lê CSV com cabeçalho (name, tag, email, login, password)"""
+    reader = csv.DictReader(lines)
+    missing = [field for field in PLAYER_FIELDS if field not in (reader.fieldnames or [])]
+    if missing:
+        yield 1, None, f"Cabeçalho CSV sem as colunas: {', '.join(missing)}"
+        return
+
+    for row in reader:
+        yield validate_player_row(reader.line_num, {field: row[field] for field in PLAYER_FIELDS})
+
+
+def iter_import_rows(lines: Iterable[str], content_type: str) -> Iterator[ImportRow]:
+    """Escolhe o leitor pelo Content-Type; o padrão é NDJSON"""
+    if "csv" in (content_type or "").lower():
+        return iter_csv_rows(lines)
+    return iter_ndjson_rows(lines)
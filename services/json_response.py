@@ -0,0 +1,37 @@
+from typing import Any, Optional, Type
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from config.settings import get_settings
+
+
+def get_json_response_class() -> Type[JSONResponse]:
+    """Classe de resposta padrão: ORJSONResponse se FAST_JSON_RESPONSES estiver ativo"""
+    if not get_settings().FAST_JSON_RESPONSES:
+        return JSONResponse
+
+    try:
+        import orjson  # noqa: F401
+    except ImportError:
+        raise ImportError("FAST_JSON_RESPONSES requer o pacote orjson (pip install orjson)")
+
+    from fastapi.responses import ORJSONResponse
+    return ORJSONResponse
+
+
+def trusted_response(content: Any, response: Optional[Response] = None) -> Any:
+    """Devolve dados já no formato do response_model sem revalidá-los
+
+    Com FAST_JSON_RESPONSES ativo, o conteúdo é serializado direto pelo orjson
+    e a validação do response_model é ignorada; use apenas com dicts montados
+    pelo próprio serviço com os campos do modelo (opcionais ausentes não são
+    preenchidos com null). Cabeçalhos já definidos em `response` (parâmetro
+    injetado da rota) são preservados.
+    Desativado, retorna `content` para o caminho normal do FastAPI.
+    """
+    if not get_settings().FAST_JSON_RESPONSES:
+        return content
+
+    headers = None
+    if response is not None:
+        headers = {k: v for k, v in response.headers.items() if k != "content-length"}
+    return get_json_response_class()(content, headers=headers)
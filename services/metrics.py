@@ -0,0 +1,538 @@
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+from threading import Event, Lock, Thread
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import glob
+import json
+import logging
+import os
+import time
+import psutil
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+# (nome, tipo, descrição, labels, valor) produzido por um coletor no momento da coleta
+CollectedSample = Tuple[str, str, str, Dict[str, Any], float]
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+class Metric:
+    type = ""
+
+    def __init__(self, name: str, documentation: str):
+        self.name = name
+        self.documentation = documentation
+        self._lock = Lock()
+        self._values: Dict[LabelKey, Any] = {}
+
+    def _copy(self, value: Any) -> Any:
+        return value
+
+    def samples(self) -> List[Tuple[LabelKey, Any]]:
+        with self._lock:
+            return [(key, self._copy(value)) for key, value in self._values.items()]
+
+    def value(self, **labels) -> Any:
+        with self._lock:
+            return self._copy(self._values.get(_label_key(labels)))
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Gauge(Metric):
+    type = "gauge"
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[_label_key(labels)] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation)
+        self.buckets = tuple(sorted(buckets))
+
+    def _copy(self, value: Any) -> Any:
+        if value is None:
+            return None
+        return {"counts": list(value["counts"]), "sum": value["sum"]}
+
+    def observe(self, value: float, **labels):
+        key = _label_key(labels)
+        # Contagens não cumulativas; a última posição é o bucket +Inf
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = {"counts": [0] * (len(self.buckets) + 1), "sum": 0.0}
+            state["counts"][index] += 1
+            state["sum"] += value
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def timed(self, **labels):
+        """Decorador que observa a duração de cada chamada da função"""
+
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.observe(time.perf_counter() - start, **labels)
+
+            return wrapper
+
+        return decorator
+
+
+# Agregado dos contadores de workers encerrados; fora do padrão metrics_*.json
+RETIRED_SNAPSHOT = "retired_metrics.json"
+RETIRED_LOCK = "retired_metrics.lock"
+RETIRED_LOCK_TIMEOUT = 30.0
+
+
+def _process_start(pid: int) -> Optional[str]:
+    """Instante de início do processo em ms, ou None se ele não existir"""
+    try:
+        return str(int(psutil.Process(pid).create_time() * 1000))
+    except (psutil.NoSuchProcess, psutil.AccessDenied):
+        return None
+
+
+class MetricsRegistry:
+    """Registro de métricas do processo, exposto no formato texto do Prometheus
+
+    Com METRICS_DIR configurado, cada worker grava periodicamente um snapshot em
+    ``metrics_<pid>_<início do processo>.json`` e o /metrics de qualquer worker
+    soma os snapshots dos processos vivos. O instante de início distingue um
+    worker novo que reutiliza o PID de um encerrado. Contadores e histogramas de
+    workers encerrados são incorporados a um agregado retido (os totais nunca
+    diminuem, como espera o Prometheus) e apenas os seus gauges são descartados.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._collectors: Dict[str, Callable[[], Iterable[CollectedSample]]] = {}
+        self._lock = Lock()
+        self._flusher: Optional[Thread] = None
+        self._stop_flusher = Event()
+        self._directory: Optional[str] = None
+
+    def _register(self, cls, name: str, documentation: str, **kwargs) -> Metric:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, **kwargs)
+            return metric
+
+    def counter(self, name: str, documentation: str) -> Counter:
+        return self._register(Counter, name, documentation)
+
+    def gauge(self, name: str, documentation: str) -> Gauge:
+        return self._register(Gauge, name, documentation)
+
+    def histogram(
+        self, name: str, documentation: str, buckets: Iterable[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram, name, documentation, buckets=buckets)
+
+    def register_collector(self, key: str, collector: Callable[[], Iterable[CollectedSample]]):
+        """Registra (ou substitui) uma função que produz amostras no momento da coleta"""
+        with self._lock:
+            self._collectors[key] = collector
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors.values())
+
+        data: Dict[str, Dict[str, Any]] = {}
+        for metric in metrics:
+            entry = {
+                "type": metric.type,
+                "help": metric.documentation,
+                "samples": [[dict(key), value] for key, value in metric.samples()],
+            }
+            if isinstance(metric, Histogram):
+                entry["buckets"] = list(metric.buckets)
+            data[metric.name] = entry
+
+        for collector in collectors:
+            try:
+                for name, metric_type, documentation, labels, value in collector():
+                    entry = data.setdefault(
+                        name, {"type": metric_type, "help": documentation, "samples": []}
+                    )
+                    entry["samples"].append([labels, value])
+            except Exception as e:
+                logger.error(f"Erro ao coletar métricas: {e}")
+        return data
+
+    def snapshot_path(self, directory: str) -> str:
+        """Arquivo de snapshot deste processo no diretório compartilhado"""
+        pid = os.getpid()
+        return os.path.join(directory, f"metrics_{pid}_{_process_start(pid)}.json")
+
+    def write_snapshot(self, directory: str, snapshot: Optional[Dict[str, Dict[str, Any]]] = None):
+        """Grava o snapshot deste processo de forma atômica para a agregação entre workers"""
+        os.makedirs(directory, exist_ok=True)
+        _write_json(self.snapshot_path(directory), self.snapshot() if snapshot is None else snapshot)
+
+    def collect(self, directory: Optional[str] = None) -> str:
+        """Retorna as métricas agregadas no formato texto de exposição"""
+        own = self.snapshot()
+        snapshots = [own]
+
+        if directory:
+            self.write_snapshot(directory, own)
+            own_name = os.path.basename(self.snapshot_path(directory))
+            stale = []
+            for path in glob.glob(os.path.join(directory, "metrics_*.json")):
+                if os.path.basename(path) == own_name:
+                    continue
+                try:
+                    pid, start = os.path.basename(path)[len("metrics_"):-len(".json")].split("_")
+                    pid = int(pid)
+                except ValueError:
+                    continue
+                if _process_start(pid) != start:
+                    # Processo encerrado (ou PID reutilizado por outro)
+                    stale.append(path)
+                    continue
+                snapshot = _read_snapshot(path)
+                if snapshot is not None:
+                    snapshots.append(snapshot)
+            snapshots.extend(retire_snapshots(directory, stale))
+
+        merged = merge_snapshots(snapshots)
+        add_cache_hit_ratios(merged)
+        return render(merged)
+
+    def start_flusher(self, directory: str, interval: float):
+        """Grava o snapshot periodicamente para que outros workers o vejam no /metrics"""
+        if not directory or interval <= 0 or (self._flusher and self._flusher.is_alive()):
+            return
+
+        self._directory = directory
+        self._stop_flusher.clear()
+
+        def run():
+            while not self._stop_flusher.wait(interval):
+                try:
+                    self.write_snapshot(directory)
+                except Exception as e:
+                    logger.error(f"Erro ao gravar snapshot de métricas: {e}")
+
+        self._flusher = Thread(target=run, name="metrics-flusher", daemon=True)
+        self._flusher.start()
+        logger.info(f"Métricas gravadas em {directory} a cada {interval} segundos")
+
+    def stop_flusher(self):
+        """Interrompe a gravação periódica, gravando um último snapshot
+
+        O snapshot fica no diretório até que a coleta de outro worker, já com
+        este processo encerrado, o incorpore ao agregado retido.
+        """
+        self._stop_flusher.set()
+        if self._flusher:
+            self._flusher.join(timeout=5)
+            self._flusher = None
+        if self._directory:
+            try:
+                self.write_snapshot(self._directory)
+            except Exception as e:
+                logger.error(f"Erro ao gravar snapshot de métricas: {e}")
+            self._directory = None
+
+
+def _read_snapshot(path: str) -> Optional[Dict[str, Dict[str, Any]]]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Snapshot de métricas ilegível {path}: {e}")
+        return None
+
+
+def _write_json(path: str, data: Any):
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(temp_path, path)
+
+
+def _acquire_lock(path: str) -> bool:
+    """Lock entre processos por criação exclusiva de arquivo (também no Windows)"""
+    try:
+        os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+        return True
+    except FileExistsError:
+        try:
+            # Lock deixado por um processo que morreu durante a incorporação
+            if time.time() - os.path.getmtime(path) > RETIRED_LOCK_TIMEOUT:
+                os.remove(path)
+        except OSError:
+            pass
+        return False
+
+
+def without_gauges(snapshot: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    return {name: entry for name, entry in snapshot.items() if entry["type"] != "gauge"}
+
+
+def to_snapshot(merged: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Converte o resultado de merge_snapshots de volta ao formato de snapshot"""
+    data = {}
+    for name, entry in merged.items():
+        data[name] = {
+            "type": entry["type"],
+            "help": entry["help"],
+            "samples": [[dict(key), value] for key, value in entry["samples"].items()],
+        }
+        if entry.get("buckets"):
+            data[name]["buckets"] = entry["buckets"]
+    return data
+
+
+def retire_snapshots(directory: str, stale: List[str]) -> List[Dict[str, Dict[str, Any]]]:
+    """Incorpora ao agregado retido os contadores e histogramas de workers encerrados
+
+    Retorna os snapshots a somar na coleta: o agregado e, se outro worker
+    estiver com o lock, os snapshots encerrados ainda não incorporados (sem
+    gauges). O agregado lista os arquivos já incorporados até que sejam
+    apagados, para que uma falha entre a gravação e a remoção não os some duas vezes.
+    """
+    retired_path = os.path.join(directory, RETIRED_SNAPSHOT)
+    retired = _read_snapshot(retired_path) or {"folded": [], "metrics": {}}
+    if not stale:
+        return [retired["metrics"]]
+
+    lock_path = os.path.join(directory, RETIRED_LOCK)
+    if not _acquire_lock(lock_path):
+        pending = [
+            _read_snapshot(path) for path in stale
+            if os.path.basename(path) not in retired["folded"]
+        ]
+        return [retired["metrics"]] + [without_gauges(s) for s in pending if s is not None]
+
+    try:
+        # Relê sob o lock: outro worker pode ter incorporado algum snapshot
+        retired = _read_snapshot(retired_path) or {"folded": [], "metrics": {}}
+        folded = [name for name in retired["folded"] if os.path.exists(os.path.join(directory, name))]
+        parts = [retired["metrics"]]
+        for path in stale:
+            name = os.path.basename(path)
+            if name in folded:
+                continue
+            snapshot = _read_snapshot(path)
+            if snapshot is not None:
+                parts.append(without_gauges(snapshot))
+                folded.append(name)
+
+        retired = {"folded": folded, "metrics": to_snapshot(merge_snapshots(parts))}
+        _write_json(retired_path, retired)
+        for path in stale:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        return [retired["metrics"]]
+    finally:
+        try:
+            os.remove(lock_path)
+        except OSError:
+            pass
+
+
+def merge_snapshots(snapshots: Iterable[Dict[str, Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+    """Soma os snapshots por métrica e conjunto de labels"""
+    merged: Dict[str, Dict[str, Any]] = {}
+    for snapshot in snapshots:
+        for name, entry in snapshot.items():
+            target = merged.setdefault(
+                name,
+                {
+                    "type": entry["type"],
+                    "help": entry["help"],
+                    "buckets": entry.get("buckets"),
+                    "samples": {},
+                },
+            )
+            for labels, value in entry["samples"]:
+                key = _label_key(labels)
+                if entry["type"] == "histogram":
+                    current = target["samples"].get(key)
+                    if current is None:
+                        target["samples"][key] = {"counts": list(value["counts"]), "sum": value["sum"]}
+                    else:
+                        current["counts"] = [a + b for a, b in zip(current["counts"], value["counts"])]
+                        current["sum"] += value["sum"]
+                else:
+                    target["samples"][key] = target["samples"].get(key, 0.0) + value
+    return merged
+
+
+def add_cache_hit_ratios(merged: Dict[str, Dict[str, Any]]):
+    """Calcula cache_hit_ratio a partir dos acertos e falhas já somados entre workers"""
+    hits = merged.get("cache_hits_total", {}).get("samples", {})
+    misses = merged.get("cache_misses_total", {}).get("samples", {})
+    ratios = {}
+    for key in set(hits) | set(misses):
+        lookups = hits.get(key, 0.0) + misses.get(key, 0.0)
+        ratios[key] = hits.get(key, 0.0) / lookups if lookups else 0.0
+    if ratios:
+        merged["cache_hit_ratio"] = {
+            "type": "gauge",
+            "help": "Proporção de acertos do cache",
+            "buckets": None,
+            "samples": ratios,
+        }
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(key: LabelKey) -> str:
+    if not key:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in key) + "}"
+
+
+def render(merged: Dict[str, Dict[str, Any]]) -> str:
+    lines = []
+    for name in sorted(merged):
+        entry = merged[name]
+        lines.append(f"# HELP {name} {entry['help']}")
+        lines.append(f"# TYPE {name} {entry['type']}")
+        for key, value in sorted(entry["samples"].items()):
+            if entry["type"] == "histogram":
+                cumulative = 0
+                bounds = list(entry["buckets"]) + [float("inf")]
+                for bound, count in zip(bounds, value["counts"]):
+                    cumulative += count
+                    bucket_key = key + (("le", _format_value(bound)),)
+                    lines.append(f"{name}_bucket{_format_labels(bucket_key)} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(key)} {_format_value(value['sum'])}")
+                lines.append(f"{name}_count{_format_labels(key)} {cumulative}")
+            else:
+                lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+def cache_collector(cache_name: str, cache) -> Callable[[], List[CollectedSample]]:
+    """Coletor com acertos, falhas e tamanho de um cache que exponha stats()"""
+
+    def collect() -> List[CollectedSample]:
+        stats = cache.stats()
+        labels = {"cache": cache_name}
+        samples = [
+            ("cache_hits_total", "counter", "Acertos do cache", labels, stats.get("hits", 0)),
+            ("cache_misses_total", "counter", "Falhas do cache", labels, stats.get("misses", 0)),
+        ]
+        if "size" in stats:
+            samples.append(("cache_entries", "gauge", "Entradas no cache", labels, stats["size"]))
+        return samples
+
+    return collect
+
+
+registry = MetricsRegistry()
+
+HTTP_REQUESTS = registry.counter(
+    "http_requests_total", "Requisições HTTP por método, rota e status"
+)
+HTTP_REQUEST_DURATION = registry.histogram(
+    "http_request_duration_seconds", "Latência das requisições HTTP por rota"
+)
+HTTP_IN_PROGRESS = registry.gauge(
+    "http_requests_in_progress", "Requisições HTTP em andamento"
+)
+HTTP_RATE_LIMITED = registry.counter(
+    "http_rate_limited_total", "Requisições rejeitadas pelo rate limit"
+)
+DB_QUERY_DURATION = registry.histogram(
+    "db_query_duration_seconds", "Duração das operações de banco por operação do repositório"
+)
+DB_BUSY_RETRIES = registry.counter(
+    "db_busy_retries_total", "Novas tentativas por banco ocupado"
+)
+CRYPTO_DURATION = registry.histogram(
+    "crypto_operation_duration_seconds", "Duração das operações criptográficas"
+)
+
+
+class MetricsMiddleware:
+    """Middleware ASGI que mede latência, status e requisições em andamento por rota"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = {"code": 500}
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        HTTP_IN_PROGRESS.inc(method=method)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            HTTP_IN_PROGRESS.dec(method=method)
+            # Template da rota (ex.: /players/{name}/{tag}) para limitar a cardinalidade
+            route = getattr(scope.get("route"), "path", None) or "other"
+            HTTP_REQUESTS.inc(method=method, route=route, status=status["code"])
+            HTTP_REQUEST_DURATION.observe(elapsed, method=method, route=route)
+            if status["code"] == 429:
+                HTTP_RATE_LIMITED.inc(route=route)
@@ -1,7 +1,14 @@
+from config.settings import get_settings
 from database.player_repository import PlayerRepository
-from services.crypto_service import CryptoService
-from services.cache_service import CacheService
-from typing import Dict, List, Optional, Any
+from services.crypto_service import CryptoService, STORAGE_KEY
+from services.cache_service import get_rank_cache
+from services.encryption_pipeline import get_encryption_pipeline
+from services.import_service import ImportRow
+from services.utils import chunked
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Any
+import base64
+import hashlib
+import json
 import logging
 import requests
 from bs4 import BeautifulSoup
@@ -12,8 +19,9 @@ logger = logging.getLogger(__name__)
 class PlayerService:
     def __init__(self):
         self.repository = PlayerRepository()
-        self.storage_crypto = CryptoService(key="valorant-players-ranks-v1")
-        self.cache_service = CacheService(cache_duration=300)
+        self.storage_crypto = CryptoService(key=STORAGE_KEY)
+        self.encryption = get_encryption_pipeline()
+        self.cache_service = get_rank_cache()
 
     def get_player_rank(self, name: str, tag: str) -> Dict[str, Any]:
         try:
@@ -29,12 +37,7 @@ class PlayerService:
                 logger.info(f"Rank encontrado no cache: {cached_rank}")
                 return self.build_player_result(player_info, name, tag, cached_rank)
 
-            try:
-                rank = self.fetch_rank_online(name, tag)
-                self.cache_service.set(cache_key, rank)
-            except requests.exceptions.Timeout:
-                logger.error("Timeout na requisição")
-                raise ValueError("Erro ao buscar rank: Timeout na requisição")
+            rank = self.fetch_and_cache_rank(cache_key, name, tag)
 
             result = self.build_player_result(player_info, name, tag, rank)
             logger.info(f"Retornando resultado final: {result}")
@@ -67,14 +70,10 @@ class PlayerService:
         player_info = {"id": -1, "email": "", "login": "", "password": ""}
         
         logger.debug("Buscando jogador no banco de dados")
-        players = self.repository.get_all_players()
-        logger.debug(f"Players encontrados: {len(players) if players else 0}")
+        player = self.repository.find_by_name_tag(name, tag)
 
-        if players:
-            player_info = next(
-                (p for p in players if p["name"] == name and p["tag"] == tag),
-                player_info
-            )
+        if player:
+            player_info = player
             logger.debug(f"Player info encontrado: {player_info}")
             
         return player_info
@@ -83,6 +82,20 @@ class PlayerService:
         logger.debug(f"Verificando cache com chave: {cache_key}")
         return self.cache_service.get(cache_key)
 
+    def fetch_and_cache_rank(self, cache_key: str, name: str, tag: str) -> str:
+        # Outra busca pode ter preenchido o cache desde a primeira consulta
+        cached_rank = self.get_cached_rank(cache_key)
+        if cached_rank:
+            return cached_rank
+
+        try:
+            rank = self.fetch_rank_online(name, tag)
+        except requests.exceptions.Timeout:
+            logger.error("Timeout na requisição")
+            raise ValueError("Erro ao buscar rank: Timeout na requisição")
+        self.cache_service.set(cache_key, rank)
+        return rank
+
     def fetch_rank_online(self, name: str, tag: str) -> str:
         url = f"https://www.valking.gg/player?username={name}%23{tag}"
             
@@ -105,14 +118,8 @@ class PlayerService:
 
     def add_player(self, player_data: Dict[str, Any]) -> Dict[str, Any]:
         try:
-            existing = self.check_player_exists(player_data["email"], player_data["login"])
-            
-            if existing["email_exists"]:
-                raise ValueError("Email já cadastrado")
-            
-            if existing["login_exists"]:
-                raise ValueError("Login já cadastrado")
-
+            # Conflitos de email/login são detectados pelo próprio INSERT
+            # (DuplicatePlayerError), sem consulta prévia
             encrypted_password = self.storage_crypto.encrypt(player_data["password"])
             
             player_with_encrypted = player_data.copy()
@@ -134,10 +141,15 @@ class PlayerService:
             raise
 
     def add_players(self, players_data: List[Dict[str, str]]) -> List[Dict[str, Any]]:
-        processed_players = []
-        for player in players_data:
-            storage_encrypted_password = self.storage_crypto.encrypt(player["password"])
-            processed_players.append({**player, "password": storage_encrypted_password})
+        # Criptografia em paralelo, em blocos; a ordem é preservada e qualquer
+        # falha aborta o lote antes da inserção (tudo ou nada)
+        encrypted_passwords = self.encryption.encrypt_all(
+            [player["password"] for player in players_data]
+        )
+        processed_players = [
+            {**player, "password": password}
+            for player, password in zip(players_data, encrypted_passwords)
+        ]
 
         try:
             player_ids = self.repository.insert_players(processed_players)
@@ -151,6 +163,88 @@ class PlayerService:
             logger.error(f"Erro ao inserir jogadores em lote: {e}")
             raise ValueError(str(e))
 
+    def add_players_partial(self, players_data: List[Dict[str, str]]) -> Dict[str, List[Dict[str, Any]]]:
+        """Insere o lote ignorando as linhas em conflito e reporta o resultado de cada uma
+
+        `index` aponta a posição da linha no lote enviado, para que o cliente
+        reenvie apenas as que falharam.
+        """
+        encrypted_passwords = self.encryption.encrypt_all(
+            [player["password"] for player in players_data]
+        )
+        processed_players = [
+            {**player, "password": password}
+            for player, password in zip(players_data, encrypted_passwords)
+        ]
+
+        try:
+            outcomes = self.repository.insert_players_chunk(processed_players)
+        except Exception as e:
+            logger.error(f"Erro ao inserir jogadores em lote: {e}")
+            raise ValueError(str(e))
+
+        inserted, conflicts = [], []
+        for index, (player, outcome) in enumerate(zip(players_data, outcomes)):
+            if "error" in outcome:
+                conflicts.append(
+                    {
+                        "index": index,
+                        "name": player["name"],
+                        "tag": player["tag"],
+                        "field": outcome["field"],
+                        "error": outcome["error"],
+                    }
+                )
+            else:
+                inserted.append(
+                    {"index": index, "id": outcome["id"], "name": player["name"], "tag": player["tag"]}
+                )
+
+        logger.info(
+            f"Lote parcial concluído: {len(inserted)} inseridos, {len(conflicts)} em conflito"
+        )
+        return {"inserted": inserted, "conflicts": conflicts}
+
+    def import_players(
+        self, rows: Iterable[ImportRow], chunk_size: int = 1000
+    ) -> Iterator[Dict[str, Any]]:
+        """Importa jogadores em blocos, produzindo o resultado de cada linha
+
+        Cada bloco é criptografado e inserido em sua própria transação, então a
+        memória usada não depende do tamanho total da importação.
+        """
+        inserted = failed = 0
+
+        for chunk in chunked(rows, chunk_size):
+            valid = [data for _, data, error in chunk if error is None]
+            try:
+                passwords = self.encryption.encrypt_all([data["password"] for data in valid])
+                prepared = [
+                    {**data, "password": password} for data, password in zip(valid, passwords)
+                ]
+                outcomes = iter(self.repository.insert_players_chunk(prepared))
+            except Exception as e:
+                logger.error(f"Erro ao importar bloco de jogadores: {e}")
+                outcomes = iter([{"error": "Erro ao inserir bloco de jogadores"}] * len(valid))
+
+            for line, data, error in chunk:
+                outcome = next(outcomes) if error is None else {"error": error}
+                if "error" in outcome:
+                    failed += 1
+                    yield {"line": line, "status": "error", "error": outcome["error"]}
+                else:
+                    inserted += 1
+                    yield {
+                        "line": line,
+                        "status": "inserted",
+                        "id": outcome["id"],
+                        "name": data["name"],
+                        "tag": data["tag"],
+                    }
+
+        logger.info(f"Importação concluída: {inserted} inseridos, {failed} com erro")
+        yield {"summary": {"inserted": inserted, "failed": failed}}
+
     def verify_credentials(self, login: str, email: str) -> Optional[Dict[str, str]]:
         encrypted_password = self.repository.get_password_by_credentials(login, email)
 
@@ -161,16 +255,81 @@ class PlayerService:
         logger.warning(f"Falha na verificação de credenciais para o login: {login}")
         return None
 
-    def get_all_players(self) -> List[Dict[str, Any]]:
+    def list_players(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        name_prefix: Optional[str] = None,
+        tag_prefix: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Retorna uma página de jogadores e o cursor da próxima (None na última)"""
+        after = self.decode_cursor(cursor) if cursor else None
+        players = self.repository.list_players(limit + 1, after, name_prefix, tag_prefix)
+
+        next_cursor = None
+        if len(players) > limit:
+            players = players[:limit]
+            next_cursor = self.encode_cursor(
+                self.repository.sort_key(players[-1], name_prefix, tag_prefix)
+            )
+        return players, next_cursor
+
+    def roster_etag(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        name_prefix: Optional[str] = None,
+        tag_prefix: Optional[str] = None,
+    ) -> str:
+        """ETag forte da página pedida, derivado da versão do cadastro e dos parâmetros
+
+        Deve ser calculado antes de ler a página: se uma escrita ocorrer entre as
+        duas leituras, o ETag antigo acompanha dados novos e o cliente apenas
+        busca a página de novo, em vez de manter dados antigos com um ETag novo.
+        """
+        version = self.repository.get_roster_version()
+        fast_json = get_settings().FAST_JSON_RESPONSES
+        key = json.dumps([version, limit, cursor, name_prefix, tag_prefix, fast_json])
+        return f'"{hashlib.sha256(key.encode()).hexdigest()[:32]}"'
+
+    def export_players(self, fmt: str = "ndjson", batch_size: int = 500) -> Iterator[str]:
+        """Gera a exportação completa em pedaços de texto, um por bloco lido do banco
+
+        `fmt` é "ndjson" (um objeto por linha) ou "json" (um único array). As
+        linhas vão direto do cursor para o JSON, sem passar pelos modelos de resposta.
+        """
+        if fmt not in ("ndjson", "json"):
+            raise ValueError(f"Formato de exportação inválido: {fmt}")
+
+        separator = "\n" if fmt == "ndjson" else ","
+        first = True
+        if fmt == "json":
+            yield "["
+        for rows in self.repository.iter_players(batch_size):
+            chunk = separator.join(
+                json.dumps({"id": id, "name": name, "tag": tag}) for id, name, tag in rows
+            )
+            if fmt == "ndjson":
+                yield chunk + "\n"
+            else:
+                yield chunk if first else "," + chunk
+            first = False
+        if fmt == "json":
+            yield "]"
+
+    @staticmethod
+    def encode_cursor(key: List[Any]) -> str:
+        return base64.urlsafe_b64encode(json.dumps(key).encode()).decode().rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> List[Any]:
         try:
-            players = self.repository.get_all_players()
-            return [
-                {"id": p["id"], "name": p["name"], "tag": p["tag"]}
-                for p in players
-            ]
-        except Exception as e:
-            logger.error(f"Erro ao buscar jogadores: {str(e)}")
-            raise
+            key = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        except (ValueError, UnicodeDecodeError):
+            raise ValueError("Cursor inválido")
+        if not isinstance(key, list) or not key or not isinstance(key[-1], int):
+            raise ValueError("Cursor inválido")
+        return key
 
     def delete_player(self, player_id: int) -> Dict[str, str]:
         try:
@@ -0,0 +1,58 @@
+from io import BytesIO
+import base64
+import logging
+import qrcode
+
+logger = logging.getLogger(__name__)
+
+QR_FORMATS = {"png": "image/png", "svg": "image/svg+xml"}
+
+
+def _modules_to_svg(modules, border: int) -> bytes:
+    """Gera um SVG compacto: um retângulo por sequência horizontal de módulos escuros"""
+    size = len(modules) + 2 * border
+    runs = []
+    for y, row in enumerate(modules):
+        x = 0
+        while x < len(row):
+            if not row[x]:
+                x += 1
+                continue
+            start = x
+            while x < len(row) and row[x]:
+                x += 1
+            runs.append(f"M{start + border} {y + border}h{x - start}v1h-{x - start}z")
+
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {size} {size}" '
+        f'shape-rendering="crispEdges"><rect width="100%" height="100%" fill="#fff"/>'
+        f'<path d="{"".join(runs)}"/></svg>'
+    ).encode()
+
+
+def render_qr(data: str, fmt: str = "png") -> bytes:
+    """Renderiza o QR code em PNG (Pillow) ou SVG (gerado direto da matriz, sem Pillow)"""
+    if fmt not in QR_FORMATS:
+        raise ValueError(f"Formato de QR code inválido: {fmt}")
+
+    qr = qrcode.QRCode(version=1, box_size=10, border=5)
+    qr.add_data(data)
+    qr.make(fit=True)
+
+    if fmt == "svg":
+        return _modules_to_svg(qr.modules, qr.border)
+
+    buffered = BytesIO()
+    qr.make_image(fill_color="black", back_color="white").save(buffered, format="PNG")
+    return buffered.getvalue()
+
+
+def qr_data_uri(data: str, fmt: str = "png") -> str:
+    """Retorna o QR code como data URI base64
+
+    Não há cache: cada setup usa um segredo novo, então o resultado nunca se
+    repetiria, e o URI contém o segredo TOTP, que não deve ficar em memória.
+    Operação bloqueante; nas rotas deve rodar fora do event loop.
+    """
+    encoded = base64.b64encode(render_qr(data, fmt)).decode()
+    return f"data:{QR_FORMATS[fmt]};base64,{encoded}"
@@ -0,0 +1,79 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from services.metrics import CollectedSample
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """Agrupa chamadas concorrentes com a mesma chave em uma única execução
+
+    A primeira corrotina a pedir uma chave inicia uma task com `func()`; as que
+    chegam enquanto ela está em andamento aguardam a mesma task (até `timeout`)
+    e recebem o mesmo resultado ou a mesma exceção. Quem aguarda não ocupa
+    threads, e desistir por timeout ou cancelamento não interrompe a execução
+    compartilhada. Nada é guardado depois que a task termina: o resultado deve
+    ser cacheado pela própria função, se for o caso.
+
+    Deve ser usado a partir do event loop; não é thread-safe.
+    """
+
+    def __init__(self):
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._executions = 0
+        self._coalesced = 0
+        self._timeouts = 0
+
+    async def do(
+        self, key: str, func: Callable[[], Awaitable[Any]], timeout: Optional[float] = None
+    ) -> Any:
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._tasks[key] = task
+            self._executions += 1
+            task.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            self._coalesced += 1
+
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), timeout)
+        except asyncio.TimeoutError:
+            self._timeouts += 1
+            logger.warning(f"Tempo esgotado aguardando execução em andamento para {key}")
+            raise TimeoutError(f"Tempo esgotado aguardando execução em andamento para {key}")
+
+    def _finish(self, key: str, task: asyncio.Task):
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        # Marca a exceção como lida mesmo se todos desistiram de aguardar
+        if not task.cancelled():
+            task.exception()
+
+    def in_flight(self) -> int:
+        return len(self._tasks)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "executions": self._executions,
+            "coalesced": self._coalesced,
+            "timeouts": self._timeouts,
+            "in_flight": len(self._tasks),
+        }
+
+
+def single_flight_collector(name: str, flight: SingleFlight) -> Callable[[], List[CollectedSample]]:
+    """Coletor de métricas de um SingleFlight"""
+
+    def collect() -> List[CollectedSample]:
+        stats = flight.stats()
+        labels = {"flight": name}
+        return [
+            ("single_flight_executions_total", "counter", "Execuções efetivas", labels, stats["executions"]),
+            ("single_flight_coalesced_total", "counter", "Chamadas que aguardaram uma execução em andamento", labels, stats["coalesced"]),
+            ("single_flight_timeouts_total", "counter", "Esperas encerradas por timeout", labels, stats["timeouts"]),
+            ("single_flight_in_flight", "gauge", "Execuções em andamento", labels, stats["in_flight"]),
+        ]
+
+    return collect
@@ -0,0 +1,119 @@
+from functools import lru_cache
+from typing import Optional, Tuple
+from starlette.datastructures import Headers, QueryParams
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+import hashlib
+import mimetypes
+import os
+import re
+
+# Referências locais a JS/CSS em atributos src/href, ainda sem query string
+ASSET_REFERENCE = re.compile(r'(?P<attr>\b(?:src|href)=")(?P<path>[^":?#]+\.(?:js|css))"')
+
+
+@lru_cache(maxsize=256)
+def _fingerprint(path: str, mtime_ns: int, size: int) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()[:12]
+
+
+def file_fingerprint(path: str) -> Optional[str]:
+    """Hash curto do conteúdo do arquivo, recalculado só quando ele muda no disco"""
+    try:
+        stat_result = os.stat(path)
+    except OSError:
+        return None
+    return _fingerprint(path, stat_result.st_mtime_ns, stat_result.st_size)
+
+
+@lru_cache(maxsize=16)
+def _render_html(path: str, mtime_ns: int, size: int) -> Tuple[bytes, str]:
+    base_dir = os.path.dirname(path)
+    with open(path, "r", encoding="utf-8") as f:
+        html = f.read()
+
+    def versioned(match):
+        version = file_fingerprint(os.path.join(base_dir, match["path"]))
+        if version is None:
+            return match.group(0)
+        return f'{match["attr"]}{match["path"]}?v={version}"'
+
+    content = ASSET_REFERENCE.sub(versioned, html).encode("utf-8")
+    return content, f'"{hashlib.sha256(content).hexdigest()[:32]}"'
+
+
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles com Cache-Control, variantes .gz pré-comprimidas e URLs versionadas
+
+    - Páginas HTML têm as referências locais a JS/CSS reescritas com ?v=<hash do
+      conteúdo> e são servidas com no-cache (revalidadas pelo ETag).
+    - Um arquivo pedido com ?v= igual ao hash atual é imutável e fica em cache
+      por `max_age`; sem a versão (ou com uma antiga), é revalidado a cada uso.
+    - Se o cliente aceita gzip e existe `<arquivo>.gz` ao lado (gerado pelo
+      minify.py) pelo menos tão novo quanto o original, ele é servido com
+      Content-Encoding: gzip; um .gz desatualizado é ignorado.
+    """
+
+    def __init__(self, *args, max_age: int = 31536000, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.max_age = max_age
+
+    def file_response(self, full_path, stat_result: os.stat_result, scope: Scope, status_code: int = 200) -> Response:
+        full_path = str(full_path)
+        request_headers = Headers(scope=scope)
+
+        if full_path.endswith(".html"):
+            content, etag = _render_html(full_path, stat_result.st_mtime_ns, stat_result.st_size)
+            response = Response(
+                content,
+                status_code=status_code,
+                media_type="text/html",
+                headers={"ETag": etag, "Cache-Control": "no-cache"},
+            )
+        else:
+            headers = {
+                "Cache-Control": self.cache_control(full_path, scope),
+                "Vary": "Accept-Encoding",
+            }
+            compressed = self.precompressed(full_path, stat_result, request_headers)
+            if compressed is not None:
+                gz_path, gz_stat = compressed
+                headers["Content-Encoding"] = "gzip"
+                response = FileResponse(
+                    gz_path,
+                    status_code=status_code,
+                    stat_result=gz_stat,
+                    media_type=mimetypes.guess_type(full_path)[0] or "application/octet-stream",
+                    headers=headers,
+                )
+            else:
+                response = FileResponse(
+                    full_path, status_code=status_code, stat_result=stat_result, headers=headers
+                )
+
+        if status_code == 200 and self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+    def cache_control(self, full_path: str, scope: Scope) -> str:
+        version = QueryParams(scope.get("query_string", b"")).get("v")
+        if version and version == file_fingerprint(full_path):
+            return f"public, max-age={self.max_age}, immutable"
+        return "no-cache"
+
+    def precompressed(
+        self, full_path: str, stat_result: os.stat_result, request_headers: Headers
+    ) -> Optional[Tuple[str, os.stat_result]]:
+        accept_encoding = request_headers.get("accept-encoding", "")
+        if "gzip" not in accept_encoding.lower():
+            return None
+        gz_path = full_path + ".gz"
+        try:
+            gz_stat = os.stat(gz_path)
+        except OSError:
+            return None
+        if gz_stat.st_mtime_ns < stat_result.st_mtime_ns:
+            return None
+        return gz_path, gz_stat
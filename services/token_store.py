@@ -0,0 +1,138 @@
+import heapq
+import logging
+import time
+from threading import Event, Lock, Thread
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class TokenStoreFullError(ValueError):
+    """Registro cheio de entradas ainda válidas; a nova entrada não foi registrada"""
+
+
+class TokenStore:
+    """Registro limitado de tokens indexado pela expiração (epoch)
+
+    Um heap de (expiração, id) permite que a limpeza remova apenas as entradas
+    vencidas, em O(expiradas · log n). Entradas válidas nunca são descartadas
+    para abrir espaço: com `max_entries` entradas vivas, `add` recusa a nova
+    com TokenStoreFullError, e quem chamou decide como reportar a falha.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: Dict[str, float] = {}
+        self._heap: List[Tuple[float, str]] = []
+        self._lock = Lock()
+        self._rejections = 0
+        self._expirations = 0
+        self._sweeps = 0
+        self._last_sweep_duration = 0.0
+        self._sweeper: Optional[Thread] = None
+        self._stop_sweeper = Event()
+
+    def _reap_locked(self, now: float) -> int:
+        removed = 0
+        while self._heap and self._heap[0][0] <= now:
+            expires_at, key = heapq.heappop(self._heap)
+            if self._entries.get(key) == expires_at:
+                del self._entries[key]
+                removed += 1
+        self._expirations += removed
+        return removed
+
+    def _compact_locked(self):
+        # Entradas obsoletas ficam no heap até chegarem ao topo; reconstrói se dominarem
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            self._heap = [(expires_at, key) for key, expires_at in self._entries.items()]
+            heapq.heapify(self._heap)
+
+    def add(self, key: str, expires_at: float, now: Optional[float] = None):
+        """Registra `key` até o instante `expires_at` (epoch)
+
+        Levanta TokenStoreFullError se o registro estiver cheio de entradas válidas.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            self._reap_locked(now)
+            if expires_at <= now:
+                return
+
+            if key not in self._entries and len(self._entries) >= self.max_entries:
+                self._rejections += 1
+                logger.error("Registro de tokens cheio; nova entrada recusada")
+                raise TokenStoreFullError("Registro de tokens cheio")
+
+            self._entries[key] = expires_at
+            heapq.heappush(self._heap, (expires_at, key))
+            self._compact_locked()
+
+    def contains(self, key: str, now: Optional[float] = None) -> bool:
+        now = time.time() if now is None else now
+        expires_at = self._entries.get(key)
+        return expires_at is not None and expires_at > now
+
+    def __contains__(self, key: str) -> bool:
+        return self.contains(key)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            removed = self._entries.pop(key, None) is not None
+            self._compact_locked()
+            return removed
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._heap.clear()
+
+    def sweep(self) -> int:
+        """Remove os tokens expirados; executado periodicamente pela thread de limpeza"""
+        start = time.perf_counter()
+        with self._lock:
+            removed = self._reap_locked(time.time())
+            self._sweeps += 1
+            self._last_sweep_duration = time.perf_counter() - start
+        if removed:
+            logger.debug(f"{removed} tokens expirados removidos do registro")
+        return removed
+
+    def start_sweeper(self, interval: float):
+        """Inicia a thread que remove os tokens expirados periodicamente"""
+        if interval <= 0 or (self._sweeper and self._sweeper.is_alive()):
+            return
+
+        self._stop_sweeper.clear()
+
+        def run():
+            while not self._stop_sweeper.wait(interval):
+                try:
+                    self.sweep()
+                except Exception as e:
+                    logger.error(f"Erro na limpeza do registro de tokens: {e}")
+
+        self._sweeper = Thread(target=run, name="token-sweeper", daemon=True)
+        self._sweeper.start()
+        logger.info(f"Limpeza periódica de tokens iniciada a cada {interval} segundos")
+
+    def stop_sweeper(self):
+        """Interrompe a thread de limpeza periódica"""
+        self._stop_sweeper.set()
+        if self._sweeper:
+            self._sweeper.join(timeout=5)
+            self._sweeper = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "live": len(self._entries),
+                "max_entries": self.max_entries,
+                "rejections": self._rejections,
+                "expirations": self._expirations,
+                "sweeps": self._sweeps,
+                "last_sweep_duration": self._last_sweep_duration,
+            }
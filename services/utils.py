@@ -1,9 +1,13 @@
 import os
 import sys
 import logging
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, TypeVar
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 
 def get_resource_path(relative_path):
     """Obtém o caminho absoluto para um recurso, seja em desenvolvimento ou no executável"""
@@ -27,3 +31,23 @@ def get_static_directory():
     os.makedirs(os.path.join(base_dir, "js"), exist_ok=True)
 
     return base_dir
+
+
+def chunked(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    """Agrupa um iterável em listas de até `size` itens, sem materializá-lo"""
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Avalia If-None-Match contra `etag` (comparação fraca, como exige a RFC 9110)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag.removeprefix("W/") for tag in candidates)
@@ -183,20 +183,30 @@ class Api {
 
     static async getAllPlayers() {
         try {
-            const response = await fetch('http://localhost:8000/players/', {
-                headers: {
-                    'Authorization': `Bearer ${Auth.token}`,
-                    'Accept': 'application/json'
+            const players = [];
+            let cursor = null;
+            do {
+                const params = new URLSearchParams({ limit: 1000 });
+                if (cursor) params.set('cursor', cursor);
+
+                const response = await fetch(`http://localhost:8000/players/?${params}`, {
+                    headers: {
+                        'Authorization': `Bearer ${Auth.token}`,
+                        'Accept': 'application/json'
+                    }
+                });
+
+                if (!response.ok) {
+                    const error = await response.json();
+                    throw new Error(error.detail || 'Erro ao buscar jogadores');
                 }
-            });
 
-            if (!response.ok) {
-                const error = await response.json();
-                throw new Error(error.detail || 'Erro ao buscar jogadores');
-            }
+                const data = await response.json();
+                if (Array.isArray(data)) players.push(...data);
+                cursor = response.headers.get('X-Next-Cursor');
+            } while (cursor);
 
-            const data = await response.json();
-            return Array.isArray(data) ? data : [];
+            return players;
         } catch (error) {
             console.error('Erro na requisição:', error);
             throw new Error(error.message || 'Erro ao buscar jogadores');
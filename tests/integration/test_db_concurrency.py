@@ -0,0 +1,120 @@
+"""
+Teste de estresse do SQLite com escritores e leitores concorrentes em processos distintos
+
+Simula vários workers do uvicorn gravando e lendo o mesmo arquivo com o
+perfil WAL e a política de retry com backoff do BaseRepository.
+"""
+
+import multiprocessing
+import os
+import sqlite3
+import time
+
+WRITERS = 4
+READERS = 2
+PLAYERS_PER_WRITER = 40
+BATCH_SIZE = 10
+
+
+def _configure_worker(db_path):
+    # Configuração lida por get_settings() no processo filho
+    os.environ["ENVIRONMENT"] = "production"
+    os.environ["TESTING"] = "false"
+    os.environ["DB_FILE_PATH"] = db_path
+    os.environ["DB_BUSY_TIMEOUT_MS"] = "50"
+    os.environ["DB_BUSY_RETRIES"] = "20"
+    os.environ["DB_BUSY_RETRY_BASE_DELAY"] = "0.01"
+
+
+def _init_database(db_path):
+    _configure_worker(db_path)
+    from database.db_manager import DatabaseManager
+
+    DatabaseManager().close_all()
+
+
+def _writer(db_path, writer_id, errors):
+    _configure_worker(db_path)
+    from database.player_repository import PlayerRepository
+
+    repository = PlayerRepository()
+    try:
+        half = PLAYERS_PER_WRITER // 2
+        for i in range(half):
+            repository.insert_player(
+                {
+                    "name": f"W{writer_id}P{i}",
+                    "tag": "BR1",
+                    "email": f"w{writer_id}p{i}@example.com",
+                    "login": f"w{writer_id}p{i}",
+                },
+                encrypted_password="encrypted",
+            )
+        for start in range(half, PLAYERS_PER_WRITER, BATCH_SIZE):
+            repository.insert_players(
+                [
+                    {
+                        "name": f"W{writer_id}P{i}",
+                        "tag": "BR1",
+                        "email": f"w{writer_id}p{i}@example.com",
+                        "login": f"w{writer_id}p{i}",
+                        "password": "encrypted",
+                    }
+                    for i in range(start, start + BATCH_SIZE)
+                ]
+            )
+    except Exception as e:
+        errors.put(f"writer {writer_id}: {e}")
+
+
+def _reader(db_path, stop, errors, reads):
+    _configure_worker(db_path)
+    from database.player_repository import PlayerRepository
+
+    repository = PlayerRepository()
+    count = 0
+    try:
+        while not stop.is_set():
+            repository.list_players(100)
+            repository.check_player_exists("w0p0@example.com", "w0p0")
+            count += 1
+    except Exception as e:
+        errors.put(f"reader: {e}")
+    reads.put(count)
+
+
+def test_concurrent_writers_and_readers_across_processes(tmp_path):
+    db_path = str(tmp_path / "stress.db")
+    ctx = multiprocessing.get_context("spawn")
+    errors = ctx.Queue()
+    reads = ctx.Queue()
+    stop = ctx.Event()
+
+    init = ctx.Process(target=_init_database, args=(db_path,))
+    init.start()
+    init.join(60)
+    assert init.exitcode == 0
+
+    readers = [ctx.Process(target=_reader, args=(db_path, stop, errors, reads)) for _ in range(READERS)]
+    writers = [ctx.Process(target=_writer, args=(db_path, i, errors)) for i in range(WRITERS)]
+    for process in readers + writers:
+        process.start()
+
+    for process in writers:
+        process.join(120)
+    time.sleep(0.2)
+    stop.set()
+    for process in readers:
+        process.join(60)
+
+    failures = []
+    while not errors.empty():
+        failures.append(errors.get())
+    assert failures == []
+    assert all(p.exitcode == 0 for p in readers + writers)
+    assert sum(reads.get() for _ in readers) > 0
+
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        total = conn.execute("SELECT COUNT(*) FROM players").fetchone()[0]
+    assert total == WRITERS * PLAYERS_PER_WRITER
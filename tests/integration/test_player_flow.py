@@ -1,11 +1,19 @@
 from fastapi.testclient import TestClient
 from app import app
+from routers import players as players_router
 from services.auth_service import auth_service
 from database.db_manager import DatabaseManager
+from database.player_repository import PlayerRepository
+from services.import_service import iter_import_rows
+from services.container import container
+from services.player_service import PlayerService
 from unittest.mock import patch
+import asyncio
+import httpx
 import pytest
+import threading
 import time
-import os
+import json
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 from config.settings import get_settings
@@ -17,10 +25,13 @@ def setup_database():
     """Configura um banco de dados de teste limpo antes de cada teste"""
     # Limpar banco de teste se existir
     settings = get_settings()
-    
-    if os.path.exists(settings.DB_FILE_PATH):
-        os.remove(settings.DB_FILE_PATH)
+
+    # Fecha o pool e remove o arquivo junto com os arquivos do WAL
+    DatabaseManager().drop_database()
         
+    # Serviços compartilhados são reconstruídos a cada teste
+    container.reset()
+
     # Configura banco de teste
     DatabaseManager().DB_FILE_PATH = settings.DB_FILE_PATH
     DatabaseManager().init_db()
@@ -159,4 +170,318 @@ def test_invalid_authentication_integration():
     # Tenta acessar endpoint protegido sem token
     response = client.get("/players/")
     assert response.status_code == 401
-    assert response.json()["detail"] == "Token não fornecido"
\ No newline at end of file
+    assert response.json()["detail"] == "Token não fornecido"
+
+
+def test_services_shared_between_requests(auth_token, test_player):
+    """Garante que o PlayerService é construído uma única vez por worker"""
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    container.reset()
+
+    with patch.object(
+        PlayerService, "__init__", autospec=True, side_effect=PlayerService.__init__
+    ) as init:
+        for _ in range(3):
+            assert client.get("/players/", headers=headers).status_code == 200
+        assert init.call_count == 1
+
+        service = container.get("player_service")
+        container.reset()
+        assert container.get("player_service") is not service
+        assert init.call_count == 2
+
+
+def test_import_players_ndjson(auth_token, test_player):
+    """Importação NDJSON reporta o resultado de cada linha"""
+    headers = {
+        "Authorization": f"Bearer {auth_token}",
+        "Content-Type": "application/x-ndjson",
+    }
+    lines = [
+        json.dumps({"name": "Imp1", "tag": "BR1", "email": "imp1@example.com", "login": "imp1", "password": "p1"}),
+        "",
+        "{invalid json",
+        json.dumps({"name": "Imp2", "tag": "BR1", "email": "imp2@example.com", "login": "imp2"}),
+        json.dumps({**test_player, "login": "another"}),
+        json.dumps({"name": "Imp3", "tag": "BR1", "email": "imp3@example.com", "login": "IMP1", "password": "p3"}),
+        json.dumps({"name": "Imp4", "tag": "BR1", "email": "imp4@example.com", "login": "imp4", "password": "p4"}),
+    ]
+
+    response = client.post("/players/import", content="\n".join(lines), headers=headers)
+    assert response.status_code == 200
+    results = [json.loads(line) for line in response.text.splitlines()]
+
+    assert [r.get("status") for r in results[:-1]] == ["inserted", "error", "error", "error", "error", "inserted"]
+    assert [r["line"] for r in results[:-1]] == [1, 3, 4, 5, 6, 7]
+    assert "password" in results[2]["error"]
+    assert results[3]["error"] == "Email já cadastrado"
+    assert results[4]["error"] == "Login já cadastrado"
+    assert results[-1] == {"summary": {"inserted": 2, "failed": 4}}
+
+    response = client.post(
+        "/players/verify-credentials",
+        json={"login": "imp4", "email": "imp4@example.com"},
+        headers={"Authorization": f"Bearer {auth_token}"},
+    )
+    assert response.json()["password"] == "p4"
+
+
+def test_import_players_csv(auth_token):
+    """Importação CSV com cabeçalho"""
+    headers = {"Authorization": f"Bearer {auth_token}", "Content-Type": "text/csv"}
+    body = "name,tag,email,login,password\n" + "".join(
+        f"Csv{i},BR1,csv{i}@example.com,csv{i},pass{i}\n" for i in range(25)
+    )
+
+    response = client.post("/players/import", content=body, headers=headers)
+    assert response.status_code == 200
+    results = [json.loads(line) for line in response.text.splitlines()]
+
+    assert results[-1] == {"summary": {"inserted": 25, "failed": 0}}
+    ids = [r["id"] for r in results[:-1]]
+    assert len(set(ids)) == 25
+
+    response = client.get("/players/", headers={"Authorization": f"Bearer {auth_token}"})
+    assert {p["id"] for p in response.json()} >= set(ids)
+
+
+def test_import_reports_empty_password_only_on_its_row():
+    """Uma senha vazia vira erro da própria linha, sem derrubar o bloco"""
+    lines = [
+        json.dumps({"name": f"Blk{i}", "tag": "BR1", "email": f"blk{i}@example.com", "login": f"blk{i}",
+                    "password": "" if i == 2 else f"p{i}"})
+        for i in range(5)
+    ]
+    rows = iter_import_rows(lines, "application/x-ndjson")
+    results = list(container.get("player_service").import_players(rows, chunk_size=5))
+
+    assert [r["status"] for r in results[:-1]] == ["inserted", "inserted", "error", "inserted", "inserted"]
+    assert "password" in results[2]["error"]
+    assert results[-1] == {"summary": {"inserted": 4, "failed": 1}}
+
+
+def test_add_players_partial_reports_conflicts(auth_token, test_player):
+    """Lote parcial insere as linhas válidas e aponta as conflitantes"""
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    players = [
+        {"name": "Part1", "tag": "BR1", "email": "part1@example.com", "login": "part1", "password": "p1"},
+        {**test_player, "login": "otherlogin"},
+        {"name": "Part2", "tag": "BR1", "email": "part2@example.com", "login": "PART1", "password": "p2"},
+        {"name": "Part3", "tag": "BR1", "email": "part3@example.com", "login": "part3", "password": "p3"},
+    ]
+
+    response = client.post("/players/batch?partial=true", json=players, headers=headers)
+    assert response.status_code == 200
+    result = response.json()
+
+    assert [p["index"] for p in result["inserted"]] == [0, 3]
+    assert [(c["index"], c["field"]) for c in result["conflicts"]] == [(1, "email"), (2, "login")]
+
+    # Reenvio apenas das linhas corrigidas
+    retry = [{**players[2], "login": "part2"}]
+    response = client.post("/players/batch?partial=true", json=retry, headers=headers)
+    assert response.json()["conflicts"] == []
+
+    response = client.get("/players/", headers=headers)
+    names = {p["name"] for p in response.json()}
+    assert {"Part1", "Part2", "Part3"} <= names
+
+
+def test_add_players_batch_is_all_or_nothing_by_default(auth_token, test_player):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    players = [
+        {"name": "Atomic1", "tag": "BR1", "email": "atomic1@example.com", "login": "atomic1", "password": "p1"},
+        {**test_player, "login": "otherlogin"},
+    ]
+
+    response = client.post("/players/batch", json=players, headers=headers)
+    assert response.status_code == 400
+
+    response = client.get("/players/", headers=headers)
+    assert "Atomic1" not in {p["name"] for p in response.json()}
+
+
+def test_logout_revokes_token(auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+
+    assert client.get("/players/", headers=headers).status_code == 200
+    assert client.post("/logout", headers=headers).status_code == 200
+    assert client.get("/players/", headers=headers).status_code == 401
+
+
+def test_logout_fails_when_revocation_list_is_full(auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+
+    with patch.object(auth_service.revoked, "max_entries", len(auth_service.revoked)):
+        assert client.post("/logout", headers=headers).status_code == 503
+    assert client.get("/players/", headers=headers).status_code == 200
+
+
+def test_metrics_endpoint_reports_requests(auth_token, test_player):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    client.get(f"/players/{test_player['name']}/{test_player['tag']}", headers=headers)
+    client.get("/players/", headers={"Authorization": "Bearer invalid"})
+
+    # Desativado sem METRICS_TOKEN; o token de sessão do admin não serve
+    assert client.get("/metrics", headers=headers).status_code == 404
+    with patch.object(get_settings(), "METRICS_TOKEN", "scrape-token"):
+        assert client.get("/metrics").status_code == 401
+        assert client.get("/metrics", headers=headers).status_code == 401
+        response = client.get("/metrics", headers={"Authorization": "Bearer scrape-token"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    text = response.text
+
+    assert 'http_requests_total{method="GET",route="/players/{name}/{tag}",status="200"}' in text
+    assert 'http_requests_total{method="GET",route="/players/",status="401"}' in text
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/players/{name}/{tag}",le="+Inf"}' in text
+    assert 'db_query_duration_seconds_count{operation="find_by_name_tag"}' not in text
+    assert 'db_query_duration_seconds_count{operation="fetch_one"}' in text
+    assert 'crypto_operation_duration_seconds_count{operation="encrypt"}' in text
+    assert 'cache_hits_total{cache="rank"}' in text
+
+
+def test_list_players_is_paginated_by_cursor(auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    players = [
+        {"name": f"Page{i}", "tag": "BR1" if i % 2 else "NA1", "email": f"page{i}@example.com", "login": f"page{i}", "password": "p"}
+        for i in range(5)
+    ]
+    assert client.post("/players/batch", json=players, headers=headers).status_code == 200
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/players/", params=params, headers=headers)
+        assert response.status_code == 200
+        assert len(response.json()) <= 2
+        seen += [p["name"] for p in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert seen == [p["name"] for p in players]
+
+    response = client.get("/players/", params={"tag": "BR"}, headers=headers)
+    assert [p["name"] for p in response.json()] == ["Page1", "Page3"]
+    assert "X-Next-Cursor" not in response.headers
+
+    response = client.get("/players/", params={"cursor": "!!invalid"}, headers=headers)
+    assert response.status_code == 400
+
+
+def test_export_players_streams_roster(auth_token, test_player):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    players = [
+        {"name": f"Exp{i}", "tag": "BR1", "email": f"exp{i}@example.com", "login": f"exp{i}", "password": "p"}
+        for i in range(3)
+    ]
+    client.post("/players/batch", json=players, headers=headers)
+
+    with patch.object(get_settings(), "EXPORT_BATCH_SIZE", 2):
+        response = client.get("/players/export", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [r["name"] for r in rows] == [test_player["name"], "Exp0", "Exp1", "Exp2"]
+    assert set(rows[0]) == {"id", "name", "tag"}
+
+    response = client.get("/players/export", params={"format": "json"}, headers=headers)
+    assert response.json() == rows
+    assert DatabaseManager().pool_stats()["in_use"] == 0
+
+    assert client.get("/players/export", params={"format": "xml"}, headers=headers).status_code == 422
+    assert client.get("/players/export").status_code == 401
+
+
+def test_export_releases_connection_when_abandoned(test_player):
+    batches = PlayerRepository().iter_players(batch_size=1)
+    next(batches)
+    assert DatabaseManager().pool_stats()["in_use"] == 1
+    batches.close()
+    assert DatabaseManager().pool_stats()["in_use"] == 0
+
+
+def test_fast_json_responses_skip_validation_but_keep_headers(auth_token):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    players = [
+        {"name": f"Fast{i}", "tag": "BR1", "email": f"fast{i}@example.com", "login": f"fast{i}", "password": "p"}
+        for i in range(3)
+    ]
+    container.get("player_service").add_players(players)
+    validated = client.get("/players/", params={"limit": 2}, headers=headers)
+
+    with patch.object(get_settings(), "FAST_JSON_RESPONSES", True), \
+            patch("services.admin_service.AdminService.verify_admin", return_value=True), \
+            patch("services.google_auth_service.GoogleAuthService.get_user_secret", return_value=None):
+        fast = client.get("/players/", params={"limit": 2}, headers=headers)
+        login = client.post("/login", json={"username": "admin", "password": "admin"})
+
+    assert fast.status_code == 200
+    assert fast.json() == [{k: p[k] for k in ("id", "name", "tag")} for p in validated.json()]
+    assert fast.headers["X-Next-Cursor"] == validated.headers["X-Next-Cursor"]
+    assert login.status_code == 200 and set(login.json()) == {"token", "expiry_time"}
+
+
+def test_list_players_conditional_get(auth_token, test_player):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    response = client.get("/players/", headers=headers)
+    etag = response.headers["ETag"]
+    assert response.headers["Cache-Control"] == "private, no-cache"
+
+    with patch("database.player_repository.PlayerRepository.list_players") as list_players:
+        response = client.get("/players/", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    list_players.assert_not_called()
+
+    other_page = client.get("/players/", params={"limit": 1}, headers=headers)
+    assert other_page.headers["ETag"] != etag
+
+    player_id = container.get("player_service").add_players(
+        [{"name": "Cond", "tag": "BR1", "email": "cond@example.com", "login": "cond", "password": "p"}]
+    )[0]["id"]
+    response = client.get("/players/", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert "Cond" in {p["name"] for p in response.json()}
+
+    etag = response.headers["ETag"]
+    container.get("player_service").delete_player(player_id)
+    assert client.get("/players/", headers={**headers, "If-None-Match": etag}).status_code == 200
+
+
+def test_concurrent_rank_requests_share_one_fetch(auth_token):
+    """Centenas de requisições pelo mesmo jogador: uma busca, sem esgotar o executor do banco"""
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    release = threading.Event()
+    calls = []
+
+    def slow_fetch(self, name, tag):
+        calls.append((name, tag))
+        release.wait(10)
+        return {"message": "rank", "url": "https://example.com"}
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            ranks = [
+                asyncio.ensure_future(http.get("/players/Herd/BR1", headers=headers))
+                for _ in range(300)
+            ]
+            while not calls:
+                await asyncio.sleep(0.01)
+
+            # Com a busca bloqueada, o executor do banco continua atendendo
+            listing = await asyncio.wait_for(http.get("/players/", headers=headers), timeout=5)
+            release.set()
+            return listing, await asyncio.gather(*ranks)
+
+    with patch.object(players_router.limiter, "enabled", False), \
+            patch.object(app.state.limiter, "enabled", False), \
+            patch("services.player_service.PlayerService.fetch_rank_online", slow_fetch):
+        listing, responses = asyncio.run(scenario())
+
+    assert listing.status_code == 200
+    assert [r.status_code for r in responses] == [200] * 300
+    assert calls == [("Herd", "BR1")]
+    assert all(r.json()["rank"]["url"] == "https://example.com" for r in responses)
+    assert players_router.rank_flight.in_flight() == 0
@@ -0,0 +1,225 @@
+"""
+Verifica com EXPLAIN QUERY PLAN que as consultas do PlayerRepository usam índices
+
+As consultas são capturadas durante a execução real dos métodos do repositório
+(trace callback do sqlite3), garantindo que o plano verificado é o do SQL em uso.
+"""
+
+import pytest
+from database.db_manager import DatabaseManager, MIGRATIONS
+from database.player_repository import PlayerRepository, DuplicatePlayerError
+
+
+@pytest.fixture
+def repository():
+    db = DatabaseManager()
+    db.drop_database()
+    db.init_db()
+    repository = PlayerRepository()
+    repository.insert_players(
+        [
+            {
+                "name": f"Player{i}",
+                "tag": "BR1",
+                "email": f"player{i}@example.com",
+                "login": f"Login{i}",
+                "password": "encrypted",
+            }
+            for i in range(50)
+        ]
+    )
+    yield repository
+    db.drop_database()
+    db.init_db()
+
+
+def capture_queries(call, kinds=("SELECT",)):
+    """Executa `call` registrando os comandos enviados ao SQLite"""
+    captured = []
+    with DatabaseManager().get_connection() as conn:
+        conn.set_trace_callback(captured.append)
+        try:
+            call()
+        finally:
+            conn.set_trace_callback(None)
+    return [q for q in captured if q.lstrip().upper().startswith(kinds)]
+
+
+def query_plan(sql):
+    with DatabaseManager().get_connection() as conn:
+        rows = conn.execute(f"EXPLAIN QUERY PLAN {sql}").fetchall()
+    return " | ".join(row["detail"] for row in rows)
+
+
+def assert_uses_index(call, index_name):
+    queries = capture_queries(call)
+    assert queries, "Nenhuma consulta capturada"
+    for sql in queries:
+        plan = query_plan(sql)
+        assert index_name in plan, f"{sql!r} não usa {index_name}: {plan}"
+        assert "SCAN players" not in plan, f"{sql!r} faz varredura completa: {plan}"
+
+
+def test_schema_version_is_current():
+    with DatabaseManager().get_connection() as conn:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == len(MIGRATIONS)
+
+
+def test_check_email_exists_uses_lower_email_index(repository):
+    assert_uses_index(
+        lambda: repository.check_player_exists(email="PLAYER1@example.com"),
+        "idx_players_email_lower",
+    )
+
+
+def test_check_login_exists_uses_lower_login_index(repository):
+    assert_uses_index(
+        lambda: repository.check_player_exists(login="login1"),
+        "idx_players_login_lower",
+    )
+
+
+def test_credentials_lookup_uses_index(repository):
+    queries = capture_queries(
+        lambda: repository.get_password_by_credentials("login1", "player1@example.com")
+    )
+    plan = query_plan(queries[0])
+    assert "idx_players_" in plan and "SCAN players" not in plan, plan
+
+
+def test_name_tag_lookup_uses_composite_index(repository):
+    assert_uses_index(
+        lambda: repository.find_by_name_tag("Player1", "BR1"),
+        "idx_players_name_tag",
+    )
+
+
+def test_case_insensitive_lookups_still_match(repository):
+    result = repository.check_player_exists(email="PLAYER1@EXAMPLE.COM", login="LOGIN1")
+    assert result == {"email_exists": True, "login_exists": True}
+    assert repository.get_password_by_credentials("LOGIN1", "Player1@Example.com") == "encrypted"
+
+
+def test_migration_backfills_legacy_database():
+    db = DatabaseManager()
+    db.drop_database()
+    with db.get_connection() as conn:
+        # Banco criado antes das migrações: índices nas colunas cruas, email com maiúsculas
+        conn.execute(
+            """
+            CREATE TABLE players (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                tag TEXT NOT NULL,
+                email TEXT NOT NULL UNIQUE,
+                login TEXT NOT NULL UNIQUE,
+                password TEXT NOT NULL
+            )
+        """
+        )
+        conn.execute("CREATE INDEX idx_email ON players(email)")
+        conn.execute(
+            "INSERT INTO players (name, tag, email, login, password) "
+            "VALUES ('Old', 'BR1', 'Old@Example.com', 'OldLogin', 'x')"
+        )
+        conn.commit()
+
+    try:
+        db.init_db()
+        repository = PlayerRepository()
+        assert repository.check_player_exists(email="old@example.com")["email_exists"]
+        with db.get_connection() as conn:
+            indexes = {row["name"] for row in conn.execute("PRAGMA index_list(players)")}
+            email = conn.execute("SELECT email FROM players").fetchone()[0]
+        assert "idx_players_email_lower" in indexes
+        assert "idx_email" not in indexes
+        assert email == "old@example.com"
+    finally:
+        db.drop_database()
+        db.init_db()
+
+
+def test_existence_check_is_a_single_query(repository):
+    queries = capture_queries(
+        lambda: repository.check_player_exists(email="player1@example.com", login="Login2")
+    )
+    assert len(queries) == 1
+    plan = query_plan(queries[0])
+    assert "idx_players_email_lower" in plan and "idx_players_login_lower" in plan, plan
+
+
+def test_insert_reports_conflicts_without_prior_lookup(repository):
+    player = {"name": "New", "tag": "BR1", "email": "new@example.com", "login": "NewLogin"}
+
+    queries = capture_queries(
+        lambda: repository.insert_player(player, encrypted_password="x"),
+        kinds=("SELECT", "INSERT"),
+    )
+    assert len(queries) == 1
+    assert "idx_players_login_lower" in query_plan(queries[0])
+
+    with pytest.raises(DuplicatePlayerError) as login_conflict:
+        repository.insert_player({**player, "email": "other@example.com", "login": "NEWLOGIN"}, "x")
+    assert login_conflict.value.field == "login"
+
+    with pytest.raises(DuplicatePlayerError) as email_conflict:
+        repository.insert_player({**player, "email": "NEW@example.com", "login": "other"}, "x")
+    assert email_conflict.value.field == "email"
+
+
+def walk_pages(repository, page_size, **filters):
+    """Percorre a listagem paginada usando a chave da última linha como cursor"""
+    players, after = [], None
+    while True:
+        page = repository.list_players(page_size, after, **filters)
+        players += page
+        if len(page) < page_size:
+            return players
+        after = repository.sort_key(page[-1], **filters)
+
+
+def test_list_players_pages_cover_all_rows_in_index_order(repository):
+    repository.insert_players(
+        [
+            {"name": name, "tag": tag, "email": f"dup{i}@example.com", "login": f"Dup{i}", "password": "x"}
+            for i, (name, tag) in enumerate([("Player1", "BR1"), ("Player1", "NA1"), ("Ace", "BR2")] * 4)
+        ]
+    )
+    with DatabaseManager().get_connection() as conn:
+        rows = [dict(row) for row in conn.execute("SELECT id, name, tag FROM players")]
+
+    assert walk_pages(repository, 7) == sorted(rows, key=lambda p: p["id"])
+    assert walk_pages(repository, 3, name_prefix="Player1") == sorted(
+        [p for p in rows if p["name"].startswith("Player1")],
+        key=lambda p: (p["name"], p["tag"], p["id"]),
+    )
+    assert walk_pages(repository, 2, tag_prefix="BR") == sorted(
+        [p for p in rows if p["tag"].startswith("BR")], key=lambda p: (p["tag"], p["id"])
+    )
+    assert walk_pages(repository, 5, name_prefix="Player", tag_prefix="NA") == sorted(
+        [p for p in rows if p["name"].startswith("Player") and p["tag"].startswith("NA")],
+        key=lambda p: (p["name"], p["tag"], p["id"]),
+    )
+    assert set(walk_pages(repository, 5)[0]) == {"id", "name", "tag"}
+
+
+@pytest.mark.parametrize(
+    "filters, after, index_name",
+    [
+        ({}, [10], "PRIMARY KEY"),
+        ({"name_prefix": "Player"}, ["Player1", "BR1", 2], "idx_players_name_tag"),
+        ({"tag_prefix": "BR"}, ["BR1", 10], "idx_players_tag"),
+    ],
+)
+def test_list_players_cursor_queries_seek_index(repository, filters, after, index_name):
+    queries = capture_queries(lambda: repository.list_players(100, after, **filters))
+    assert queries
+    for sql in queries:
+        plan = query_plan(sql)
+        assert index_name in plan, f"{sql!r} não usa {index_name}: {plan}"
+        assert "SCAN players" not in plan and "TEMP B-TREE" not in plan, plan
+
+
+def test_list_players_rejects_cursor_from_other_filter(repository):
+    with pytest.raises(ValueError):
+        repository.list_players(10, ["Player1", "BR1", 2])
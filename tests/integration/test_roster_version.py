@@ -0,0 +1,94 @@
+"""
+Versão do cadastro (roster_meta) usada nos ETags da listagem de jogadores
+
+Cada escrita efetiva em players incrementa a versão na mesma transação;
+escritas que não alteram nada (conflitos, exclusão inexistente) não a alteram.
+"""
+
+import pytest
+from unittest.mock import patch
+from database.db_manager import DatabaseManager
+from database.player_repository import PlayerRepository, DuplicatePlayerError
+
+
+def player(i, **overrides):
+    return {
+        "name": f"Player{i}",
+        "tag": "BR1",
+        "email": f"player{i}@example.com",
+        "login": f"Login{i}",
+        "password": "encrypted",
+        **overrides,
+    }
+
+
+@pytest.fixture
+def repository():
+    db = DatabaseManager()
+    db.drop_database()
+    db.init_db()
+    yield PlayerRepository()
+    db.drop_database()
+    db.init_db()
+
+
+def test_writes_bump_roster_version(repository):
+    versions = [repository.get_roster_version()]
+
+    player_id = repository.insert_player(player(1), encrypted_password="x")
+    versions.append(repository.get_roster_version())
+
+    repository.insert_players([player(2), player(3)])
+    versions.append(repository.get_roster_version())
+
+    repository.insert_players_chunk([player(4), player(5)])
+    versions.append(repository.get_roster_version())
+
+    assert repository.delete_player(player_id)
+    versions.append(repository.get_roster_version())
+
+    assert len(set(versions)) == len(versions)
+    assert versions[-1].endswith("-4")
+
+
+def test_failed_writes_keep_roster_version(repository):
+    repository.insert_player(player(1), encrypted_password="x")
+    version = repository.get_roster_version()
+
+    with pytest.raises(DuplicatePlayerError):
+        repository.insert_player(player(2, login="LOGIN1"), encrypted_password="x")
+    with pytest.raises(ValueError):
+        repository.insert_players([player(3), player(1)])
+    results = repository.insert_players_chunk([player(1, email="other@example.com")])
+    assert results[0]["field"] == "login"
+    assert not repository.delete_player(999)
+
+    assert repository.get_roster_version() == version
+
+
+@pytest.mark.parametrize("rows", [[player(1), player(2)], [player(1), player(2, login="LOGIN1")]])
+def test_failed_version_bump_commits_no_rows(repository, rows):
+    version = repository.get_roster_version()
+
+    with patch(
+        "database.player_repository.BUMP_ROSTER_VERSION",
+        "UPDATE missing_table SET value = value + 1",
+    ):
+        with pytest.raises(Exception):
+            repository.insert_players_chunk(rows)
+
+    assert repository.fetch_one("SELECT COUNT(*) FROM players")[0] == 0
+    assert repository.get_roster_version() == version
+
+    results = repository.insert_players_chunk(rows)
+    assert "id" in results[0]
+
+
+def test_recreated_database_gets_new_epoch(repository):
+    epoch = repository.get_roster_version().split("-")[0]
+
+    db = DatabaseManager()
+    db.drop_database()
+    db.init_db()
+
+    assert PlayerRepository().get_roster_version() != f"{epoch}-0"
@@ -0,0 +1,143 @@
+"""
+Testes Unitários para o AuthService (tokens assinados com HMAC)
+
+Cobertura atual:
+- Token gerado é aceito ✓
+- Token aceito por outra instância com o mesmo segredo (outro worker) ✓
+- Assinatura adulterada ou segredo diferente ✓
+- Formatos inválidos ✓
+- Assinatura com caracteres não ASCII ✓
+- Sem TOKEN_SECRET: segredo aleatório por processo, nunca derivado do código ✓
+- Sem TOKEN_SECRET e com vários workers: inicialização recusada ✓
+- Expiração embutida no token ✓
+- Revogação e limpeza da lista de revogados ✓
+- Lista de revogados cheia recusa a revogação sem liberar outros tokens ✓
+- Memo de tokens verificados (sem reverificar a assinatura) ✓
+"""
+
+from unittest import TestCase
+from unittest.mock import patch
+from config.settings import get_settings
+from services.auth_service import AuthService
+from services.token_store import TokenStoreFullError
+
+
+class TestAuthService(TestCase):
+    def setUp(self):
+        self.auth = AuthService(secret="test-secret")
+
+    def test_generated_token_is_valid(self):
+        token = self.auth.generate_token()
+
+        self.assertTrue(self.auth.verify_token(token))
+        self.assertTrue(token.startswith("v1."))
+
+    def test_token_valid_across_instances_with_same_secret(self):
+        token = self.auth.generate_token()
+
+        self.assertTrue(AuthService(secret="test-secret").verify_token(token))
+        self.assertFalse(AuthService(secret="other-secret").verify_token(token))
+
+    def test_tampered_token_is_rejected(self):
+        token = self.auth.generate_token()
+        version, expires_at, token_id, signature = token.split(".")
+
+        extended = f"{version}.{int(expires_at) + 3600}.{token_id}.{signature}"
+        self.assertFalse(self.auth.verify_token(extended))
+
+        flipped = signature[:-1] + ("A" if signature[-1] != "A" else "B")
+        self.assertFalse(self.auth.verify_token(f"{version}.{expires_at}.{token_id}.{flipped}"))
+
+    def test_malformed_tokens_are_rejected(self):
+        for token in ["", None, "abc", "v1.123", "v2.1.2.3", "v1.x.y.z", "...."]:
+            self.assertFalse(self.auth.verify_token(token))
+
+    def test_non_ascii_signature_is_rejected(self):
+        token = self.auth.generate_token()
+        version, expires_at, token_id, _ = token.split(".")
+
+        self.assertIsNone(self.auth.decode_token("v1.1.x.é"))
+        self.assertFalse(self.auth.verify_token(f"{version}.{expires_at}.{token_id}.assinaturaé"))
+        self.assertFalse(self.auth.revoke_token("v1.1.x.\u2603"))
+
+    def test_missing_secret_uses_random_per_process_key(self):
+        with patch.object(get_settings(), "TOKEN_SECRET", ""):
+            first, second = AuthService(), AuthService()
+
+        token = first.generate_token()
+        self.assertTrue(first.verify_token(token))
+        self.assertFalse(second.verify_token(token))
+
+    def test_missing_secret_with_several_workers_fails(self):
+        settings = get_settings()
+        with patch.object(settings, "TOKEN_SECRET", ""), patch.object(settings, "WORKERS", 2):
+            with self.assertRaises(ValueError):
+                AuthService()
+            self.assertTrue(AuthService(secret="shared").verify_token(AuthService(secret="shared").generate_token()))
+
+    def test_token_expires(self):
+        with patch("services.auth_service.time.time", return_value=1000.0):
+            token = self.auth.generate_token()
+        expires_at = 1000 + self.auth.get_expiry_time()
+
+        with patch("services.auth_service.time.time", return_value=expires_at - 1):
+            self.assertTrue(self.auth.verify_token(token))
+        with patch("services.auth_service.time.time", return_value=expires_at):
+            self.assertFalse(self.auth.verify_token(token))
+
+    def test_revoked_token_is_rejected(self):
+        token = self.auth.generate_token()
+        other = self.auth.generate_token()
+
+        self.assertTrue(self.auth.revoke_token(token))
+
+        self.assertFalse(self.auth.verify_token(token))
+        self.assertTrue(self.auth.verify_token(other))
+        self.assertFalse(self.auth.revoke_token("invalid"))
+
+    def test_revocation_list_drops_expired_entries(self):
+        with patch("services.auth_service.time.time", return_value=1000.0):
+            old = self.auth.generate_token()
+            self.auth.revoke_token(old)
+        self.assertEqual(len(self.auth.revoked), 1)
+
+        later = 1000.0 + self.auth.get_expiry_time() + 1
+        with patch("services.auth_service.time.time", return_value=later):
+            self.auth.revoke_token(self.auth.generate_token())
+
+        self.assertEqual(len(self.auth.revoked), 1)
+
+    def test_full_revocation_list_rejects_without_reviving_tokens(self):
+        self.auth.revoked.max_entries = 1
+        revoked = self.auth.generate_token()
+        other = self.auth.generate_token()
+        self.auth.revoke_token(revoked)
+
+        with self.assertRaises(TokenStoreFullError):
+            self.auth.revoke_token(other)
+
+        self.assertFalse(self.auth.verify_token(revoked))
+
+    def test_repeated_verification_uses_memo(self):
+        token = self.auth.generate_token()
+
+        with patch.object(self.auth, "decode_token", wraps=self.auth.decode_token) as decode:
+            for _ in range(5):
+                self.assertTrue(self.auth.verify_token(token))
+
+        self.assertEqual(decode.call_count, 1)
+
+    def test_memoized_token_still_expires_and_can_be_revoked(self):
+        with patch("services.auth_service.time.time", return_value=1000.0):
+            token = self.auth.generate_token()
+        expires_at = 1000 + self.auth.get_expiry_time()
+
+        with patch("services.auth_service.time.time", return_value=expires_at - 1):
+            self.assertTrue(self.auth.verify_token(token))
+        with patch("services.auth_service.time.time", return_value=expires_at):
+            self.assertFalse(self.auth.verify_token(token))
+
+        token = self.auth.generate_token()
+        self.assertTrue(self.auth.verify_token(token))
+        self.auth.revoke_token(token)
+        self.assertFalse(self.auth.verify_token(token))
@@ -0,0 +1,106 @@
+"""
+Testes de contrato para os backends de cache
+
+Cobertura atual:
+- Memória, SQLite e Redis (fakeredis) com a mesma bateria ✓
+- Hit/miss, TTL, remoção e limpeza ✓
+- Compartilhamento entre instâncias (simulando workers) ✓
+- Seleção do backend via Settings ✓
+"""
+
+import time
+import pytest
+from unittest.mock import patch
+from services.cache_service import CacheService, create_cache_backend
+from services.cache_backends import RedisCacheBackend, SQLiteCacheBackend
+
+
+def make_memory(tmp_path):
+    return CacheService(cache_duration=60, max_entries=10)
+
+
+def make_sqlite(tmp_path):
+    return SQLiteCacheBackend(str(tmp_path / "cache.db"), namespace="test", cache_duration=60)
+
+
+def make_redis(tmp_path):
+    fakeredis = pytest.importorskip("fakeredis")
+    return RedisCacheBackend(namespace="test", cache_duration=60, client=fakeredis.FakeRedis())
+
+
+@pytest.fixture(params=[make_memory, make_sqlite, make_redis], ids=["memory", "sqlite", "redis"])
+def backend(request, tmp_path):
+    return request.param(tmp_path)
+
+
+def test_set_get_and_stats(backend):
+    backend.set("Player#BR1", {"message": "rank", "url": "https://example.com"})
+
+    assert backend.get("Player#BR1") == {"message": "rank", "url": "https://example.com"}
+    assert backend.get("missing") is None
+
+    stats = backend.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_entry_expires(backend):
+    backend.set("key", "value", ttl=0.05)
+    time.sleep(0.1)
+    assert backend.get("key") is None
+
+
+def test_delete_and_clear(backend):
+    backend.set("a", 1)
+    backend.set("b", 2)
+
+    assert backend.delete("a") is True
+    assert backend.get("a") is None
+
+    backend.clear()
+    assert backend.get("b") is None
+
+
+def test_sqlite_backend_shared_between_instances(tmp_path):
+    path = str(tmp_path / "shared.db")
+    worker_a = SQLiteCacheBackend(path, namespace="rank")
+    worker_b = SQLiteCacheBackend(path, namespace="rank")
+
+    worker_a.set("Player#BR1", "Gold 3")
+    assert worker_b.get("Player#BR1") == "Gold 3"
+
+    worker_b.delete("Player#BR1")
+    assert worker_a.get("Player#BR1") is None
+
+
+def test_sqlite_sweep_enforces_bound(tmp_path):
+    cache = SQLiteCacheBackend(str(tmp_path / "bound.db"), namespace="rank", max_entries=2)
+    for i in range(5):
+        cache.set(f"k{i}", i, ttl=100 + i)
+
+    assert cache.sweep() == 3
+    assert cache.stats()["size"] == 2
+
+
+def test_redis_backend_shared_between_instances():
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.FakeServer()
+    worker_a = RedisCacheBackend(namespace="rank", client=fakeredis.FakeRedis(server=server))
+    worker_b = RedisCacheBackend(namespace="rank", client=fakeredis.FakeRedis(server=server))
+
+    worker_a.set("Player#BR1", "Gold 3")
+    assert worker_b.get("Player#BR1") == "Gold 3"
+
+
+def test_create_cache_backend_from_settings(tmp_path):
+    with patch("services.cache_service.get_settings") as mock_settings:
+        mock_settings.return_value.CACHE_BACKEND = "sqlite"
+        mock_settings.return_value.CACHE_SQLITE_PATH = str(tmp_path / "cache.db")
+        assert isinstance(create_cache_backend("rank"), SQLiteCacheBackend)
+
+        mock_settings.return_value.CACHE_BACKEND = "memory"
+        assert isinstance(create_cache_backend("rank"), CacheService)
+
+        mock_settings.return_value.CACHE_BACKEND = "unknown"
+        with pytest.raises(ValueError):
+            create_cache_backend("rank")
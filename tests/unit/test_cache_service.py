@@ -0,0 +1,79 @@
+"""
+Testes Unitários para o CacheService (LRU + TTL)
+
+Cobertura atual:
+- Hit/miss e contadores ✓
+- Expiração por TTL da entrada ✓
+- Despejo LRU ao atingir o limite ✓
+- Limpeza de expirados (sweep) ✓
+- Acesso concorrente ✓
+"""
+
+from unittest import TestCase
+from unittest.mock import patch
+from concurrent.futures import ThreadPoolExecutor
+from services.cache_service import CacheService, get_rank_cache
+
+
+class TestCacheService(TestCase):
+    def setUp(self):
+        self.cache = CacheService(cache_duration=60, max_entries=3)
+
+    def test_get_hit_and_miss(self):
+        self.cache.set("a", 1)
+
+        self.assertEqual(self.cache.get("a"), 1)
+        self.assertIsNone(self.cache.get("b"))
+
+        stats = self.cache.stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["hit_ratio"], 0.5)
+
+    def test_entry_expires_after_ttl(self):
+        with patch("services.cache_service.time.monotonic", return_value=1000.0):
+            self.cache.set("a", 1, ttl=5)
+        with patch("services.cache_service.time.monotonic", return_value=1004.0):
+            self.assertEqual(self.cache.get("a"), 1)
+        with patch("services.cache_service.time.monotonic", return_value=1005.0):
+            self.assertIsNone(self.cache.get("a"))
+
+        self.assertEqual(self.cache.stats()["expirations"], 1)
+
+    def test_lru_eviction(self):
+        for key in ("a", "b", "c"):
+            self.cache.set(key, key)
+
+        # "a" passa a ser o mais recente, "b" é o próximo a sair
+        self.cache.get("a")
+        self.cache.set("d", "d")
+
+        self.assertIsNone(self.cache.get("b"))
+        self.assertEqual(self.cache.get("a"), "a")
+        self.assertEqual(len(self.cache), 3)
+        self.assertEqual(self.cache.stats()["evictions"], 1)
+
+    def test_sweep_removes_only_expired(self):
+        with patch("services.cache_service.time.monotonic", return_value=1000.0):
+            self.cache.set("short", 1, ttl=1)
+            self.cache.set("long", 2, ttl=100)
+        with patch("services.cache_service.time.monotonic", return_value=1010.0):
+            self.assertEqual(self.cache.sweep(), 1)
+
+        self.assertEqual(len(self.cache), 1)
+
+    def test_concurrent_access_respects_bound(self):
+        cache = CacheService(cache_duration=60, max_entries=100)
+
+        def worker(n):
+            for i in range(500):
+                cache.set(f"{n}-{i}", i)
+                cache.get(f"{n}-{i // 2}")
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(worker, range(8)))
+
+        self.assertLessEqual(len(cache), 100)
+
+    def test_rank_cache_is_shared(self):
+        self.assertIs(get_rank_cache(), get_rank_cache())
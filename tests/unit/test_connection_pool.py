@@ -0,0 +1,95 @@
+"""
+Testes Unitários para o ConnectionPool
+
+Cobertura atual:
+- Reaproveitamento da conexão pela mesma thread ✓
+- Reentrância (conexão aninhada é a mesma) ✓
+- Limite de conexões e timeout de espera ✓
+- Métricas de espera ✓
+- Verificação de saúde e descarte de conexões inválidas ✓
+- close_all com conexões emprestadas ✓
+"""
+
+import threading
+import time
+import pytest
+from database.db_manager import ConnectionPool
+
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = ConnectionPool(str(tmp_path / "pool.db"), max_size=2, timeout=0.2)
+    yield pool
+    pool.close_all()
+
+
+def test_same_thread_reuses_connection(pool):
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        pass
+
+    assert first is second
+    assert pool.stats()["created"] == 1
+
+
+def test_nested_borrow_is_reentrant(pool):
+    with pool.connection() as outer:
+        with pool.connection() as inner:
+            assert inner is outer
+            assert pool.depth() == 2
+    assert pool.depth() == 0
+    assert pool.stats()["in_use"] == 0
+
+
+def test_pool_is_bounded_and_times_out(pool):
+    first = pool.acquire()
+    second = pool.acquire()
+
+    with pytest.raises(TimeoutError):
+        pool.acquire()
+
+    pool.release(first)
+    pool.release(second)
+    stats = pool.stats()
+    assert stats["size"] == 2
+    assert stats["timeouts"] == 1
+
+
+def test_waiting_borrower_is_recorded(pool):
+    held = [pool.acquire(), pool.acquire()]
+
+    def release_later():
+        time.sleep(0.05)
+        pool.release(held.pop())
+
+    threading.Thread(target=release_later).start()
+    conn = pool.acquire()
+    pool.release(conn)
+    pool.release(held.pop())
+
+    stats = pool.stats()
+    assert stats["waits"] == 1
+    assert stats["wait_time_max"] > 0
+
+
+def test_unhealthy_connection_is_replaced(pool):
+    pool.health_check_interval = 0
+    conn = pool.acquire()
+    pool.release(conn)
+    conn.close()
+
+    replacement = pool.acquire()
+    assert replacement is not conn
+    assert replacement.execute("SELECT 1").fetchone()[0] == 1
+    pool.release(replacement)
+
+
+def test_close_all_retires_borrowed_connections(pool):
+    conn = pool.acquire()
+    pool.close_all()
+    pool.release(conn)
+
+    stats = pool.stats()
+    assert stats["size"] == 0
+    assert stats["in_use"] == 0
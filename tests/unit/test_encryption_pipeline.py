@@ -0,0 +1,80 @@
+"""
+Testes Unitários para o EncryptionPipeline
+
+Cobertura atual:
+- Lotes pequenos criptografados na própria thread ✓
+- Ordem preservada com pool de threads e de processos ✓
+- Erro em um bloco aborta o lote todo ✓
+- Executor inválido ✓
+- add_players insere as senhas criptografadas na ordem ✓
+"""
+
+from unittest import TestCase
+from unittest.mock import MagicMock
+from services.crypto_service import CryptoService, STORAGE_KEY
+from services.encryption_pipeline import EncryptionPipeline
+from services.player_service import PlayerService
+
+
+class TestEncryptionPipeline(TestCase):
+    def setUp(self):
+        self.crypto = CryptoService(key=STORAGE_KEY)
+        self.values = [f"password-{i}" for i in range(50)]
+
+    def assert_round_trip(self, pipeline: EncryptionPipeline):
+        try:
+            encrypted = pipeline.encrypt_all(self.values)
+        finally:
+            pipeline.shutdown()
+
+        self.assertEqual([self.crypto.decrypt(value) for value in encrypted], self.values)
+
+    def test_small_batch_runs_inline(self):
+        pipeline = EncryptionPipeline(kind="thread", chunk_size=100)
+
+        self.assert_round_trip(pipeline)
+        self.assertIsNone(pipeline._executor)
+
+    def test_thread_pool_preserves_order(self):
+        self.assert_round_trip(EncryptionPipeline(kind="thread", workers=4, chunk_size=7))
+
+    def test_process_pool_preserves_order(self):
+        self.assert_round_trip(EncryptionPipeline(kind="process", workers=2, chunk_size=7))
+
+    def test_serial_mode(self):
+        self.assert_round_trip(EncryptionPipeline(kind="serial", chunk_size=7))
+
+    def test_error_aborts_whole_batch(self):
+        pipeline = EncryptionPipeline(kind="thread", workers=2, chunk_size=5)
+        try:
+            with self.assertRaises(ValueError):
+                pipeline.encrypt_all(self.values[:20] + [""] + self.values[20:])
+        finally:
+            pipeline.shutdown()
+
+    def test_invalid_executor_kind(self):
+        with self.assertRaises(ValueError):
+            EncryptionPipeline(kind="gpu")
+
+    def test_add_players_inserts_encrypted_passwords_in_order(self):
+        service = PlayerService()
+        service.repository = MagicMock()
+        service.encryption = EncryptionPipeline(kind="thread", workers=2, chunk_size=3)
+        players = [
+            {"name": f"P{i}", "tag": "T1", "email": f"p{i}@x.com", "login": f"l{i}", "password": f"pw{i}"}
+            for i in range(10)
+        ]
+        service.repository.insert_players.return_value = list(range(1, 11))
+
+        try:
+            result = service.add_players(players)
+        finally:
+            service.encryption.shutdown()
+
+        inserted = service.repository.insert_players.call_args[0][0]
+        self.assertEqual(
+            [self.crypto.decrypt(p["password"]) for p in inserted],
+            [p["password"] for p in players],
+        )
+        self.assertEqual([p["login"] for p in inserted], [p["login"] for p in players])
+        self.assertEqual([r["id"] for r in result], list(range(1, 11)))
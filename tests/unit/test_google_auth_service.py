@@ -0,0 +1,132 @@
+"""
+Testes Unitários para o GoogleAuthService
+
+Cobertura atual:
+- Segredo do usuário lido do banco uma única vez ✓
+- Ausência de 2FA também fica em cache ✓
+- Invalidação em save_secret, activate_2fa e reset_2fa ✓
+- Erro no banco não é cacheado ✓
+- Código aceito uma única vez (replay) ✓
+- Passo anterior recusado depois de um posterior (RFC 6238 §5.2) ✓
+- Janela de tolerância de relógio ✓
+- Tentativas concorrentes com o mesmo código ✓
+"""
+
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+from concurrent.futures import ThreadPoolExecutor
+from services.google_auth_service import GoogleAuthService
+import pyotp
+
+
+class TestGoogleAuthService(TestCase):
+    def setUp(self):
+        self.service = GoogleAuthService()
+        self.service.repository = MagicMock()
+        self.secret = pyotp.random_base32()
+        self.totp = pyotp.TOTP(self.secret)
+
+    def test_user_secret_is_cached(self):
+        self.service.repository.get_secret.return_value = "SECRET"
+
+        for _ in range(3):
+            self.assertEqual(self.service.get_user_secret(1), "SECRET")
+        self.assertTrue(self.service.is_2fa_active(1))
+
+        self.service.repository.get_secret.assert_called_once_with(1)
+
+    def test_missing_2fa_is_cached(self):
+        self.service.repository.get_secret.return_value = None
+
+        self.assertIsNone(self.service.get_user_secret(1))
+        self.assertIsNone(self.service.get_user_secret(1))
+
+        self.service.repository.get_secret.assert_called_once()
+
+    def test_check_status_saves_pending_secret_without_activating(self):
+        self.service.repository.get_secret.return_value = None
+
+        result = self.service.check_2fa_status(1)
+
+        self.assertFalse(result["is_configured"])
+        self.service.repository.save_secret.assert_called_once_with(1, result["secret"])
+        self.assertIsNone(self.service.get_user_secret(1))
+        self.service.repository.get_secret.assert_called_once()
+
+    def test_activate_invalidates_cached_state(self):
+        self.service.repository.get_secret.return_value = None
+        self.assertIsNone(self.service.get_user_secret(1))
+
+        self.service.repository.get_secret.return_value = "NEWSECRET"
+        self.assertTrue(self.service.activate_2fa(1, "NEWSECRET"))
+
+        self.assertEqual(self.service.get_user_secret(1), "NEWSECRET")
+        self.assertEqual(self.service.repository.get_secret.call_count, 2)
+
+    def test_reset_clears_cached_secret(self):
+        self.service.repository.get_secret.return_value = "SECRET"
+        self.assertEqual(self.service.get_user_secret(1), "SECRET")
+
+        self.service.reset_2fa(1)
+
+        self.assertIsNone(self.service.get_user_secret(1))
+        self.assertFalse(self.service.is_2fa_active(1))
+        self.service.repository.get_secret.assert_called_once()
+
+    def test_database_error_is_not_cached(self):
+        self.service.repository.get_secret.side_effect = [Exception("db"), "SECRET"]
+
+        self.assertIsNone(self.service.get_user_secret(1))
+        self.assertEqual(self.service.get_user_secret(1), "SECRET")
+
+    def test_code_is_accepted_only_once(self):
+        code = self.totp.now()
+
+        self.assertTrue(self.service.verify_code(self.secret, code, user_id=1))
+        self.assertFalse(self.service.verify_code(self.secret, code, user_id=1))
+        self.assertFalse(self.service.verify_code(self.secret, "000000", user_id=1))
+
+    def test_drift_window(self):
+        self.service.totp_window = 1
+        now = 1_000_000.0
+        previous = self.totp.at(now - 30)
+        too_old = self.totp.at(now - 60)
+
+        with patch("services.google_auth_service.time.time", return_value=now):
+            self.assertTrue(self.service.verify_code(self.secret, previous, user_id=1))
+            self.assertFalse(self.service.verify_code(self.secret, too_old, user_id=2))
+
+        self.service.totp_window = 0
+        with patch("services.google_auth_service.time.time", return_value=now):
+            self.assertFalse(self.service.verify_code(self.secret, self.totp.at(now - 30), user_id=3))
+
+    def test_older_step_rejected_after_newer_one(self):
+        self.service.totp_window = 1
+        now = 1_000_000.0
+        with patch("services.google_auth_service.time.time", return_value=now):
+            self.assertTrue(self.service.verify_code(self.secret, self.totp.at(now), user_id=1))
+            # Código capturado do passo anterior, ainda na janela, mas nunca usado
+            self.assertFalse(self.service.verify_code(self.secret, self.totp.at(now - 30), user_id=1))
+            self.assertTrue(self.service.verify_code(self.secret, self.totp.at(now + 30), user_id=1))
+            self.assertTrue(self.service.verify_code(self.secret, self.totp.at(now - 30), user_id=2))
+
+    def test_used_step_expires_with_window(self):
+        now = 1_000_000.0
+        with patch("services.google_auth_service.time.time", return_value=now):
+            self.assertTrue(self.service.verify_code(self.secret, self.totp.at(now), user_id=1))
+        self.assertIn("1", self.service.last_used_steps)
+
+        later = now + 30 * (self.service.totp_window + 2)
+        with patch("services.google_auth_service.time.time", return_value=later):
+            self.assertTrue(self.service.verify_code(self.secret, self.totp.at(later), user_id=2))
+        self.assertNotIn("1", self.service.last_used_steps)
+
+    def test_concurrent_attempts_accept_code_once(self):
+        code = self.totp.now()
+
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            results = list(
+                executor.map(lambda _: self.service.verify_code(self.secret, code, user_id=1), range(64))
+            )
+
+        self.assertEqual(results.count(True), 1)
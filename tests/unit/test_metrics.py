@@ -0,0 +1,140 @@
+"""
+Testes Unitários para o registro de métricas
+
+Cobertura atual:
+- Contadores, gauges e histogramas no formato texto ✓
+- Escape de labels ✓
+- Agregação entre processos ✓
+- Coleta a partir do diretório compartilhado ✓
+- Contadores de processos encerrados ou com PID reutilizado retidos; gauges descartados ✓
+- Totais não diminuem entre coletas nem com o lock de incorporação ocupado ✓
+- Último snapshot gravado ao parar ✓
+- Coletores e proporção de acertos do cache ✓
+"""
+
+from unittest import TestCase
+import json
+import os
+import tempfile
+from services.cache_service import CacheService
+from services.metrics import (
+    RETIRED_LOCK,
+    RETIRED_SNAPSHOT,
+    MetricsRegistry,
+    _process_start,
+    cache_collector,
+    merge_snapshots,
+    render,
+)
+
+
+class TestMetrics(TestCase):
+    def setUp(self):
+        self.registry = MetricsRegistry()
+
+    def test_render_counter_gauge_and_histogram(self):
+        self.registry.counter("requests_total", "Requisições").inc(route="/a", status=200)
+        self.registry.gauge("in_progress", "Em andamento").set(3)
+        histogram = self.registry.histogram("latency_seconds", "Latência", buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 5.0):
+            histogram.observe(value, route="/a")
+
+        text = self.registry.collect()
+
+        self.assertIn("# TYPE requests_total counter", text)
+        self.assertIn('requests_total{route="/a",status="200"} 1.0', text)
+        self.assertIn("in_progress 3.0", text)
+        self.assertIn('latency_seconds_bucket{route="/a",le="0.1"} 1', text)
+        self.assertIn('latency_seconds_bucket{route="/a",le="1.0"} 2', text)
+        self.assertIn('latency_seconds_bucket{route="/a",le="+Inf"} 3', text)
+        self.assertIn('latency_seconds_count{route="/a"} 3', text)
+        self.assertIn('latency_seconds_sum{route="/a"} 5.55', text)
+
+    def test_label_values_are_escaped(self):
+        self.registry.counter("c_total", "C").inc(path='a"b\\c\nd')
+
+        self.assertIn('c_total{path="a\\"b\\\\c\\nd"} 1.0', self.registry.collect())
+
+    def test_merge_sums_counters_and_drops_dead_gauges(self):
+        counter = self.registry.counter("c_total", "C")
+        gauge = self.registry.gauge("g", "G")
+        histogram = self.registry.histogram("h", "H", buckets=(1.0,))
+        counter.inc(2)
+        gauge.set(5)
+        histogram.observe(0.5)
+        snapshot = self.registry.snapshot()
+
+        merged = merge_snapshots([snapshot, snapshot, snapshot])
+
+        self.assertEqual(merged["c_total"]["samples"][()], 6.0)
+        self.assertEqual(merged["g"]["samples"][()], 15.0)
+        self.assertEqual(merged["h"]["samples"][()]["counts"], [3, 0])
+        self.assertIn("h_count 3", render(merged))
+
+    def write_workers(self, directory):
+        other = {
+            "c_total": {"type": "counter", "help": "C", "samples": [[{}, 4.0]]},
+            "g": {"type": "gauge", "help": "G", "samples": [[{}, 7.0]]},
+        }
+        parent = os.getppid()
+        live = f"metrics_{parent}_{_process_start(parent)}.json"
+        # PID inexistente e PID vivo com outro instante de início (reutilizado)
+        stale = ["metrics_999999999_1.json", f"metrics_{parent}_1.json"]
+        for name in [live, *stale]:
+            with open(os.path.join(directory, name), "w") as f:
+                json.dump(other, f)
+        return live
+
+    def test_dead_workers_counters_are_retained(self):
+        self.registry.counter("c_total", "C").inc()
+        self.registry.gauge("g", "G").set(1)
+
+        with tempfile.TemporaryDirectory() as directory:
+            live = self.write_workers(directory)
+
+            first = self.registry.collect(directory)
+            second = self.registry.collect(directory)
+
+            for text in (first, second):
+                self.assertIn("c_total 13.0", text)
+                self.assertIn("g 8.0", text)
+            own = os.path.basename(self.registry.snapshot_path(directory))
+            self.assertEqual(sorted(os.listdir(directory)), sorted([live, own, RETIRED_SNAPSHOT]))
+
+    def test_dead_workers_counted_while_retirement_is_locked(self):
+        self.registry.counter("c_total", "C").inc()
+
+        with tempfile.TemporaryDirectory() as directory:
+            self.write_workers(directory)
+            open(os.path.join(directory, RETIRED_LOCK), "w").close()
+
+            text = self.registry.collect(directory)
+
+            self.assertIn("c_total 13.0", text)
+            self.assertIn("g 7.0", text)
+            self.assertNotIn(RETIRED_SNAPSHOT, os.listdir(directory))
+
+    def test_stop_flusher_keeps_final_snapshot(self):
+        self.registry.counter("c_total", "C").inc()
+
+        with tempfile.TemporaryDirectory() as directory:
+            self.registry.start_flusher(directory, 60)
+            self.registry.stop_flusher()
+
+            with open(self.registry.snapshot_path(directory)) as f:
+                self.assertEqual(json.load(f)["c_total"]["samples"], [[{}, 1.0]])
+
+    def test_cache_collector_and_hit_ratio(self):
+        cache = CacheService()
+        cache.set("a", 1)
+        cache.get("a")
+        cache.get("a")
+        cache.get("b")
+        self.registry.register_collector("cache:test", cache_collector("test", cache))
+
+        text = self.registry.collect()
+
+        self.assertIn('cache_hits_total{cache="test"} 2.0', text)
+        self.assertIn('cache_misses_total{cache="test"} 1.0', text)
+        self.assertIn('cache_entries{cache="test"} 1.0', text)
+        self.assertIn('cache_hit_ratio{cache="test"} 0.666', text)
@@ -15,6 +15,7 @@ Cobertura atual:
 - Construção do resultado do player ✓
 - Busca de informações do player ✓
 - Cenários de rate limiting ✓
+- Exportação em blocos (NDJSON e array JSON) ✓
 
 Observações:
 - Adicionada cobertura completa para todos os métodos auxiliares
@@ -26,6 +27,7 @@ Observações:
 from unittest import TestCase
 from unittest.mock import MagicMock, patch
 from services.player_service import PlayerService
+import json
 import requests
 
 class TestPlayerService(TestCase):
@@ -48,9 +50,9 @@ class TestPlayerService(TestCase):
 
     def test_get_player_rank_success(self):
         # Configura mocks
-        self.player_service.repository.get_all_players.return_value = [
-            {**self.test_player_info, "name": self.test_name, "tag": self.test_tag}
-        ]
+        self.player_service.repository.find_by_name_tag.return_value = {
+            **self.test_player_info, "name": self.test_name, "tag": self.test_tag
+        }
         self.player_service.cache_service.get.return_value = None
         
         result = self.player_service.get_player_rank(self.test_name, self.test_tag)
@@ -87,7 +89,7 @@ class TestPlayerService(TestCase):
                 self.player_service.get_player_rank(self.test_name, tag)
 
     def test_player_not_found_in_db(self):
-        self.player_service.repository.get_all_players.return_value = []
+        self.player_service.repository.find_by_name_tag.return_value = None
         self.player_service.cache_service.get.return_value = None
         
         result = self.player_service.get_player_rank(self.test_name, self.test_tag)
@@ -153,26 +155,50 @@ class TestPlayerService(TestCase):
                 self.player_service.validate_player_params(name, tag)
 
     # Testes para get_player_info
-    def test_get_player_info_multiple_players(self):
-        test_players = [
-            {"id": 1, "name": "Player1", "tag": "111", "email": "p1@test.com"},
-            {"id": 2, "name": "Player2", "tag": "222", "email": "p2@test.com"},
-            {"id": 3, "name": "TestPlayer", "tag": "1234", "email": "p3@test.com"}
-        ]
-        
-        self.player_service.repository.get_all_players.return_value = test_players
+    def test_get_player_info_found(self):
+        self.player_service.repository.find_by_name_tag.return_value = {
+            "id": 3, "name": "TestPlayer", "tag": "1234", "email": "p3@test.com"
+        }
         
         result = self.player_service.get_player_info("TestPlayer", "1234")
         
+        self.player_service.repository.find_by_name_tag.assert_called_once_with("TestPlayer", "1234")
+        self.player_service.repository.iter_players.assert_not_called()
         self.assertEqual(result["id"], 3)
         self.assertEqual(result["email"], "p3@test.com")
 
     def test_get_player_info_empty_database(self):
-        self.player_service.repository.get_all_players.return_value = []
+        self.player_service.repository.find_by_name_tag.return_value = None
         
         result = self.player_service.get_player_info("TestPlayer", "1234")
         
         self.assertEqual(result["id"], -1)
         self.assertEqual(result["email"], "")
         self.assertEqual(result["login"], "")
-        self.assertEqual(result["password"], "")
\ No newline at end of file
+        self.assertEqual(result["password"], "")
+
+    # Testes para export_players
+    def test_export_players_streams_one_chunk_per_batch(self):
+        batches = [[(1, "A", "BR1"), (2, "B", "BR1")], [(3, "C", "NA1")]]
+        self.player_service.repository.iter_players.return_value = iter(batches)
+
+        chunks = list(self.player_service.export_players("ndjson", batch_size=2))
+
+        self.player_service.repository.iter_players.assert_called_once_with(2)
+        self.assertEqual(len(chunks), 2)
+        rows = [json.loads(line) for line in "".join(chunks).splitlines()]
+        self.assertEqual(rows[2], {"id": 3, "name": "C", "tag": "NA1"})
+
+    def test_export_players_json_array(self):
+        batches = [[(1, "A", "BR1")], [(2, "B", "BR1")]]
+        self.player_service.repository.iter_players.return_value = iter(batches)
+        self.assertEqual(
+            json.loads("".join(self.player_service.export_players("json"))),
+            [{"id": 1, "name": "A", "tag": "BR1"}, {"id": 2, "name": "B", "tag": "BR1"}],
+        )
+
+        self.player_service.repository.iter_players.return_value = iter([])
+        self.assertEqual(json.loads("".join(self.player_service.export_players("json"))), [])
+
+        with self.assertRaises(ValueError):
+            list(self.player_service.export_players("xml"))
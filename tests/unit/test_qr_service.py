@@ -0,0 +1,33 @@
+"""
+Testes Unitários para o qr_service
+
+Cobertura atual:
+- Data URI em PNG e SVG ✓
+- Formato inválido ✓
+"""
+
+from unittest import TestCase
+import base64
+from services.qr_service import qr_data_uri
+
+URI = "otpauth://totp/ValorantAccounts:admin?secret=JBSWY3DPEHPK3PXP&issuer=ValorantAccounts"
+
+
+class TestQrService(TestCase):
+    def test_png_data_uri(self):
+        uri = qr_data_uri(URI, "png")
+
+        self.assertTrue(uri.startswith("data:image/png;base64,"))
+        self.assertEqual(base64.b64decode(uri.split(",", 1)[1])[:8], b"\x89PNG\r\n\x1a\n")
+
+    def test_svg_data_uri(self):
+        svg = qr_data_uri(URI, "svg")
+
+        self.assertTrue(svg.startswith("data:image/svg+xml;base64,"))
+        content = base64.b64decode(svg.split(",", 1)[1])
+        self.assertTrue(content.startswith(b"<svg"))
+        self.assertIn(b'<path d="M', content)
+
+    def test_invalid_format(self):
+        with self.assertRaises(ValueError):
+            qr_data_uri(URI, "gif")
@@ -0,0 +1,95 @@
+"""
+Testes Unitários para o SingleFlight
+
+Cobertura atual:
+- Centenas de chamadas concorrentes com uma única execução ✓
+- Exceção propagada a todos os que aguardavam ✓
+- Timeout de quem aguarda, sem interromper a execução em andamento ✓
+- Chaves diferentes executam de forma independente ✓
+"""
+
+import asyncio
+from unittest import TestCase
+from services.single_flight import SingleFlight
+
+CALLERS = 300
+
+
+class TestSingleFlight(TestCase):
+    def setUp(self):
+        self.flight = SingleFlight()
+
+    def test_concurrent_calls_share_one_execution(self):
+        executions = []
+
+        async def fetch():
+            executions.append(1)
+            await asyncio.sleep(0.05)
+            return {"rank": "Radiant"}
+
+        async def scenario():
+            return await asyncio.gather(
+                *(self.flight.do("Player#BR1", fetch, timeout=5) for _ in range(CALLERS))
+            )
+
+        results = asyncio.run(scenario())
+
+        self.assertEqual(len(executions), 1)
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual(
+            self.flight.stats(),
+            {"executions": 1, "coalesced": CALLERS - 1, "timeouts": 0, "in_flight": 0},
+        )
+
+    def test_error_propagates_to_all_waiters(self):
+        async def fetch():
+            await asyncio.sleep(0.01)
+            raise ValueError("upstream indisponível")
+
+        async def scenario():
+            return await asyncio.gather(
+                *(self.flight.do("Player#BR1", fetch) for _ in range(CALLERS)),
+                return_exceptions=True,
+            )
+
+        results = asyncio.run(scenario())
+
+        self.assertTrue(all(isinstance(r, ValueError) for r in results))
+        self.assertEqual(self.flight.stats()["executions"], 1)
+
+        async def ok():
+            return "ok"
+
+        # Erros não ficam guardados: a próxima chamada executa de novo
+        self.assertEqual(asyncio.run(self.flight.do("Player#BR1", ok)), "ok")
+
+    def test_waiter_times_out_while_execution_continues(self):
+        async def fetch():
+            await asyncio.sleep(0.1)
+            return "done"
+
+        async def scenario():
+            leader = asyncio.ensure_future(self.flight.do("Player#BR1", fetch))
+            await asyncio.sleep(0)
+            with self.assertRaises(TimeoutError):
+                await self.flight.do("Player#BR1", fetch, timeout=0.01)
+            return await leader
+
+        self.assertEqual(asyncio.run(scenario()), "done")
+        self.assertEqual(self.flight.stats()["timeouts"], 1)
+        self.assertEqual(self.flight.in_flight(), 0)
+
+    def test_different_keys_run_independently(self):
+        keys = [f"Player{i}#BR1" for i in range(20)]
+
+        def fetch_for(key):
+            async def fetch():
+                await asyncio.sleep(0)
+                return key
+            return fetch
+
+        async def scenario():
+            return await asyncio.gather(*(self.flight.do(key, fetch_for(key)) for key in keys))
+
+        self.assertEqual(asyncio.run(scenario()), keys)
+        self.assertEqual(self.flight.stats()["executions"], len(keys))
@@ -0,0 +1,90 @@
+"""
+Testes Unitários para o CachedStaticFiles
+
+Cobertura atual:
+- HTML com referências a JS/CSS versionadas por hash ✓
+- Cache imutável apenas para a versão atual do arquivo ✓
+- Variante .gz pré-comprimida conforme Accept-Encoding ✓
+- Variante .gz mais antiga que o original é ignorada ✓
+- Respostas 304 com If-None-Match ✓
+"""
+
+import gzip
+import os
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from services.static_files import CachedStaticFiles, file_fingerprint
+
+
+@pytest.fixture
+def static_dir(tmp_path):
+    (tmp_path / "js").mkdir()
+    (tmp_path / "js" / "app.js").write_text("console.log('app');")
+    (tmp_path / "js" / "app.js.gz").write_bytes(gzip.compress(b"console.log('app');"))
+    (tmp_path / "index.html").write_text(
+        '<link href="css/missing.css"><script src="js/app.js"></script>'
+        '<script src="https://cdn.example.com/lib.js"></script>'
+    )
+    return tmp_path
+
+
+@pytest.fixture
+def client(static_dir):
+    app = FastAPI()
+    app.mount("/", CachedStaticFiles(directory=str(static_dir), html=True, max_age=600))
+    return TestClient(app)
+
+
+def test_html_references_are_fingerprinted(client, static_dir):
+    response = client.get("/")
+    version = file_fingerprint(str(static_dir / "js" / "app.js"))
+
+    assert f'src="js/app.js?v={version}"' in response.text
+    assert 'href="css/missing.css"' in response.text
+    assert 'src="https://cdn.example.com/lib.js"' in response.text
+    assert response.headers["Cache-Control"] == "no-cache"
+
+    revalidated = client.get("/", headers={"If-None-Match": response.headers["ETag"]})
+    assert revalidated.status_code == 304
+
+
+def test_current_version_is_immutable(client, static_dir):
+    version = file_fingerprint(str(static_dir / "js" / "app.js"))
+
+    current = client.get(f"/js/app.js?v={version}")
+    stale = client.get("/js/app.js?v=outdated")
+    plain = client.get("/js/app.js")
+
+    assert current.headers["Cache-Control"] == "public, max-age=600, immutable"
+    assert stale.headers["Cache-Control"] == "no-cache"
+    assert plain.headers["Cache-Control"] == "no-cache"
+
+
+def test_precompressed_variant_by_accept_encoding(client):
+    compressed = client.get("/js/app.js", headers={"Accept-Encoding": "gzip"})
+    identity = client.get("/js/app.js", headers={"Accept-Encoding": "identity"})
+
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert compressed.headers["Content-Type"].startswith("text/javascript")
+    assert compressed.text == identity.text == "console.log('app');"
+    assert "Content-Encoding" not in identity.headers
+    assert compressed.headers["ETag"] != identity.headers["ETag"]
+    assert identity.headers["Vary"] == "Accept-Encoding"
+
+    revalidated = client.get(
+        "/js/app.js", headers={"Accept-Encoding": "gzip", "If-None-Match": compressed.headers["ETag"]}
+    )
+    assert revalidated.status_code == 304
+
+
+def test_stale_precompressed_variant_is_ignored(client, static_dir):
+    source = static_dir / "js" / "app.js"
+    source.write_text("console.log('novo');")
+    gz_mtime = os.stat(source).st_mtime_ns - 1_000_000_000
+    os.utime(static_dir / "js" / "app.js.gz", ns=(gz_mtime, gz_mtime))
+
+    response = client.get("/js/app.js", headers={"Accept-Encoding": "gzip"})
+
+    assert "Content-Encoding" not in response.headers
+    assert response.text == "console.log('novo');"
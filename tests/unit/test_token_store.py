@@ -0,0 +1,103 @@
+"""
+Testes Unitários para o TokenStore (registro limitado indexado por expiração)
+
+Cobertura atual:
+- Registro e consulta respeitando a expiração ✓
+- Limpeza remove apenas os expirados ✓
+- Registro cheio recusa novas entradas sem descartar as válidas ✓
+- Regravação e remoção não deixam entradas obsoletas ✓
+- Estatísticas (tokens vivos, duração da limpeza) ✓
+- Thread de limpeza periódica ✓
+"""
+
+from unittest import TestCase
+from unittest.mock import patch
+import time
+from services.token_store import TokenStore, TokenStoreFullError
+
+
+class TestTokenStore(TestCase):
+    def setUp(self):
+        self.store = TokenStore(max_entries=3)
+
+    def test_contains_until_expiry(self):
+        self.store.add("a", expires_at=1010.0, now=1000.0)
+
+        self.assertTrue(self.store.contains("a", now=1009.0))
+        self.assertFalse(self.store.contains("a", now=1010.0))
+        self.assertFalse(self.store.contains("b", now=1000.0))
+
+    def test_already_expired_entry_is_ignored(self):
+        self.store.add("a", expires_at=999.0, now=1000.0)
+
+        self.assertEqual(len(self.store), 0)
+
+    def test_sweep_removes_only_expired(self):
+        self.store.add("a", expires_at=1005.0, now=1000.0)
+        self.store.add("b", expires_at=1020.0, now=1000.0)
+
+        with patch("services.token_store.time.time", return_value=1010.0):
+            self.assertEqual(self.store.sweep(), 1)
+
+        self.assertEqual(len(self.store), 1)
+        self.assertTrue(self.store.contains("b", now=1010.0))
+        self.assertEqual(self.store.stats()["expirations"], 1)
+
+    def test_add_reaps_expired_entries(self):
+        self.store.add("a", expires_at=1005.0, now=1000.0)
+        self.store.add("b", expires_at=1050.0, now=1010.0)
+
+        self.assertEqual(len(self.store), 1)
+
+    def test_full_store_rejects_new_keys_and_keeps_live_ones(self):
+        for key, expires_at in [("a", 1030.0), ("b", 1010.0), ("c", 1020.0)]:
+            self.store.add(key, expires_at=expires_at, now=1000.0)
+
+        with self.assertRaises(TokenStoreFullError):
+            self.store.add("d", expires_at=1040.0, now=1000.0)
+
+        self.assertEqual(len(self.store), 3)
+        self.assertTrue(all(self.store.contains(key, now=1000.0) for key in "abc"))
+        self.assertFalse(self.store.contains("d", now=1000.0))
+        self.assertEqual(self.store.stats()["rejections"], 1)
+
+        # Regravar uma chave existente não precisa de espaço novo
+        self.store.add("a", expires_at=1050.0, now=1000.0)
+        # Quando uma entrada expira, a vaga volta a ser usada
+        self.store.add("d", expires_at=1040.0, now=1010.0)
+        self.assertTrue(self.store.contains("d", now=1010.0))
+
+    def test_readd_and_delete_leave_no_stale_entries(self):
+        self.store.add("a", expires_at=1005.0, now=1000.0)
+        self.store.add("a", expires_at=1050.0, now=1000.0)
+        self.store.add("b", expires_at=1006.0, now=1000.0)
+        self.assertTrue(self.store.delete("b"))
+
+        with patch("services.token_store.time.time", return_value=1010.0):
+            self.assertEqual(self.store.sweep(), 0)
+
+        self.assertTrue(self.store.contains("a", now=1010.0))
+        self.assertEqual(len(self.store), 1)
+
+    def test_stats_report_live_tokens_and_sweep_duration(self):
+        future = time.time() + 60
+        self.store.add("a", expires_at=future)
+        self.store.sweep()
+
+        stats = self.store.stats()
+        self.assertEqual(stats["live"], 1)
+        self.assertEqual(stats["sweeps"], 1)
+        self.assertGreaterEqual(stats["last_sweep_duration"], 0.0)
+
+    def test_background_sweeper(self):
+        self.store.add("a", expires_at=time.time() + 0.05)
+        self.store.start_sweeper(0.02)
+        try:
+            deadline = time.time() + 2
+            while len(self.store) and time.time() < deadline:
+                time.sleep(0.02)
+        finally:
+            self.store.stop_sweeper()
+
+        self.assertEqual(len(self.store), 0)
+        self.assertGreater(self.store.stats()["sweeps"], 0)